@@ -5,6 +5,7 @@ import os
 import sys
 import traceback
 
+from PyQt5.QtCore import QThreadPool
 from PyQt5.QtWidgets import (
     QAction,
     QApplication,
@@ -23,11 +24,14 @@ pythagorazen_logger = PythagoraZenLogger()
 pythagorazen_logger.create_logfile()
 pythagorazen_logger.configure_logging()        
 
+from framework.api_session_manager import ZendeskApiSessionManager
 from framework.credential_database_operations import CredentialDatabaseOperations
 from framework.credential_database_settings_dialog import (
     CredentialDatabaseSettingsDialog,
 )
+from framework.mongodb_client_manager import MongoDBClientManager
 from framework.plugin_window import PluginWindow  # Import from the new plugin
+from framework.plugin_worker import PluginWorkerPool
 from framework.signal_manager import SignalManager
 
 
@@ -288,6 +292,14 @@ def main():
         logging.error(f"An exception occurred: {e}")
         # import traceback
         # traceback.print_exc()
+    finally:
+        # Let running plugin workers stop before their connections go away
+        PluginWorkerPool.cancel_all()
+        QThreadPool.globalInstance().waitForDone()
+        # Release the pooled keep-alive API connections
+        ZendeskApiSessionManager.close_all_sessions()
+        # Release the shared MongoDB connection pool
+        MongoDBClientManager.close_all_clients()
 
 
 if __name__ == "__main__":
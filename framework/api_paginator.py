@@ -5,7 +5,9 @@ import logging
 import requests
 from PyQt5.QtWidgets import QApplication
 
+from framework.api_session_manager import ZendeskApiSessionManager
 from framework.logging_handler import PythagoraZenLogger
+from framework.rate_limiter import ZendeskRateLimiter
 
 
 class ZendeskApiPaginator:
@@ -16,6 +18,7 @@ class ZendeskApiPaginator:
         zendesk_api_key,
         endpoint,
         per_page=100,
+        budget_key=None,
     ):
         self.pythagorazen_logger = PythagoraZenLogger()
         self.pythagorazen_logger.configure_logging()
@@ -25,6 +28,12 @@ class ZendeskApiPaginator:
         self.endpoint = endpoint
         self.per_page = per_page
         self.data = []
+        # Pooled keep-alive session shared by every paginator for this subdomain
+        self.session = ZendeskApiSessionManager.get_session(zendesk_subdomain)
+        # Token bucket shared by every paginator for this subdomain
+        self.rate_limiter = ZendeskRateLimiter.get_rate_limiter(zendesk_subdomain)
+        # Dependency endpoints report their budget under the endpoint template
+        self.budget_key = budget_key or endpoint
 
         if endpoint:
             # Encode credentials for basic authentication
@@ -37,71 +46,73 @@ class ZendeskApiPaginator:
             # self.status_window = StatusWindow(endpoint)
             # self.status_window.show()
 
-    def fetch_all_data(self):
+    def extract_page_records(self, response_json):
         logging.debug(f"{inspect.currentframe().f_code.co_name}")
-        if not self.endpoint:
-            return self.data
+        main_key = next(iter(response_json), None)
 
-        try:
-            url_count = 1
-            url = f"{self.base_url}{self.endpoint}"
-            logging.info(f"{url_count}. {url}\n")
-
-            headers = {"Authorization": f"Basic {self.base64_api_auth}"}
+        # Check if the data after main_key is a dictionary
+        data_after_main_key = response_json.get(main_key, {})
 
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
+        if isinstance(data_after_main_key, dict):
+            # If it's a dictionary, insert the entire dictionary as a single document
+            return [data_after_main_key]
 
-            # print(f"SUCCESS: {response.status_code}\n")
-            # print(f"RESPONSE:\n{json.dumps(response.json(), indent=4)}")
+        # If it's not a dictionary, extend the list (or handle as needed)
+        return list(data_after_main_key or [])
 
-            response_json = response.json()
-            main_key = next(iter(response_json), None)
-
-            # Check if the data after main_key is a dictionary
-            data_after_main_key = response_json.get(main_key, {})
+    def get_next_page_url(self, response_json):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        if response_json.get("next_page") is not None:
+            return response_json["next_page"]
 
-            if isinstance(data_after_main_key, dict):
-                # If it's a dictionary, insert the entire dictionary as a single document
-                self.data.append(data_after_main_key)
-            else:
-                # If it's not a dictionary, extend the list (or handle as needed)
-                self.data.extend(data_after_main_key)
+        if response_json.get("meta", {}).get("has_more"):
+            next_link = response_json.get("links", {}).get("next")
+            if next_link:
+                return next_link
+            after_cursor = response_json["meta"]["after_cursor"]
+            return f"{self.base_url}/{self.endpoint}.json?page[after]={after_cursor}&page[size]={self.per_page}"
 
-            # self.status_window.update_status(f"PROCESSING {self.endpoint} REQUEST\n\n")
-            # self.status_window.update_status(f"{url_count}. {url}\n")
+        return None
 
-            while response_json.get("next_page") is not None or response_json.get(
-                "meta", {}
-            ).get("has_more"):
-                url_count += 1
+    def get_page(self, url, headers):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        for attempt in range(self.rate_limiter.max_retries + 1):
+            self.rate_limiter.acquire(self.budget_key)
+            response = self.session.get(url, headers=headers, timeout=10)
+            self.rate_limiter.update_from_response(
+                response.headers, response.status_code, self.budget_key
+            )
+
+            # The rate limiter has already recorded Retry-After, so just try again
+            if response.status_code != 429:
+                break
+            logging.warning(f"HTTP 429 ({attempt + 1}): {url}")
+
+        response.raise_for_status()
+        return response
+
+    def iter_pages(self):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        if not self.endpoint:
+            return
 
-                if "next_page" in response_json:
-                    url = response_json["next_page"]
-                elif "meta" in response_json and response_json["meta"].get("has_more"):
-                    after_cursor = response_json["meta"]["after_cursor"]
-                    url = f"{self.base_url}/{self.endpoint}.json?page[after]={after_cursor}&page[size]={self.per_page}"
+        try:
+            url_count = 1
+            url = f"{self.base_url}{self.endpoint}"
+            headers = {"Authorization": f"Basic {self.base64_api_auth}"}
 
+            while url:
                 # self.status_window.update_status(f"{url_count}. {url}\n")
                 logging.info(f"{url_count}. {url}\n")
 
-                response = requests.get(url, headers=headers, timeout=10)
-                response.raise_for_status()
+                response = self.get_page(url, headers)
                 response_json = response.json()
-                main_key = next(iter(response_json), None)
-
-                # Check if the data after main_key is a dictionary
-                data_after_main_key = response_json.get(main_key, {})
 
-                if isinstance(data_after_main_key, dict):
-                    self.data.append(data_after_main_key)
-                else:
-                    self.data.extend(data_after_main_key)
+                # Only the current page is held in memory while the caller consumes it
+                yield self.extract_page_records(response_json)
 
-            # Close the status window once data fetching is complete
-            # self.status_window.close()
-            # print(f"SELF DATA:\n{json.dumps(self.data, indent=4)}")
-            return self.data
+                url = self.get_next_page_url(response_json)
+                url_count += 1
 
         except requests.exceptions.RequestException as e:
             error_message = str(e)
@@ -109,6 +120,19 @@ class ZendeskApiPaginator:
             # You might want to log or handle the error accordingly
             raise  # Re-raise the exception after printing details
 
+    def iter_records(self):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        for page in self.iter_pages():
+            yield from page
+
+    def fetch_all_data(self):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        for page in self.iter_pages():
+            self.data.extend(page)
+
+        # print(f"SELF DATA:\n{json.dumps(self.data, indent=4)}")
+        return self.data
+
 
 if __name__ == "__main__":
     logging.debug(f"{inspect.currentframe().f_code.co_name}")
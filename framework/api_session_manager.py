@@ -0,0 +1,73 @@
+import inspect
+import logging
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from framework.logging_handler import PythagoraZenLogger
+from framework.settings_manager import SettingsManager
+
+pythagorazen_logger = PythagoraZenLogger()
+pythagorazen_logger.configure_logging()
+
+
+class ZendeskApiSessionManager:
+    # One pooled keep-alive session per Zendesk subdomain, shared by every paginator
+    _sessions = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_session(cls, zendesk_subdomain):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        with cls._lock:
+            session = cls._sessions.get(zendesk_subdomain)
+            if session is None:
+                session = cls.create_session()
+                cls._sessions[zendesk_subdomain] = session
+                logging.info(f"API SESSION CREATED: {zendesk_subdomain}")
+            return session
+
+    @classmethod
+    def create_session(cls):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        session_settings = SettingsManager().get_section("api_session")
+
+        adapter = HTTPAdapter(
+            pool_connections=session_settings.get("pool_connections", 10),
+            pool_maxsize=session_settings.get("pool_maxsize", 20),
+            pool_block=session_settings.get("pool_block", True),
+        )
+
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        # requests decompresses gzip/deflate bodies transparently
+        session.headers.update(
+            {
+                "Accept-Encoding": session_settings.get(
+                    "accept_encoding", "gzip, deflate"
+                ),
+                "Connection": "keep-alive",
+            }
+        )
+        return session
+
+    @classmethod
+    def close_session(cls, zendesk_subdomain):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        with cls._lock:
+            session = cls._sessions.pop(zendesk_subdomain, None)
+        if session is not None:
+            session.close()
+            logging.info(f"API SESSION CLOSED: {zendesk_subdomain}")
+
+    @classmethod
+    def close_all_sessions(cls):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        with cls._lock:
+            sessions = list(cls._sessions.items())
+            cls._sessions.clear()
+        for zendesk_subdomain, session in sessions:
+            session.close()
+            logging.info(f"API SESSION CLOSED: {zendesk_subdomain}")
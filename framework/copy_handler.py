@@ -24,42 +24,23 @@ class CopyHandler:
     @staticmethod
     def copy_selection(table):
         logging.debug(f"{inspect.currentframe().f_code.co_name}")
-        selection = table.selectedRanges()
+        selection = table.selectionModel().selectedIndexes()
         if selection:
-            rows = set()
-            columns = set()
-
-            for selected_range in selection:
-                rows.update(
-                    range(selected_range.topRow(), selected_range.bottomRow() + 1)
-                )
-                columns.update(
-                    range(selected_range.leftColumn(), selected_range.rightColumn() + 1)
-                )
+            model = table.model()
+            rows = sorted({index.row() for index in selection})
+            # Visual column order, so moved header sections copy as displayed
+            columns = sorted(
+                {index.column() for index in selection},
+                key=table.horizontalHeader().visualIndex,
+            )
 
             data = []
 
-            # Use logical index to get the correct order of column headers
-            header_order = [
-                table.horizontalHeaderItem(
-                    table.horizontalHeader().logicalIndex(column)
-                ).text()
-                for column in columns
-            ]
-
             # Include column headers as the first row
-            data.append(header_order)
+            data.append([model.get_header_text(column) for column in columns])
 
             for row in rows:
-                row_data = [
-                    table.item(
-                        row,
-                        table.horizontalHeader().logicalIndex(
-                            header_order.index(header)
-                        ),
-                    ).text()
-                    for header in header_order
-                ]
+                row_data = [model.get_cell_text(row, column) for column in columns]
                 data.append(row_data)
 
             clipboard = QApplication.clipboard()
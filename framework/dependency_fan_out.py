@@ -0,0 +1,138 @@
+import inspect
+import logging
+import re
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from framework.api_paginator import ZendeskApiPaginator
+from framework.logging_handler import PythagoraZenLogger
+from framework.settings_manager import SettingsManager
+
+
+class DependencyFanOutExecutor:
+    def __init__(
+        self,
+        zendesk_subdomain,
+        zendesk_api_user_email_address,
+        zendesk_api_key,
+        max_in_flight=None,
+        insert_batch_size=None,
+    ):
+        self.pythagorazen_logger = PythagoraZenLogger()
+        self.pythagorazen_logger.configure_logging()
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        fan_out_settings = SettingsManager().get_section("dependency_fan_out")
+        self.zendesk_subdomain = zendesk_subdomain
+        self.zendesk_api_user_email_address = zendesk_api_user_email_address
+        self.zendesk_api_key = zendesk_api_key
+        self.max_in_flight = max_in_flight or fan_out_settings.get("max_in_flight", 8)
+        self.insert_batch_size = insert_batch_size or fan_out_settings.get(
+            "insert_batch_size", 1000
+        )
+        self.poll_interval = fan_out_settings.get("poll_interval", 0.1)
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        self.cancel_event.set()
+
+    def build_dependency_endpoint(self, end_point, parent_id):
+        # /api/v2/tickets/{ticket_id}/collaborators -> /api/v2/tickets/123/collaborators
+        return re.sub(r"\{.*?\}", str(parent_id), end_point)
+
+    def fetch_parent(self, end_point, parent_id):
+        # Runs on a fan-out worker thread
+        dependency_endpoint = self.build_dependency_endpoint(end_point, parent_id)
+        logging.debug(f"UPDATED DEPENDENCY ENDPOINT: {dependency_endpoint}")
+        paginator = ZendeskApiPaginator(
+            self.zendesk_subdomain,
+            self.zendesk_api_user_email_address,
+            self.zendesk_api_key,
+            dependency_endpoint,
+            budget_key=end_point,
+        )
+        return list(paginator.iter_records())
+
+    def flush(self, instance_operations, buffered_records):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        if buffered_records:
+            instance_operations.write_collection_data(buffered_records)
+        return len(buffered_records)
+
+    def run(
+        self,
+        end_point,
+        parent_ids,
+        instance_operations,
+        total_parent_ids=None,
+        progress_callback=None,
+        cancel_check=None,
+    ):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        parent_ids = iter(parent_ids)
+        parent_ids_exhausted = False
+        buffered_records = []
+        inserted_documents = 0
+        processed_parent_ids = 0
+        errors = []
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_in_flight, thread_name_prefix="dependency_fan_out"
+        ) as executor:
+            pending = {}
+
+            while True:
+                # Keep a bounded number of parent ids queued so ids are not all materialized
+                while (
+                    not parent_ids_exhausted
+                    and not self.cancel_event.is_set()
+                    and len(pending) < self.max_in_flight * 2
+                ):
+                    parent_id = next(parent_ids, None)
+                    if parent_id is None:
+                        parent_ids_exhausted = True
+                        break
+                    future = executor.submit(self.fetch_parent, end_point, parent_id)
+                    pending[future] = parent_id
+
+                if not pending:
+                    break
+
+                done, _ = wait(
+                    pending, timeout=self.poll_interval, return_when=FIRST_COMPLETED
+                )
+
+                for future in done:
+                    parent_id = pending.pop(future)
+                    processed_parent_ids += 1
+                    try:
+                        buffered_records.extend(future.result())
+                    except Exception as e:
+                        error_message = str(e)
+                        errors.append({"parent_id": parent_id, "error": error_message})
+                        logging.error([f"error: {error_message}"])
+
+                # Inserts are batched across parent ids
+                if len(buffered_records) >= self.insert_batch_size:
+                    inserted_documents += self.flush(
+                        instance_operations, buffered_records
+                    )
+                    buffered_records = []
+
+                if progress_callback:
+                    progress_callback(processed_parent_ids, total_parent_ids)
+
+                if cancel_check and not self.cancel_event.is_set() and cancel_check():
+                    logging.warning("DEPENDENCY SYNC CANCELED BY USER")
+                    self.cancel()
+
+        inserted_documents += self.flush(instance_operations, buffered_records)
+
+        logging.info(
+            f"DEPENDENCY ENDPOINT {end_point}: {processed_parent_ids} parent ids, {inserted_documents} documents, {len(errors)} errors"
+        )
+        return {
+            "inserted_documents": inserted_documents,
+            "processed_parent_ids": processed_parent_ids,
+            "errors": errors,
+        }
@@ -0,0 +1,101 @@
+import inspect
+import logging
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from framework.logging_handler import PythagoraZenLogger
+from framework.settings_manager import SettingsManager
+
+
+class EndpointSyncScheduler:
+    def __init__(self, max_workers=None):
+        self.pythagorazen_logger = PythagoraZenLogger()
+        self.pythagorazen_logger.configure_logging()
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        scheduler_settings = SettingsManager().get_section("sync_scheduler")
+        self.max_workers = max_workers or scheduler_settings.get("max_workers", 4)
+        self.poll_interval = scheduler_settings.get("poll_interval", 0.1)
+        self.cancel_event = threading.Event()
+        # Per worker thread: whether the running job was stopped before its last page
+        self.job_state = threading.local()
+
+    def cancel(self):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        self.cancel_event.set()
+
+    def is_canceled(self):
+        return self.cancel_event.is_set()
+
+    def iter_until_canceled(self, pages):
+        # Stop pulling pages from an endpoint as soon as the sync is canceled
+        for page in pages:
+            if self.is_canceled():
+                logging.warning("SYNC CANCELED: stopping endpoint")
+                self.job_state.interrupted = True
+                return
+            yield page
+
+    def run_job(self, job):
+        # Runs on a scheduler worker thread
+        self.job_state.interrupted = False
+        result = job(self)
+        return result, self.job_state.interrupted
+
+    def run(self, jobs, progress_callback=None, cancel_check=None):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        # jobs maps an endpoint name to a callable taking this scheduler; results hold
+        # {"result", "error", "canceled"}, canceled jobs may have written some pages
+        results = {}
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="endpoint_sync"
+        ) as executor:
+            futures = {
+                executor.submit(self.run_job, job): name for name, job in jobs.items()
+            }
+            pending = set(futures)
+
+            while pending:
+                done, pending = wait(
+                    pending, timeout=self.poll_interval, return_when=FIRST_COMPLETED
+                )
+
+                completed_name = None
+                for future in done:
+                    name = futures[future]
+                    completed_name = name
+                    if future.cancelled():
+                        results[name] = {
+                            "result": None,
+                            "error": None,
+                            "canceled": True,
+                        }
+                        continue
+                    try:
+                        result, interrupted = future.result()
+                        results[name] = {
+                            "result": result,
+                            "error": None,
+                            "canceled": interrupted,
+                        }
+                    except Exception as e:
+                        error_message = str(e)
+                        results[name] = {
+                            "result": None,
+                            "error": error_message,
+                            "canceled": False,
+                        }
+                        logging.error([f"error: {error_message}"])
+
+                # Called on every poll so the caller can keep its event loop alive
+                if progress_callback:
+                    progress_callback(len(results), len(jobs), completed_name)
+
+                if cancel_check and not self.is_canceled() and cancel_check():
+                    logging.warning("SYNC CANCELED BY USER")
+                    self.cancel()
+                    # Endpoints that have not started yet are dropped outright
+                    for future in pending:
+                        future.cancel()
+
+        return results
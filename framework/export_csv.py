@@ -2,8 +2,6 @@ import csv
 import logging
 import inspect
 
-from PyQt5.QtWidgets import QTableWidget
-
 from framework.logging_handler import PythagoraZenLogger
 
 pythagorazen_logger = PythagoraZenLogger()
@@ -11,25 +9,18 @@ pythagorazen_logger.configure_logging()
 
 
 class CSVExporter:
-    def export(table: QTableWidget, file_path):
+    def export(row_source, file_path):
         logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        row_count = 0
         with open(file_path, "w", newline="") as csv_file:
             writer = csv.writer(csv_file)
 
-            # Get the logical (actual) order of columns
-            logical_order = [
-                table.horizontalHeader().logicalIndex(column)
-                for column in range(table.columnCount())
-            ]
-
-            # Write column headers based on the logical order
-            headers = [table.horizontalHeaderItem(i).text() for i in logical_order]
-            writer.writerow(headers)
+            # Write column headers in the table's column order
+            writer.writerow(row_source.headers)
 
-            # Write data rows
-            for row in range(table.rowCount()):
-                # Manually rearrange the data based on the logical order
-                row_data = [table.item(row, i).text() for i in logical_order]
-
-                # Write the rearranged row data
+            # Rows are written as they are read, nothing is held in memory
+            for row_data in row_source.iter_rows():
                 writer.writerow(row_data)
+                row_count += 1
+
+        return row_count
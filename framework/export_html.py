@@ -1,48 +1,54 @@
+import html
 import inspect
 import logging
 
-from PyQt5.QtWidgets import QTableWidget
-
+from framework.export_row_sources import iter_row_chunks
 from framework.logging_handler import PythagoraZenLogger
+from framework.settings_manager import SettingsManager
 
 pythagorazen_logger = PythagoraZenLogger()
 pythagorazen_logger.configure_logging()
 
 
 class HTMLExporter:
-    def export(table: QTableWidget, file_path):
+    def export(row_source, file_path):
         logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        export_settings = SettingsManager().get_section("exports")
+        chunk_rows = export_settings.get("html_chunk_rows", 1000)
         # Set the spacing between columns
         column_spacing = 1
+        row_count = 0
 
-        # Get the logical (actual) order of columns
-        logical_order = [
-            table.horizontalHeader().logicalIndex(column)
-            for column in range(table.columnCount())
-        ]
-
-        # Create the HTML content
-        html_content = f"<html><body><table style='width: 100%; border-spacing: {column_spacing}px;'>"
-
-        # Add table headers with bold and centered style
-        html_content += "<tr>"
-        for column in logical_order:
-            item = table.horizontalHeaderItem(column)
-            if item:
-                html_content += f"<th style='text-align: center; font-weight: bold;'>{item.text()}</th>"
-        html_content += "</tr>"
-
-        # Add table rows
-        for row in range(table.rowCount()):
-            html_content += "<tr>"
-            for column in logical_order:
-                item = table.item(row, column)
-                if item:
-                    html_content += f"<td style='text-align: left;'>{item.text()}</td>"
-            html_content += "</tr>"
-
-        html_content += "</table></body></html>"
-
-        # Write HTML content to the file
         with open(file_path, "w", encoding="utf-8") as file:
-            file.write(html_content)
+            file.write(
+                f"<html><body><table style='width: 100%; border-spacing: {column_spacing}px;'>"
+            )
+
+            # Add table headers with bold and centered style
+            file.write(
+                "<tr>"
+                + "".join(
+                    f"<th style='text-align: center; font-weight: bold;'>{html.escape(header)}</th>"
+                    for header in row_source.headers
+                )
+                + "</tr>"
+            )
+
+            # Rows are joined and written one chunk at a time
+            for chunk in iter_row_chunks(row_source.iter_rows(), chunk_rows):
+                file.write(
+                    "".join(
+                        "<tr>"
+                        + "".join(
+                            f"<td style='text-align: left;'>{html.escape(cell_text)}</td>"
+                            for cell_text in row_data
+                        )
+                        + "</tr>"
+                        for row_data in chunk
+                    )
+                )
+                row_count += len(chunk)
+
+            file.write("</table></body></html>")
+
+        return row_count
@@ -10,6 +10,8 @@ from framework.export_csv import CSVExporter
 from framework.export_html import HTMLExporter
 from framework.export_pdf import PDFExporter
 from framework.export_xlsx import XLSXExporter
+from framework.export_row_sources import get_row_source
+from framework.plugin_worker import PluginWorkerPool
 
 
 class ExportManager:
@@ -19,6 +21,34 @@ class ExportManager:
         logging.debug(f"{inspect.currentframe().f_code.co_name}")
         self.table = table
 
+    def start_export(self, exporter, file_path):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        # The row source is built from the table on the GUI thread, then streamed
+        # to the file on a worker so large collections do not freeze the window
+        row_source = get_row_source(self.table)
+        logging.info(f"EXPORTING TO {file_path}")
+        return PluginWorkerPool.submit(
+            self.write_export,
+            exporter,
+            row_source,
+            file_path,
+            on_result=self.log_export_result,
+            on_error=self.report_export_error,
+        )
+
+    def write_export(self, worker, exporter, row_source, file_path):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        return file_path, exporter.export(row_source, file_path)
+
+    def log_export_result(self, export_result):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        file_path, row_count = export_result
+        logging.info(f"EXPORTED {row_count} ROWS TO {file_path}")
+
+    def report_export_error(self, error_message):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        logging.error([f"error: {error_message}"])
+
     def set_buttons(self, html_button, pdf_button, csv_button, xlsx_button):
         logging.debug(f"{inspect.currentframe().f_code.co_name}")
         self.html_export_button = html_button
@@ -32,7 +62,7 @@ class ExportManager:
             self.html_export_button, "Save HTML File", "", "HTML Files (*.html)"
         )
         if file_path:
-            HTMLExporter.export(self.table, file_path)
+            self.start_export(HTMLExporter, file_path)
 
     def export_to_pdf(self):
         logging.debug(f"{inspect.currentframe().f_code.co_name}")
@@ -40,7 +70,7 @@ class ExportManager:
             self.pdf_export_button, "Save PDF File", "", "PDF Files (*.pdf)"
         )
         if file_path:
-            PDFExporter.export(self.table, file_path)
+            self.start_export(PDFExporter, file_path)
 
     def export_to_csv(self):
         logging.debug(f"{inspect.currentframe().f_code.co_name}")
@@ -48,7 +78,7 @@ class ExportManager:
             self.csv_export_button, "Save CSV File", "", "CSV Files (*.csv)"
         )
         if file_path:
-            CSVExporter.export(self.table, file_path)
+            self.start_export(CSVExporter, file_path)
 
     def export_to_xlsx(self):
         logging.debug(f"{inspect.currentframe().f_code.co_name}")
@@ -56,7 +86,7 @@ class ExportManager:
             self.xlsx_export_button, "Save XLSX File", "", "XLSX Files (*.xlsx)"
         )
         if file_path:
-            XLSXExporter.export(self.table, file_path)
+            self.start_export(XLSXExporter, file_path)
 
     def hide_save_buttons(self):
         logging.debug(f"{inspect.currentframe().f_code.co_name}")
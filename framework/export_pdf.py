@@ -1,50 +1,161 @@
 import inspect
 import logging
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 
-from PyQt5.QtWidgets import QTableWidget
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
+from reportlab.pdfbase.pdfmetrics import stringWidth
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
 
+from framework.export_row_sources import iter_row_chunks
 from framework.logging_handler import PythagoraZenLogger
+from framework.settings_manager import SettingsManager
 
 pythagorazen_logger = PythagoraZenLogger()
 pythagorazen_logger.configure_logging()
 
 
+class TableChunkFlowables(list):
+    # build() only ever sees the table it is laying out; the next chunk's table is
+    # created when reportlab asks for more, so rows are never all held as flowables.
+    # Relies on build() looping on len(flowables), as reportlab 4.0.6 (pinned) does
+    def __init__(self, pdf_tables):
+        super().__init__()
+        self.pdf_tables = iter(pdf_tables)
+
+    def __len__(self):
+        if not super().__len__():
+            pdf_table = next(self.pdf_tables, None)
+            if pdf_table is not None:
+                self.append(pdf_table)
+        return super().__len__()
+
+
+def get_column_widths(headers, chunk, available_width):
+    # Measured on the first chunk (default 10pt fonts, 6pt padding each side) and
+    # stretched to the frame, so later chunks line up and longer values have room
+    column_widths = [
+        max(
+            [stringWidth(str(header), "Helvetica-Bold", 10)]
+            + [stringWidth(str(row[column]), "Helvetica", 10) for row in chunk]
+        )
+        + 12
+        for column, header in enumerate(headers)
+    ]
+    total_width = sum(column_widths)
+    if 0 < total_width < available_width:
+        column_widths = [
+            column_width * available_width / total_width
+            for column_width in column_widths
+        ]
+    return column_widths
+
+
+def iter_pdf_tables(headers, rows, chunk_rows, table_style, available_width):
+    # One small table per chunk keeps reportlab's layout and page splitting cheap,
+    # repeatRows carries the header onto every page a chunk spills onto. Every
+    # chunk shares one set of column widths so columns do not jump between chunks
+    row_count = 0
+    column_widths = None
+    for chunk in iter_row_chunks(rows, chunk_rows):
+        if column_widths is None:
+            column_widths = get_column_widths(headers, chunk, available_width)
+        pdf_table = Table([headers] + chunk, colWidths=column_widths, repeatRows=1)
+        pdf_table.setStyle(table_style)
+        row_count += len(chunk)
+        yield pdf_table
+    if not row_count:
+        pdf_table = Table([headers])
+        pdf_table.setStyle(table_style)
+        yield pdf_table
+
+
+def render_pdf(file_path, headers, rows, chunk_rows):
+    # Module level so it can run in a worker process
+    doc = SimpleDocTemplate(file_path, pagesize=letter)
+    table_style = TableStyle(
+        [
+            ("BACKGROUND", (0, 0), (-1, 0), colors.white),
+            ("TEXTCOLOR", (0, 0), (-1, 0), colors.black),
+            ("ALIGN", (0, 0), (-1, 0), "CENTER"),
+            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+            ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
+            ("BACKGROUND", (0, 1), (-1, -1), colors.white),
+            ("GRID", (0, 0), (-1, -1), 0, colors.white),
+        ]
+    )
+
+    # Count the rows on their way to reportlab
+    row_count = 0
+
+    def count_rows(rows):
+        nonlocal row_count
+        for row_data in rows:
+            row_count += 1
+            yield row_data
+
+    # Build PDF document
+    doc.build(
+        TableChunkFlowables(
+            iter_pdf_tables(
+                headers, count_rows(rows), chunk_rows, table_style, doc.width
+            )
+        )
+    )
+    return row_count
+
+
 class PDFExporter:
-    def export(table: QTableWidget, file_path):
+    def export(row_source, file_path):
         logging.debug(f"{inspect.currentframe().f_code.co_name}")
-        # Get the logical (actual) order of columns
-        logical_order = [
-            table.horizontalHeader().logicalIndex(column)
-            for column in range(table.columnCount())
-        ]
+        export_settings = SettingsManager().get_section("exports")
+        chunk_rows = export_settings.get("pdf_chunk_rows", 500)
+        rows_per_file = export_settings.get("pdf_rows_per_file", 0)
 
-        # Extract headers and data from QTableWidget based on the logical order
-        headers = [table.horizontalHeaderItem(i).text() for i in logical_order]
-        data = [headers]
-        for row in range(table.rowCount()):
-            row_data = [table.item(row, i).text() for i in logical_order]
-            data.append(row_data)
-
-        # Create PDF document
-        doc = SimpleDocTemplate(file_path, pagesize=letter)
-        table_style = TableStyle(
-            [
-                ("BACKGROUND", (0, 0), (-1, 0), colors.white),
-                ("TEXTCOLOR", (0, 0), (-1, 0), colors.black),
-                ("ALIGN", (0, 0), (-1, 0), "CENTER"),
-                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
-                ("BACKGROUND", (0, 1), (-1, -1), colors.white),
-                ("GRID", (0, 0), (-1, -1), 0, colors.white),
-            ]
+        if not rows_per_file:
+            return render_pdf(
+                file_path, row_source.headers, row_source.iter_rows(), chunk_rows
+            )
+
+        return PDFExporter.export_parts(
+            row_source,
+            file_path,
+            chunk_rows,
+            rows_per_file,
+            export_settings.get("pdf_max_workers", 4),
         )
 
-        # Create table and apply style
-        pdf_table = Table(data)
-        pdf_table.setStyle(table_style)
+    def export_parts(row_source, file_path, chunk_rows, rows_per_file, max_workers):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        # report.pdf -> report_part001.pdf, report_part002.pdf, ...
+        base_path, extension = os.path.splitext(file_path)
+        row_count = 0
+
+        # Exports run on a QThreadPool worker; forking a threaded Qt process can
+        # deadlock the child, so the parts render in freshly spawned processes
+        with ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            pending = set()
+            for part_number, part_rows in enumerate(
+                iter_row_chunks(row_source.iter_rows(), rows_per_file), start=1
+            ):
+                # Only hand out as many parts as there are workers, so rows read
+                # from the cursor never pile up waiting to be rendered
+                if len(pending) >= max_workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    row_count += sum(future.result() for future in done)
+
+                part_path = f"{base_path}_part{part_number:03d}{extension}"
+                logging.info(f"RENDERING PDF PART: {part_path}")
+                pending.add(
+                    executor.submit(
+                        render_pdf, part_path, row_source.headers, part_rows, chunk_rows
+                    )
+                )
+
+            row_count += sum(future.result() for future in pending)
 
-        # Build PDF document
-        doc.build([pdf_table])
+        return row_count
@@ -0,0 +1,82 @@
+import inspect
+import logging
+from itertools import islice
+
+from framework.logging_handler import PythagoraZenLogger
+from framework.table_models import MongoCursorTableModel
+
+pythagorazen_logger = PythagoraZenLogger()
+pythagorazen_logger.configure_logging()
+
+
+class TableModelRowSource:
+    # Rows already held by an in-memory table model, in the table's column order
+    def __init__(self, table_model, column_order):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        self.columns = [table_model.columns[column] for column in column_order]
+        self.headers = list(self.columns)
+        # A shallow copy, so sorting the table while exporting cannot reorder rows
+        self.rows = list(table_model.rows)
+
+    def iter_rows(self):
+        for row in self.rows:
+            yield [str(row.get(column, "")) for column in self.columns]
+
+
+class MongoCursorRowSource:
+    # Rows read from a fresh cursor, nothing is buffered beyond the driver batch
+    def __init__(self, instance_operations, query, projection, columns, sort=None):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        self.instance_operations = instance_operations
+        self.query = query
+        self.projection = projection
+        self.columns = columns
+        self.headers = list(columns)
+        self.sort = sort
+
+    def iter_rows(self):
+        cursor = self.instance_operations.query_collection_cursor(
+            self.query,
+            self.projection,
+            sort=self.sort,
+            allow_disk_use=bool(self.sort) or None,
+        )
+        try:
+            for document in cursor:
+                yield [self.get_cell_text(document, column) for column in self.columns]
+        finally:
+            cursor.close()
+
+    def get_cell_text(self, document, column):
+        # Missing fields export as "", like TableModelRowSource
+        value = self.instance_operations.get_nested_value(document, column)
+        return "" if value is None else str(value)
+
+
+def get_row_source(table):
+    logging.debug(f"{inspect.currentframe().f_code.co_name}")
+    table_model = table.model()
+    # Columns follow the header's visual order, so moved sections export as displayed
+    column_order = [
+        table.horizontalHeader().logicalIndex(column)
+        for column in range(table_model.columnCount())
+    ]
+    if isinstance(table_model, MongoCursorTableModel):
+        return MongoCursorRowSource(
+            table_model.instance_operations,
+            table_model.build_query(),
+            table_model.projection,
+            [table_model.columns[column] for column in column_order],
+            table_model.sort_spec,
+        )
+    return TableModelRowSource(table_model, column_order)
+
+
+def iter_row_chunks(rows, chunk_size):
+    # Lists of at most chunk_size rows, read lazily from any row iterator
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
@@ -2,25 +2,23 @@ import inspect
 import logging
 
 import xlsxwriter
-from PyQt5.QtWidgets import QTableWidget
 
 from framework.logging_handler import PythagoraZenLogger
+from framework.settings_manager import SettingsManager
 
 pythagorazen_logger = PythagoraZenLogger()
 pythagorazen_logger.configure_logging()
 
 
 class XLSXExporter:
-    def export(table: QTableWidget, file_path):
+    def export(row_source, file_path):
         logging.debug(f"{inspect.currentframe().f_code.co_name}")
-        workbook = xlsxwriter.Workbook(file_path)
-        worksheet = workbook.add_worksheet()
+        export_settings = SettingsManager().get_section("exports")
+        max_column_width = export_settings.get("xlsx_max_column_width", 100)
 
-        # Get the logical (actual) order of columns
-        logical_order = [
-            table.horizontalHeader().logicalIndex(column)
-            for column in range(table.columnCount())
-        ]
+        # constant_memory flushes each row to disk once the next row is started
+        workbook = xlsxwriter.Workbook(file_path, {"constant_memory": True})
+        worksheet = workbook.add_worksheet()
 
         # Define a bold format for headers
         bold_format = workbook.add_format(
@@ -28,27 +26,26 @@ class XLSXExporter:
         )
 
         # Write headers to the first row with the bold format
-        headers = [table.horizontalHeaderItem(i).text() for i in logical_order]
-        for col_num, header in enumerate(headers):
-            worksheet.write(0, col_num, header, bold_format)
-
-        # Write data starting from the second row
-        for row in range(table.rowCount()):
-            for col_num, header in enumerate(headers):
-                item = table.item(row, logical_order[col_num])
-                if item:
-                    worksheet.write(row + 1, col_num, item.text())
-
-        # Set the width of columns based on the maximum length of the data in each column
-        for col_num, header in enumerate(headers):
-            max_length = max(
-                [
-                    len(str(table.item(row, logical_order[col_num]).text()))
-                    for row in range(table.rowCount())
-                ]
-            )
+        headers = row_source.headers
+        worksheet.write_row(0, 0, headers, bold_format)
+
+        # Column widths are estimated in the same pass that writes the rows
+        column_lengths = [min(len(header), max_column_width) for header in headers]
+        row_count = 0
+        for row_data in row_source.iter_rows():
+            row_count += 1
+            worksheet.write_row(row_count, 0, row_data)
+            for col_num, cell_text in enumerate(row_data):
+                if column_lengths[col_num] < max_column_width:
+                    column_lengths[col_num] = min(
+                        max(column_lengths[col_num], len(cell_text)), max_column_width
+                    )
+
+        # Set the width of columns based on the longest value seen in each column
+        for col_num, column_length in enumerate(column_lengths):
             worksheet.set_column(
-                col_num, col_num, max_length * 1.2
+                col_num, col_num, column_length * 1.2
             )  # Adjust the multiplier factor
 
         workbook.close()
+        return row_count
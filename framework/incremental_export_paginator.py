@@ -0,0 +1,83 @@
+import inspect
+import logging
+
+import requests
+
+from framework.api_paginator import ZendeskApiPaginator
+from framework.rate_limiter import ZendeskRateLimiter
+
+
+class ZendeskIncrementalExportPaginator(ZendeskApiPaginator):
+    # Follows Zendesk's incremental export APIs from a persisted checkpoint
+    def __init__(
+        self,
+        zendesk_subdomain,
+        zendesk_api_user_email,
+        zendesk_api_key,
+        incremental_export,
+        checkpoint=None,
+    ):
+        super().__init__(
+            zendesk_subdomain,
+            zendesk_api_user_email,
+            zendesk_api_key,
+            incremental_export["end_point"],
+        )
+        # Incremental exports have their own per-minute cap and their own bucket
+        self.rate_limiter = ZendeskRateLimiter.get_rate_limiter(
+            zendesk_subdomain, incremental_exports=True
+        )
+        self.pagination = incremental_export.get("pagination", "time")
+        self.records_key = incremental_export["records_key"]
+        self.initial_start_time = incremental_export.get("start_time", 1)
+        self.checkpoint = dict(checkpoint or {})
+
+    def get_start_url(self):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        url = f"{self.base_url}{self.endpoint}"
+        if self.pagination == "cursor" and self.checkpoint.get("cursor"):
+            return f"{url}?cursor={self.checkpoint['cursor']}"
+        start_time = self.checkpoint.get("start_time", self.initial_start_time)
+        return f"{url}?start_time={start_time}"
+
+    def get_checkpoint(self, response_json):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        if self.pagination == "cursor":
+            if response_json.get("after_cursor"):
+                return {"cursor": response_json["after_cursor"]}
+        elif response_json.get("end_time"):
+            return {"start_time": response_json["end_time"]}
+        return self.checkpoint
+
+    def get_next_page_url(self, response_json):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        if response_json.get("end_of_stream"):
+            return None
+        if self.pagination == "cursor":
+            return response_json.get("after_url")
+        return response_json.get("next_page")
+
+    def iter_pages(self):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        try:
+            url_count = 1
+            url = self.get_start_url()
+            headers = {"Authorization": f"Basic {self.base64_api_auth}"}
+
+            while url:
+                logging.info(f"{url_count}. {url}\n")
+
+                response = self.get_page(url, headers)
+                response_json = response.json()
+
+                # Callers persist self.checkpoint once the page has been written
+                self.checkpoint = self.get_checkpoint(response_json)
+                yield response_json.get(self.records_key, [])
+
+                url = self.get_next_page_url(response_json)
+                url_count += 1
+
+        except requests.exceptions.RequestException as e:
+            error_message = str(e)
+            logging.error(f"REQUEST ERROR: {error_message}")
+            raise
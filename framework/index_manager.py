@@ -0,0 +1,234 @@
+import inspect
+import json
+import logging
+from datetime import timezone
+
+from pymongo.errors import DuplicateKeyError, OperationFailure
+
+from framework.config_manager import ConfigManager
+from framework.instance_database_operations_api_endpoint_config import (
+    ZendeskInstanceDatabaseOperationsMongoDB,
+)
+from framework.key_discovery import MongoDBKeyDiscovery
+from framework.logging_handler import PythagoraZenLogger
+
+
+class MongoDBIndexManager:
+    # Indexed whenever a synced collection actually contains the field
+    foreign_key_fields = [
+        "organization_id",
+        "default_group_id",
+        "custom_role_id",
+        "group_id",
+        "brand_id",
+        "requester_id",
+        "submitter_id",
+        "assignee_id",
+        "ticket_id",
+        "user_id",
+    ]
+
+    def __init__(self, zendesk_subdomain):
+        self.pythagorazen_logger = PythagoraZenLogger()
+        self.pythagorazen_logger.configure_logging()
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        self.zendesk_subdomain = zendesk_subdomain
+        self.config_manager = ConfigManager()
+        self.instance_operations = ZendeskInstanceDatabaseOperationsMongoDB(
+            zendesk_subdomain, ""
+        )
+
+    def add_expected_index(self, expected_indexes, collection_name, field, unique):
+        collection_indexes = expected_indexes.setdefault(collection_name, {})
+        # A field shared by several endpoints is only unique if every endpoint agrees
+        collection_indexes[field] = collection_indexes.get(field, unique) and unique
+
+    def get_expected_indexes(self, collection_names=None):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        # {collection_name: {field: unique}} derived from api_endpoint_config.json
+        expected_indexes = {}
+
+        for endpoint_details in self.config_manager.get_active_endpoints():
+            collection_name = endpoint_details.get("mongodb_collection")
+            if not collection_name:
+                continue
+
+            end_point_dependencies = endpoint_details.get("end_point_dependencies")
+            # Dependency collections can hold the same object under several parents
+            self.add_expected_index(
+                expected_indexes, collection_name, "id", not end_point_dependencies
+            )
+            self.add_expected_index(
+                expected_indexes, collection_name, "updated_at", False
+            )
+            for field in endpoint_details.get("mongodb_indexes", []):
+                self.add_expected_index(expected_indexes, collection_name, field, False)
+
+            if end_point_dependencies:
+                self.add_expected_index(
+                    expected_indexes,
+                    end_point_dependencies["mongodb_dependency_collection"],
+                    end_point_dependencies["mongodb_dependency_collection_key"],
+                    False,
+                )
+
+        available_collections = set(
+            self.instance_operations.list_available_collections()
+        )
+        if collection_names is not None:
+            available_collections &= set(collection_names)
+
+        expected_indexes = {
+            collection_name: fields
+            for collection_name, fields in expected_indexes.items()
+            if collection_name in available_collections
+        }
+
+        # Keys come from the schema catalog (or one cached aggregation), not a
+        # collection scan per candidate field
+        key_discovery = MongoDBKeyDiscovery(self.zendesk_subdomain)
+        for collection_name, fields in expected_indexes.items():
+            collection_keys = key_discovery.get_keys(collection_name)
+            for field in self.foreign_key_fields:
+                if field not in fields and field in collection_keys:
+                    fields[field] = False
+
+        return expected_indexes
+
+    def get_existing_indexes(self, collection):
+        # {field: (index_name, unique, partial)} for single-field indexes
+        existing_indexes = {}
+        for index_name, index_details in collection.index_information().items():
+            if len(index_details["key"]) == 1:
+                field = index_details["key"][0][0]
+                existing_indexes[field] = (
+                    index_name,
+                    index_details.get("unique", False),
+                    "partialFilterExpression" in index_details,
+                )
+        return existing_indexes
+
+    def create_unique_index(self, collection, field):
+        # Partial, so single-object endpoints and other documents without the
+        # field never collide on a null key
+        collection.create_index(
+            field, unique=True, partialFilterExpression={field: {"$exists": True}}
+        )
+
+    def can_be_unique(self, collection, field):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        # Explicit nulls would still share one key in the partial index
+        if collection.find_one({field: {"$exists": True, "$eq": None}}, {"_id": 1}):
+            logging.warning(
+                f"NULL {field} VALUES IN {collection.name}, KEEPING A NON-UNIQUE INDEX"
+            )
+            return False
+
+        # Stops at the first value held by two documents
+        duplicates = list(
+            collection.aggregate(
+                [
+                    {"$match": {field: {"$exists": True}}},
+                    {"$group": {"_id": f"${field}", "count": {"$sum": 1}}},
+                    {"$match": {"count": {"$gt": 1}}},
+                    {"$limit": 1},
+                ],
+                allowDiskUse=True,
+            )
+        )
+        if duplicates:
+            logging.warning(
+                f"DUPLICATE {field} VALUES IN {collection.name}, KEEPING A NON-UNIQUE INDEX"
+            )
+            return False
+        return True
+
+    def ensure_indexes(self, collection_names=None):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        for collection_name, fields in self.get_expected_indexes(
+            collection_names
+        ).items():
+            collection = self.instance_operations.db[collection_name]
+            existing_indexes = self.get_existing_indexes(collection)
+
+            for field, unique in fields.items():
+                existing_index = existing_indexes.get(field)
+                # Already a partial unique index, nothing to check or rebuild
+                if existing_index and existing_index[1] and existing_index[2]:
+                    continue
+
+                # Checked before any index is dropped, so a build that would fail
+                # never costs the working index
+                if unique and not self.can_be_unique(collection, field):
+                    unique = False
+
+                if existing_index:
+                    if not unique:
+                        continue
+                    # Upgrade a plain (or full unique) id index to a partial unique one
+                    collection.drop_index(existing_index[0])
+
+                if not unique:
+                    collection.create_index(field)
+                    logging.info(f"INDEX CREATED: {collection_name}.{field}")
+                    continue
+
+                try:
+                    self.create_unique_index(collection, field)
+                    logging.info(f"UNIQUE INDEX CREATED: {collection_name}.{field}")
+                except (DuplicateKeyError, OperationFailure) as e:
+                    logging.warning(
+                        f"UNIQUE INDEX FAILED ON {collection_name}.{field}, FALLING BACK TO NON-UNIQUE: {e}"
+                    )
+                    collection.create_index(field)
+
+    def get_index_report(self, collection_names=None, since=None):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        # Indexes whose counters started after since (an aware datetime) have had
+        # no chance to be used yet and are left out of "unused"
+        index_report = {"missing": {}, "unused": {}}
+
+        for collection_name, fields in self.get_expected_indexes(
+            collection_names
+        ).items():
+            collection = self.instance_operations.db[collection_name]
+            existing_indexes = self.get_existing_indexes(collection)
+
+            missing_fields = [field for field in fields if field not in existing_indexes]
+            if missing_fields:
+                index_report["missing"][collection_name] = missing_fields
+
+            # Access counters reset when mongod restarts
+            unused_indexes = [
+                index_stats["name"]
+                for index_stats in collection.aggregate([{"$indexStats": {}}])
+                if index_stats["name"] != "_id_"
+                and index_stats["accesses"]["ops"] == 0
+                and not self.is_counted_since(index_stats, since)
+            ]
+            if unused_indexes:
+                index_report["unused"][collection_name] = unused_indexes
+
+        return index_report
+
+    def is_counted_since(self, index_stats, since):
+        if since is None:
+            return False
+        counted_since = index_stats["accesses"]["since"]
+        # pymongo returns naive UTC datetimes unless the client is tz_aware
+        if counted_since.tzinfo is None:
+            counted_since = counted_since.replace(tzinfo=timezone.utc)
+        return counted_since >= since
+
+    def log_index_report(self, collection_names=None, since=None):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        index_report = self.get_index_report(collection_names, since)
+        if index_report["missing"]:
+            logging.warning(
+                f"MISSING INDEXES:\n{json.dumps(index_report['missing'], indent=4)}"
+            )
+        else:
+            logging.info("MISSING INDEXES: none")
+        logging.info(
+            f"UNUSED INDEXES (since last mongod restart):\n{json.dumps(index_report['unused'], indent=4)}"
+        )
@@ -1,26 +1,50 @@
 import inspect
 import logging
+import threading
 
-from pymongo import MongoClient
+from pymongo import InsertOne, ReplaceOne
+from pymongo.write_concern import WriteConcern
 
 from framework.logging_handler import PythagoraZenLogger
+from framework.mongodb_client_manager import MongoDBClientManager
+from framework.settings_manager import SettingsManager
 
 
 class ZendeskInstanceDatabaseOperationsMongoDB:
+    # {(subdomain, collection_name)} already checked for copies left by insert syncs
+    _deduplicated_collections = set()
+    _deduplicated_lock = threading.Lock()
+    # {(subdomain, collection_name): Lock}; profiled writes read the stored versions
+    # first, so two handles must not interleave their writes to one collection
+    _collection_write_locks = {}
+
     def __init__(self, subdomain, collection_name):
         self.pythagorazen_logger = PythagoraZenLogger()
         self.pythagorazen_logger.configure_logging()
         logging.debug(f"{inspect.currentframe().f_code.co_name}")
         self.subdomain = subdomain
-        self.client = MongoClient(
-            "mongodb://localhost:27017/"
-        )  # Assuming MongoDB is running locally
+        # Shared process-wide client; this object is only a cheap handle onto it
+        self.client = MongoDBClientManager.get_client()
         self.db = self.client[subdomain]
 
         # logging.info(f"MONGODB CLASS: {self.db}")
 
         self.zendesk_subdomain = subdomain
 
+        write_settings = SettingsManager().get_section("mongodb_writes")
+        # "upsert" keeps one document per Zendesk id, "insert" appends every sync
+        self.write_mode = write_settings.get("write_mode", "upsert")
+        self.write_batch_size = write_settings.get("batch_size", 1000)
+        self.write_concern = WriteConcern(**write_settings.get("write_concern", {}))
+        self.id_index_ensured = False
+        # A handle writes one endpoint for one sync, see upsert_collection_data
+        self.documents_without_id_replaced = False
+        # Set by the sync so every write also records its change, see SchemaProfile
+        self.schema_profile = None
+        self.query_batch_size = SettingsManager().get_section("mongodb").get(
+            "query_batch_size", 1000
+        )
+
         if collection_name:
             self.collection = self.db[collection_name]
             logging.info(f"MONGODB CLASS: {self.collection}")
@@ -42,11 +66,182 @@ class ZendeskInstanceDatabaseOperationsMongoDB:
             logging.info(f"INSERTING DATA INTO COLLECTION: {self.collection}")
             # self.delete_many()
             self.collection.insert_many(data)
+            if self.schema_profile is not None:
+                self.schema_profile.observe_page(data)
         except Exception as e:
             error_message = str(e)
             logging.error(f"Error inserting {data} data: {error_message}")
             raise
 
+    @staticmethod
+    def split_documents_by_id(data):
+        # Keep one document per Zendesk object, keyed on its id; the last copy wins
+        documents_by_id = {}
+        documents_without_id = []
+        for document in data:
+            if document.get("id") is not None:
+                documents_by_id[document["id"]] = document
+            else:
+                documents_without_id.append(document)
+        return documents_by_id, documents_without_id
+
+    def upsert_collection_data(self, data):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        if not isinstance(data, list):
+            raise TypeError(f"{type(data)} data must be a list")
+
+        if not data:
+            logging.warning(f"{data} data is empty. No documents will be upserted.")
+            return
+
+        documents_by_id, documents_without_id = self.split_documents_by_id(data)
+
+        requests = [
+            ReplaceOne({"id": document_id}, document, upsert=True)
+            for document_id, document in documents_by_id.items()
+        ]
+        requests.extend(InsertOne(document) for document in documents_without_id)
+        replace_documents_without_id = (
+            documents_without_id and not self.documents_without_id_replaced
+        )
+
+        collection = self.collection.with_options(write_concern=self.write_concern)
+
+        with self.get_collection_write_lock():
+            # Without an index on id every ReplaceOne would scan the whole collection
+            if not self.id_index_ensured:
+                self.create_indexes()
+                self.id_index_ensured = True
+                # ReplaceOne only rewrites one copy, older copies must go first
+                self.remove_duplicate_ids()
+
+            try:
+                logging.info(f"UPSERTING DATA INTO COLLECTION: {self.collection}")
+                if replace_documents_without_id:
+                    # Objects without an id (tags, account settings) have nothing to
+                    # upsert on, so this sync's copies replace those of earlier syncs
+                    deleted_documents = self.find_profiled_documents({"id": None})
+                    deleted = self.collection.delete_many({"id": None})
+                    self.forget_documents(deleted_documents)
+                    self.documents_without_id_replaced = True
+                    logging.info(
+                        f"REPLACING {deleted.deleted_count} DOCUMENTS WITHOUT ID: {self.collection}"
+                    )
+                # Stored versions leave the profile, so it counts documents rather
+                # than every write of a changed record
+                replaced_documents = self.find_profiled_documents(
+                    {"id": {"$in": list(documents_by_id)}}
+                )
+                for batch_start in range(0, len(requests), self.write_batch_size):
+                    collection.bulk_write(
+                        requests[batch_start : batch_start + self.write_batch_size],
+                        ordered=False,
+                    )
+                if self.schema_profile is not None:
+                    self.schema_profile.forget_page(replaced_documents)
+                    self.schema_profile.observe_page(documents_by_id.values())
+                    self.schema_profile.observe_page(documents_without_id)
+            except Exception as e:
+                error_message = str(e)
+                logging.error(f"Error upserting data: {error_message}")
+                raise
+
+    def get_collection_write_lock(self):
+        collection_key = (self.subdomain, self.collection.name)
+        with self._deduplicated_lock:
+            return self._collection_write_locks.setdefault(
+                collection_key, threading.Lock()
+            )
+
+    def find_profiled_documents(self, query):
+        # Stored versions a write is about to replace or delete; only read when the
+        # write is profiled, and only forgotten once the write has succeeded
+        if self.schema_profile is None:
+            return []
+        return list(self.collection.find(query, {"_id": 0}))
+
+    def forget_documents(self, documents):
+        if self.schema_profile is not None:
+            self.schema_profile.forget_page(documents)
+
+    def remove_duplicate_ids(self):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        # Collections written by insert syncs hold one copy per sync of every object;
+        # keep the newest copy of each id. Runs once per collection and process
+        collection_key = (self.subdomain, self.collection.name)
+        with self._deduplicated_lock:
+            if collection_key in self._deduplicated_collections:
+                return
+            self._deduplicated_collections.add(collection_key)
+
+        # A unique id index already rules out copies
+        id_index = self.collection.index_information().get("id_1", {})
+        if id_index.get("unique"):
+            return
+
+        surplus_ids = []
+        removed_documents = 0
+        for duplicate in self.collection.aggregate(
+            [
+                {"$match": {"id": {"$ne": None}}},
+                {
+                    "$group": {
+                        "_id": "$id",
+                        "count": {"$sum": 1},
+                        "keep": {"$max": "$_id"},
+                        "ids": {"$push": "$_id"},
+                    }
+                },
+                {"$match": {"count": {"$gt": 1}}},
+            ],
+            allowDiskUse=True,
+        ):
+            surplus_ids.extend(
+                document_id
+                for document_id in duplicate["ids"]
+                if document_id != duplicate["keep"]
+            )
+            if len(surplus_ids) >= self.write_batch_size:
+                removed_documents += self.delete_by_object_ids(surplus_ids)
+                surplus_ids = []
+        if surplus_ids:
+            removed_documents += self.delete_by_object_ids(surplus_ids)
+
+        if removed_documents:
+            logging.info(
+                f"REMOVED {removed_documents} DUPLICATE DOCUMENTS: {self.collection}"
+            )
+
+    def delete_by_object_ids(self, object_ids):
+        deleted_documents = self.find_profiled_documents({"_id": {"$in": object_ids}})
+        deleted_count = self.collection.delete_many(
+            {"_id": {"$in": object_ids}}
+        ).deleted_count
+        self.forget_documents(deleted_documents)
+        return deleted_count
+
+    def write_collection_data(self, data):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        if self.write_mode == "upsert":
+            self.upsert_collection_data(data)
+        else:
+            self.insert_collection_data(data)
+
+    def insert_collection_pages(self, pages):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        # Write each page as it arrives so only one page is held in memory
+        written_documents = 0
+        for page in pages:
+            if not page:
+                continue
+            self.write_collection_data(page)
+            written_documents += len(page)
+
+        logging.info(
+            f"WROTE {written_documents} DOCUMENTS INTO COLLECTION ({self.write_mode}): {self.collection}"
+        )
+        return written_documents
+
     def delete_many(self, query={}):
         logging.debug(f"{inspect.currentframe().f_code.co_name}")
         # Delete many documents from the specified collection based on the given query
@@ -54,10 +249,86 @@ class ZendeskInstanceDatabaseOperationsMongoDB:
         self.collection.delete_many({"id": None})
 
     def query_collection(self, query={}, projection=None):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        # Materializes the whole result; prefer query_collection_cursor for large collections
+        return list(self.query_collection_cursor(query, projection))
+
+    def query_collection_cursor(
+        self,
+        query={},
+        projection=None,
+        sort=None,
+        limit=0,
+        skip=0,
+        batch_size=None,
+        allow_disk_use=None,
+    ):
         logging.debug(f"{inspect.currentframe().f_code.co_name}")
         logging.debug(f"Query: {query}")
         logging.debug(f"Projection: {projection}")
-        return list(self.collection.find(query, projection))
+        logging.debug(f"Sort: {sort}, Limit: {limit}, Skip: {skip}")
+        # Lazy cursor: documents are pulled from the server batch_size at a time
+        cursor = self.collection.find(
+            query,
+            projection,
+            sort=sort,
+            limit=limit,
+            skip=skip,
+            allow_disk_use=allow_disk_use,
+        )
+        return cursor.batch_size(batch_size or self.query_batch_size)
+
+    def query_collection_chunks(
+        self,
+        query={},
+        projection=None,
+        chunk_size=1000,
+        sort=None,
+        limit=0,
+        skip=0,
+    ):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        # Yield lists of at most chunk_size documents for page-at-a-time consumers
+        chunk = []
+        for document in self.query_collection_cursor(
+            query, projection, sort=sort, limit=limit, skip=skip, batch_size=chunk_size
+        ):
+            chunk.append(document)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    @staticmethod
+    def build_projection(keys):
+        # Selected keys (dotted paths allowed) -> server-side inclusion projection
+        projection = {}
+        for key in sorted(keys, key=lambda key: key.count(".")):
+            # MongoDB rejects a path together with one of its parents ("path collision")
+            parts = key.split(".")
+            if any(
+                ".".join(parts[:depth]) in projection for depth in range(1, len(parts))
+            ):
+                continue
+            projection[key] = 1
+        projection["_id"] = 0
+        return projection
+
+    @staticmethod
+    def get_nested_value(document, key):
+        # Resolve a dotted path, fanning out over arrays like MongoDB does
+        value = document
+        for part in key.split("."):
+            if isinstance(value, list):
+                value = [
+                    item.get(part) for item in value if isinstance(item, dict)
+                ]
+            elif isinstance(value, dict):
+                value = value.get(part)
+            else:
+                return None
+        return value
 
     def query_collection_find_one(self, query={}, projection=None):
         logging.debug(f"{inspect.currentframe().f_code.co_name}")
@@ -72,10 +343,12 @@ class ZendeskInstanceDatabaseOperationsMongoDB:
 
     def create_indexes(self):
         logging.debug(f"{inspect.currentframe().f_code.co_name}")
-        if "id" in self.collection.index_information():
-            self.collection.create_index("id", unique=True)
+        # Create the id index when it is missing; MongoDBIndexManager handles the rest.
+        # Any existing id_1 is kept as is, it may have been upgraded to a unique index
+        if "id_1" not in self.collection.index_information():
+            self.collection.create_index("id")
 
     def close_connection(self):
         logging.debug(f"{inspect.currentframe().f_code.co_name}")
-        # Close the MongoDB connection
-        self.client.close()
+        # The client is shared by every handle and is closed when the application exits
+        logging.debug(f"RELEASED MONGODB HANDLE: {self.db.name}")
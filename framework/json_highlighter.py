@@ -1,18 +1,37 @@
 import inspect
 import logging
+import re
 
-from PyQt5.QtCore import QRegularExpression
-from PyQt5.QtGui import QColor, QFont, QSyntaxHighlighter, QTextCharFormat
+from PyQt5.QtCore import QObject, QPoint, QTimer
+from PyQt5.QtGui import QColor, QFont, QTextCharFormat, QTextLayout
 
 from framework.logging_handler import PythagoraZenLogger
+from framework.settings_manager import SettingsManager
 
 
-class JsonSyntaxHighlighter(QSyntaxHighlighter):
-    def __init__(self, parent=None):
-        super().__init__(parent)
+class JsonSyntaxHighlighter(QObject):
+    # One tokenizer pass per line; strings are matched first so their contents never re-match
+    token_pattern = re.compile(
+        r'(?P<string>"(?:[^"\\]|\\.)*")(?P<key>\s*:)?'
+        r"|(?P<number>-?\b\d+(?:\.\d+)?(?:[eE][+-]?\d+)?\b)"
+        r"|(?P<boolean>\b(?:true|false)\b)"
+        r"|(?P<null>\bnull\b)"
+    )
+    timestamp_pattern = re.compile(r'"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z"')
+
+    def __init__(self, text_edit):
+        super().__init__(text_edit)
         self.pythagorazen_logger = PythagoraZenLogger()
         self.pythagorazen_logger.configure_logging()
         logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        json_view_settings = SettingsManager().get_section("json_view")
+        # Blocks above and below the viewport highlighted ahead of scrolling
+        self.margin_blocks = json_view_settings.get("highlight_margin_blocks", 50)
+        # Blocks highlighted per idle tick once the viewport is done
+        self.idle_chunk_blocks = json_view_settings.get(
+            "highlight_idle_chunk_blocks", 500
+        )
+
         # Define the formats for different JSON elements
         self.json_formats = {
             "string": QTextCharFormat(),
@@ -36,43 +55,92 @@ class JsonSyntaxHighlighter(QSyntaxHighlighter):
             QColor(255, 165, 0)
         )  # Orange for timestamps
 
-        # Define the regular expressions for each JSON element
-        self.rules = []
-        self.rules += [
-            (
-                QRegularExpression(r'"[^"\\]*(\\.[^"\\]*)*"'),
-                0,
-                self.json_formats["string"],
-            )
-        ]
-        self.rules += [
-            (QRegularExpression(r"-?\b\d+(\.\d+)?\b"), 0, self.json_formats["number"])
-        ]
-        self.rules += [
-            (QRegularExpression(r"\b(?:true|false)\b"), 0, self.json_formats["boolean"])
-        ]
-        self.rules += [(QRegularExpression(r"\bnull\b"), 0, self.json_formats["null"])]
-        self.rules += [
-            (
-                QRegularExpression(r'"([^"\\]*(\\.[^"\\]*)*)"(\s*:\s*)'),
-                1,
-                self.json_formats["key"],
-            )
-        ]
-        self.rules += [
-            (
-                QRegularExpression(r"\b\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z\b"),
-                0,
-                self.json_formats["timestamp"],
-            )
-        ]
-
-    def highlightBlock(self, text):
+        self.text_edit = text_edit
+        self.document = text_edit.document()
+        self.highlighted_blocks = set()
+        self.next_idle_block = 0
+        self.applying_formats = False
+
+        self.idle_timer = QTimer(self)
+        self.idle_timer.setInterval(0)
+        self.idle_timer.timeout.connect(self.highlight_idle_chunk)
+
+        self.document.contentsChange.connect(self.handle_contents_change)
+        self.text_edit.verticalScrollBar().valueChanged.connect(
+            self.highlight_visible_blocks
+        )
+
+    def get_format_ranges(self, text):
+        format_ranges = []
+        for match in self.token_pattern.finditer(text):
+            kind = match.lastgroup
+            if kind == "key":
+                # A string followed by a colon is an object key
+                start, end = match.span("string")
+            else:
+                start, end = match.span(kind)
+                if kind == "string" and self.timestamp_pattern.fullmatch(
+                    match.group()
+                ):
+                    kind = "timestamp"
+
+            format_range = QTextLayout.FormatRange()
+            format_range.start = start
+            format_range.length = end - start
+            format_range.format = self.json_formats[kind]
+            format_ranges.append(format_range)
+        return format_ranges
+
+    def highlight_block(self, block):
+        block_number = block.blockNumber()
+        if block_number in self.highlighted_blocks:
+            return
+        self.highlighted_blocks.add(block_number)
+        format_ranges = self.get_format_ranges(block.text())
+        if not format_ranges:
+            return
+        # Same mechanism QSyntaxHighlighter uses, without touching the rest of the document
+        self.applying_formats = True
+        block.layout().setFormats(format_ranges)
+        self.document.markContentsDirty(block.position(), block.length())
+        self.applying_formats = False
+
+    def highlight_visible_blocks(self):
+        viewport = self.text_edit.viewport()
+        first_block = self.text_edit.cursorForPosition(QPoint(0, 0)).block()
+        last_block = self.text_edit.cursorForPosition(
+            QPoint(0, viewport.height())
+        ).block()
+
+        first_block_number = max(first_block.blockNumber() - self.margin_blocks, 0)
+        last_block_number = last_block.blockNumber() + self.margin_blocks
+
+        block = self.document.findBlockByNumber(first_block_number)
+        while block.isValid() and block.blockNumber() <= last_block_number:
+            self.highlight_block(block)
+            block = block.next()
+
+    def highlight_idle_chunk(self):
+        # The rest of the document is highlighted a chunk per event loop pass
+        block = self.document.findBlockByNumber(self.next_idle_block)
+        highlighted = 0
+        while block.isValid() and highlighted < self.idle_chunk_blocks:
+            self.highlight_block(block)
+            highlighted += 1
+            block = block.next()
+
+        if block.isValid():
+            self.next_idle_block = block.blockNumber()
+        else:
+            self.idle_timer.stop()
+
+    def handle_contents_change(self, position, chars_removed, chars_added):
         logging.debug(f"{inspect.currentframe().f_code.co_name}")
-        for expression, nth, format in self.rules:
-            match_iterator = expression.globalMatch(text)
-            while match_iterator.hasNext():
-                match = match_iterator.next()
-                self.setFormat(
-                    match.capturedStart(nth), match.capturedLength(nth), format
-                )
+        if self.applying_formats:
+            return
+        # Block numbers may have shifted, start over from the viewport
+        self.highlighted_blocks = set()
+        self.next_idle_block = 0
+        # Wait for the new text to be laid out before looking at the viewport
+        QTimer.singleShot(0, self.highlight_visible_blocks)
+        self.idle_timer.start()
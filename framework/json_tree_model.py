@@ -0,0 +1,182 @@
+import inspect
+import json
+import logging
+
+from PyQt5.QtCore import QAbstractItemModel, QModelIndex, Qt
+
+from framework.logging_handler import PythagoraZenLogger
+from framework.settings_manager import SettingsManager
+
+
+class JsonTreeNode:
+    # Children are created the first time the view asks for them
+    def __init__(self, parent, row, key, value):
+        self.parent = parent
+        self.row = row
+        self.key = key
+        self.value = value
+        self.children = None
+
+    def is_container(self):
+        return isinstance(self.value, (dict, list)) and len(self.value) > 0
+
+    def child_count(self):
+        if not self.is_container():
+            return 0
+        return len(self.value)
+
+    def load_children(self):
+        if self.children is None:
+            items = (
+                self.value.items()
+                if isinstance(self.value, dict)
+                else enumerate(self.value)
+                if isinstance(self.value, list)
+                else ()
+            )
+            self.children = [
+                JsonTreeNode(self, row, key, value)
+                for row, (key, value) in enumerate(items)
+            ]
+        return self.children
+
+    def get_path(self):
+        keys = []
+        node = self
+        while node.parent is not None:
+            keys.append(str(node.key))
+            node = node.parent
+        return ".".join(reversed(keys))
+
+
+class JsonTreeModel(QAbstractItemModel):
+    # Documents are pulled from the result in blocks, nested values expand on demand
+    headers = ["Key", "Value", "Type"]
+
+    def __init__(self, documents=None, table_model=None, parent=None):
+        super().__init__(parent)
+        self.pythagorazen_logger = PythagoraZenLogger()
+        self.pythagorazen_logger.configure_logging()
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        json_view_settings = SettingsManager().get_section("json_view")
+        self.fetch_block_size = json_view_settings.get("fetch_block_size", 200)
+        self.preview_length = json_view_settings.get("preview_length", 200)
+        # A cursor-backed table model shares its documents instead of a list copy
+        self.table_model = table_model
+        if table_model is not None:
+            documents = table_model.documents
+        if isinstance(documents, dict):
+            documents = [documents]
+        self.documents = documents if documents is not None else []
+        self.root = JsonTreeNode(None, 0, None, self.documents)
+        self.root.children = []
+
+    def get_node(self, index):
+        if index.isValid():
+            return index.internalPointer()
+        return self.root
+
+    def index(self, row, column, parent=QModelIndex()):
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        children = self.get_node(parent).load_children()
+        if row >= len(children):
+            return QModelIndex()
+        return self.createIndex(row, column, children[row])
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        parent_node = index.internalPointer().parent
+        if parent_node is None or parent_node is self.root:
+            return QModelIndex()
+        return self.createIndex(parent_node.row, 0, parent_node)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        node = self.get_node(parent)
+        if node is self.root:
+            return len(self.root.children)
+        return node.child_count()
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.headers)
+
+    def hasChildren(self, parent=QModelIndex()):
+        node = self.get_node(parent)
+        if node is self.root:
+            return bool(self.root.children) or self.canFetchMore(parent)
+        return node.is_container()
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        if len(self.root.children) < len(self.documents):
+            return True
+        return self.table_model is not None and self.table_model.canFetchMore()
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        if len(self.root.children) >= len(self.documents) and self.table_model:
+            # Pull the next block through the table's cursor
+            self.table_model.fetchMore()
+
+        first_row = len(self.root.children)
+        last_row = min(first_row + self.fetch_block_size, len(self.documents)) - 1
+        if last_row < first_row:
+            return
+        self.beginInsertRows(QModelIndex(), first_row, last_row)
+        self.root.children.extend(
+            JsonTreeNode(self.root, row, row, self.documents[row])
+            for row in range(first_row, last_row + 1)
+        )
+        self.endInsertRows()
+
+    def get_preview(self, value):
+        if isinstance(value, dict):
+            return f"{{{len(value)} keys}}"
+        if isinstance(value, list):
+            return f"[{len(value)} items]"
+        if value is None:
+            return "null"
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        preview = str(value)
+        if len(preview) > self.preview_length:
+            return f"{preview[: self.preview_length]}..."
+        return preview
+
+    def get_type_name(self, value):
+        if value is None:
+            return "null"
+        if isinstance(value, dict):
+            return "object"
+        if isinstance(value, list):
+            return "array"
+        return type(value).__name__
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        if role == Qt.DisplayRole:
+            if index.column() == 0:
+                return str(node.key)
+            if index.column() == 1:
+                return self.get_preview(node.value)
+            return self.get_type_name(node.value)
+        if role == Qt.ToolTipRole:
+            return node.get_path()
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.headers[section]
+        return None
+
+    def get_node_json(self, index):
+        # Only the selected node is serialized, never the whole result
+        node = self.get_node(index)
+        return json.dumps(node.value, default=str, indent=4)
@@ -0,0 +1,98 @@
+import inspect
+import logging
+import threading
+
+from framework.instance_database_operations_api_endpoint_config import (
+    ZendeskInstanceDatabaseOperationsMongoDB,
+)
+from framework.logging_handler import PythagoraZenLogger
+from framework.schema_catalog import MongoDBSchemaCatalog
+from framework.settings_manager import SettingsManager
+
+
+class MongoDBKeyDiscovery:
+    # {(zendesk_subdomain, collection_name, sample_size): {key: count}}, kept until
+    # the next sync; sampled and exact counts never stand in for each other
+    _key_counts_cache = {}
+    _cache_lock = threading.Lock()
+
+    @classmethod
+    def invalidate(cls, zendesk_subdomain, collection_names=None):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        with cls._cache_lock:
+            for cache_key in list(cls._key_counts_cache):
+                subdomain, collection_name, _ = cache_key
+                if subdomain != zendesk_subdomain:
+                    continue
+                if collection_names is None or collection_name in collection_names:
+                    del cls._key_counts_cache[cache_key]
+
+    def __init__(self, zendesk_subdomain):
+        self.pythagorazen_logger = PythagoraZenLogger()
+        self.pythagorazen_logger.configure_logging()
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        key_discovery_settings = SettingsManager().get_section("key_discovery")
+        self.zendesk_subdomain = zendesk_subdomain
+        # 0 scans the whole collection, anything else is a $sample size
+        self.sample_size = key_discovery_settings.get("sample_size", 0)
+        self.instance_operations = ZendeskInstanceDatabaseOperationsMongoDB(
+            zendesk_subdomain, ""
+        )
+
+    def build_key_counts_pipeline(self, sample_size=None):
+        pipeline = []
+        if sample_size:
+            pipeline.append({"$sample": {"size": sample_size}})
+        pipeline.extend(
+            [
+                {"$project": {"keys": {"$objectToArray": "$$ROOT"}}},
+                {"$unwind": "$keys"},
+                {"$group": {"_id": "$keys.k", "count": {"$sum": 1}}},
+                {"$match": {"_id": {"$ne": "_id"}}},
+            ]
+        )
+        return pipeline
+
+    def get_key_counts(self, collection_name, sample_size=None, refresh=False):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        if sample_size is None:
+            sample_size = self.sample_size
+        cache_key = (self.zendesk_subdomain, collection_name, sample_size or 0)
+
+        if not refresh:
+            with self._cache_lock:
+                key_counts = self._key_counts_cache.get(cache_key)
+            if key_counts is not None:
+                logging.info(f"KEY COUNTS FROM CACHE: {collection_name}")
+                return dict(key_counts)
+
+        # The schema catalog maintained by the sync is cheaper than any aggregation
+        key_counts = None
+        if not refresh and not sample_size:
+            key_counts = MongoDBSchemaCatalog(self.zendesk_subdomain).get_key_counts(
+                collection_name
+            )
+        if key_counts is not None:
+            logging.info(f"KEY COUNTS FROM SCHEMA CATALOG: {collection_name}")
+            with self._cache_lock:
+                self._key_counts_cache[cache_key] = key_counts
+            return dict(key_counts)
+
+        collection = self.instance_operations.db[collection_name]
+        key_counts = {
+            key_count["_id"]: key_count["count"]
+            for key_count in collection.aggregate(
+                self.build_key_counts_pipeline(sample_size), allowDiskUse=True
+            )
+        }
+        logging.info(
+            f"KEYS DISCOVERED: {collection_name} ({len(key_counts)} keys, sample_size={sample_size or 'all'})"
+        )
+
+        with self._cache_lock:
+            self._key_counts_cache[cache_key] = key_counts
+        return dict(key_counts)
+
+    def get_keys(self, collection_name, sample_size=None, refresh=False):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        return set(self.get_key_counts(collection_name, sample_size, refresh))
@@ -7,16 +7,18 @@ from framework.logging_handler import PythagoraZenLogger
 
 
 class KeySelectionDialog(QDialog):
-    def __init__(self, keys, subdomain, selected_collection):
+    def __init__(
+        self, keys, subdomain, selected_collection, key_counts=None, key_descriptions=None
+    ):
         super().__init__()
         self.pythagorazen_logger = PythagoraZenLogger()
         self.pythagorazen_logger.configure_logging()
         logging.debug(f"{inspect.currentframe().f_code.co_name}")
         self.setWindowTitle(f"{subdomain} - {selected_collection}")
         self.selected_keys = set()
-        self.init_ui(keys)
+        self.init_ui(keys, key_counts or {}, key_descriptions or {})
 
-    def init_ui(self, keys):
+    def init_ui(self, keys, key_counts, key_descriptions):
         logging.debug(f"{inspect.currentframe().f_code.co_name}")
         layout = QVBoxLayout()
         self.setGeometry(100, 100, 400, 200)
@@ -24,6 +26,10 @@ class KeySelectionDialog(QDialog):
 
         for key in sorted(keys):
             checkbox = QCheckBox(key)
+            if key in key_descriptions:
+                checkbox.setToolTip(key_descriptions[key])
+            elif key in key_counts:
+                checkbox.setToolTip(f"{key_counts[key]} documents")
             checkboxes.append(checkbox)
 
         num_columns = 5
@@ -0,0 +1,51 @@
+import inspect
+import logging
+import threading
+
+from pymongo import MongoClient
+
+from framework.logging_handler import PythagoraZenLogger
+from framework.settings_manager import SettingsManager
+
+pythagorazen_logger = PythagoraZenLogger()
+pythagorazen_logger.configure_logging()
+
+
+class MongoDBClientManager:
+    # One MongoClient (and therefore one connection pool) per URI for the whole process
+    _clients = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_client(cls, uri=None):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        mongodb_settings = SettingsManager().get_section("mongodb")
+        uri = uri or mongodb_settings.get("uri", "mongodb://localhost:27017/")
+
+        with cls._lock:
+            client = cls._clients.get(uri)
+            if client is None:
+                client = MongoClient(
+                    uri,
+                    maxPoolSize=mongodb_settings.get("max_pool_size", 50),
+                    minPoolSize=mongodb_settings.get("min_pool_size", 0),
+                    maxIdleTimeMS=mongodb_settings.get("max_idle_time_ms", 300000),
+                    serverSelectionTimeoutMS=mongodb_settings.get(
+                        "server_selection_timeout_ms", 10000
+                    ),
+                    connectTimeoutMS=mongodb_settings.get("connect_timeout_ms", 10000),
+                    socketTimeoutMS=mongodb_settings.get("socket_timeout_ms", 300000),
+                )
+                cls._clients[uri] = client
+                logging.info(f"MONGODB CLIENT CREATED: {uri}")
+            return client
+
+    @classmethod
+    def close_all_clients(cls):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        with cls._lock:
+            clients = list(cls._clients.items())
+            cls._clients.clear()
+        for uri, client in clients:
+            client.close()
+            logging.info(f"MONGODB CLIENT CLOSED: {uri}")
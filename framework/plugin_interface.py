@@ -1,6 +1,8 @@
 import inspect
 import os
 
+from framework.plugin_worker import PluginWorkerPool
+
 
 class PluginInterface:
     """
@@ -17,6 +19,10 @@ class PluginInterface:
     def supports_pagination(self):
         return False  # By default, plugins do not support pagination
 
+    def submit_work(self, fn, *args, **kwargs):
+        # Run fn(worker, *args) off the GUI thread; on_* keyword slots get its signals
+        return PluginWorkerPool.submit(fn, *args, **kwargs)
+
     def filename(self):
         # Get the filename of the calling file, excluding plugin_interface.py
         calling_frame = inspect.stack()[1]
@@ -3,12 +3,16 @@ import inspect
 
 from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtWidgets import (
+    QComboBox,
+    QHBoxLayout,
     QLabel,
+    QLineEdit,
     QMainWindow,
     QPushButton,
     QSplitter,
-    QTableWidget,
+    QTableView,
     QTextBrowser,
+    QTreeView,
     QVBoxLayout,
     QWidget,
 )
@@ -17,8 +21,12 @@ from framework.logging_handler import PythagoraZenLogger
 
 from framework.collection_selection_json_loader import CollectionSelectionJSONLoader
 from framework.export_manager import ExportManager
+from framework.instance_database_operations_api_endpoint_config import (
+    ZendeskInstanceDatabaseOperationsMongoDB,
+)
 from framework.json_highlighter import JsonSyntaxHighlighter
 from framework.skeleton_tree_view_and_selection import SkeletonTreeViewAndSelection
+from framework.table_models import MongoCursorTableModel
 from framework.window_views import ViewManager
 
 
@@ -69,14 +77,36 @@ class PluginWindow(QMainWindow):
         self.label = QLabel(self.plugin_name)
         layout.addWidget(self.label)
 
+        # Filter pushed down to MongoDB, only shown for cursor-backed tables
+        self.filter_bar = QWidget()
+        filter_layout = QHBoxLayout()
+        filter_layout.setContentsMargins(0, 0, 0, 0)
+        self.filter_bar.setLayout(filter_layout)
+        self.filter_column_combo_box = QComboBox()
+        self.filter_line_edit = QLineEdit()
+        self.filter_line_edit.setPlaceholderText("Filter (starts with), press Enter")
+        self.filter_line_edit.returnPressed.connect(self.apply_filter)
+        filter_layout.addWidget(self.filter_column_combo_box)
+        filter_layout.addWidget(self.filter_line_edit)
+        self.filter_bar.hide()
+        layout.addWidget(self.filter_bar)
+
         splitter = QSplitter(self)
         layout.addWidget(splitter)
 
-        self.table = QTableWidget(self)
+        self.table = QTableView(self)
         splitter.addWidget(self.table)
 
-        self.json_browser = QTextBrowser(self)
-        splitter.addWidget(self.json_browser)
+        # API response view: lazy JSON tree with the selected node's JSON below it
+        self.json_view = QSplitter(Qt.Vertical, self)
+        self.json_tree = QTreeView(self.json_view)
+        self.json_tree.setUniformRowHeights(True)
+        self.json_browser = QTextBrowser(self.json_view)
+        self.json_view.addWidget(self.json_tree)
+        self.json_view.addWidget(self.json_browser)
+        self.json_view.setStretchFactor(0, 3)
+        self.json_view.setStretchFactor(1, 1)
+        splitter.addWidget(self.json_view)
 
         self.table_button = QPushButton("Table View")
         self.api_response_button = QPushButton("API Response View")
@@ -86,7 +116,7 @@ class PluginWindow(QMainWindow):
 
         self.api_response_button.hide()  # Initially hide the button
 
-        self.json_highlighter = JsonSyntaxHighlighter(self.json_browser.document())
+        self.json_highlighter = JsonSyntaxHighlighter(self.json_browser)
         self.update_content_signal.connect(self.update_content)
 
         self.current_view = self.table
@@ -165,6 +195,50 @@ class PluginWindow(QMainWindow):
         self.skeleton_data = skeleton_data
         self.skeleton_window_title = selected_collection
 
+    def show_error(self, error_message):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        logging.error([f"error: {error_message}"])
+        self.label.setText(f"Error: {error_message}")
+        self.label.setWordWrap(True)
+
+    def display_collection(
+        self, zendesk_subdomain, selected_collection, projection, columns
+    ):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        self.label.setText(
+            f"Zendesk Instance (database): {zendesk_subdomain}\nCollection: {selected_collection}"
+        )
+        self.label.setWordWrap(True)
+        self.api_response_button.setVisible(True)
+        self.table_button.setVisible(True)
+
+        instance_operations = ZendeskInstanceDatabaseOperationsMongoDB(
+            zendesk_subdomain, selected_collection
+        )
+        table_model = MongoCursorTableModel(
+            instance_operations, projection=projection, columns=columns
+        )
+        self.view_manager.display_cursor_in_table(table_model)
+
+        self.skeleton_data = {}
+        self.skeleton_window_title = selected_collection
+
+    def set_filter_bar_visible(self, visible):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        self.filter_bar.setVisible(visible)
+
+    def set_filter_columns(self, columns):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        self.filter_column_combo_box.clear()
+        self.filter_column_combo_box.addItems(columns)
+        self.filter_line_edit.clear()
+
+    def apply_filter(self):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        self.view_manager.apply_filter(
+            self.filter_column_combo_box.currentText(), self.filter_line_edit.text()
+        )
+
     def show_skeleton_view(self):
         logging.debug(f"{inspect.currentframe().f_code.co_name}")
         logging.debug(f"self.skeleton_data:\n{self.skeleton_data}")
@@ -182,7 +256,7 @@ class PluginWindow(QMainWindow):
                 # If the window is already created, update its content with new data
                 # data = self.selected_collection.find()  # Fetch the new data
                 result_skeleton = self.plugin_instance.create_skeleton(
-                    self.skeleton_data
+                    self.skeleton_window_title
                 )
                 self.skeleton_window.update_content(
                     result_skeleton, self.skeleton_window_title
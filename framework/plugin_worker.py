@@ -0,0 +1,114 @@
+import inspect
+import logging
+import threading
+import traceback
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from framework.logging_handler import PythagoraZenLogger
+
+pythagorazen_logger = PythagoraZenLogger()
+pythagorazen_logger.configure_logging()
+
+
+class PluginWorkerSignals(QObject):
+    # Emitted from the worker thread, delivered on the GUI thread
+    progress = pyqtSignal(int, int, str)
+    partial_result = pyqtSignal(object)
+    result = pyqtSignal(object)
+    error = pyqtSignal(str)
+    canceled = pyqtSignal()
+    finished = pyqtSignal()
+
+
+class PluginWorker(QRunnable):
+    # Runs fn(worker, *args, **kwargs) on the global QThreadPool
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = PluginWorkerSignals()
+        self.cancel_event = threading.Event()
+        # The Python side owns the runnable so its signals outlive run()
+        self.setAutoDelete(False)
+
+    def cancel(self):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        self.cancel_event.set()
+
+    def is_canceled(self):
+        return self.cancel_event.is_set()
+
+    def report_progress(self, completed, total, message=""):
+        self.signals.progress.emit(int(completed or 0), int(total or 0), message)
+
+    def report_partial_result(self, partial_result):
+        self.signals.partial_result.emit(partial_result)
+
+    def run(self):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        try:
+            result = self.fn(self, *self.args, **self.kwargs)
+        except Exception as e:
+            error_message = str(e)
+            logging.error([f"error: {error_message}"])
+            logging.error(f"Traceback:\n{traceback.format_exc()}")
+            self.signals.error.emit(error_message)
+        else:
+            if self.is_canceled():
+                self.signals.canceled.emit()
+            self.signals.result.emit(result)
+        finally:
+            self.signals.finished.emit()
+
+
+class PluginWorkerPool:
+    # Keeps submitted workers alive until they finish
+    _active_workers = set()
+    _registry_lock = threading.Lock()
+
+    @classmethod
+    def submit(
+        cls,
+        fn,
+        *args,
+        on_result=None,
+        on_progress=None,
+        on_partial_result=None,
+        on_error=None,
+        on_canceled=None,
+        on_finished=None,
+        **kwargs,
+    ):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        worker = PluginWorker(fn, *args, **kwargs)
+        for signal, slot in (
+            (worker.signals.result, on_result),
+            (worker.signals.progress, on_progress),
+            (worker.signals.partial_result, on_partial_result),
+            (worker.signals.error, on_error),
+            (worker.signals.canceled, on_canceled),
+            (worker.signals.finished, on_finished),
+        ):
+            if slot:
+                signal.connect(slot)
+        worker.signals.finished.connect(lambda: cls.release(worker))
+
+        with cls._registry_lock:
+            cls._active_workers.add(worker)
+        QThreadPool.globalInstance().start(worker)
+        return worker
+
+    @classmethod
+    def release(cls, worker):
+        with cls._registry_lock:
+            cls._active_workers.discard(worker)
+
+    @classmethod
+    def cancel_all(cls):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        with cls._registry_lock:
+            workers = list(cls._active_workers)
+        for worker in workers:
+            worker.cancel()
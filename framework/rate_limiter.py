@@ -0,0 +1,188 @@
+import inspect
+import json
+import logging
+import threading
+import time
+
+from framework.logging_handler import PythagoraZenLogger
+from framework.settings_manager import SettingsManager
+
+pythagorazen_logger = PythagoraZenLogger()
+pythagorazen_logger.configure_logging()
+
+
+class ZendeskRateLimiter:
+    # One token bucket per Zendesk subdomain, shared by every paginator, plus one
+    # for incremental exports, which Zendesk caps separately at 10 requests a minute
+    _rate_limiters = {}
+    _registry_lock = threading.Lock()
+
+    @classmethod
+    def get_rate_limiter(cls, zendesk_subdomain, incremental_exports=False):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        # A 429 on an incremental export must not block the rest of the subdomain
+        limiter_key = (
+            f"{zendesk_subdomain}:incremental"
+            if incremental_exports
+            else zendesk_subdomain
+        )
+        with cls._registry_lock:
+            rate_limiter = cls._rate_limiters.get(limiter_key)
+            if rate_limiter is None:
+                rate_limiter = cls(zendesk_subdomain, incremental_exports)
+                cls._rate_limiters[limiter_key] = rate_limiter
+            return rate_limiter
+
+    def __init__(self, zendesk_subdomain, incremental_exports=False):
+        self.pythagorazen_logger = PythagoraZenLogger()
+        self.pythagorazen_logger.configure_logging()
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        rate_limiter_settings = SettingsManager().get_section("rate_limiter")
+
+        self.zendesk_subdomain = zendesk_subdomain
+        self.incremental_exports = incremental_exports
+        self.limiter_name = (
+            f"{zendesk_subdomain} incremental exports"
+            if incremental_exports
+            else zendesk_subdomain
+        )
+        # Fraction of the learned limit we allow ourselves to use
+        self.headroom = rate_limiter_settings.get("headroom", 0.9)
+        if incremental_exports:
+            # Fixed limit; the rate limit headers describe the account, not exports
+            self.requests_per_minute = rate_limiter_settings.get(
+                "incremental_requests_per_minute", 10
+            )
+            self.burst = rate_limiter_settings.get("incremental_burst", 1)
+        else:
+            # Starting point until the account limit is learned from response headers
+            self.requests_per_minute = rate_limiter_settings.get(
+                "default_requests_per_minute", 200
+            )
+            self.burst = rate_limiter_settings.get("burst", 10)
+        self.default_retry_after = rate_limiter_settings.get(
+            "default_retry_after", 60
+        )
+        self.max_retries = rate_limiter_settings.get("max_retries", 5)
+
+        self.tokens = self.burst
+        self.last_refill = time.monotonic()
+        self.blocked_until = 0
+        self.endpoint_budget = {}
+        self.lock = threading.Lock()
+
+    def refill_rate(self):
+        # Tokens per second
+        return max(self.requests_per_minute * self.headroom, 1) / 60
+
+    def refill(self, now):
+        elapsed = now - self.last_refill
+        self.tokens = min(self.burst, self.tokens + elapsed * self.refill_rate())
+        self.last_refill = now
+
+    def get_endpoint_budget(self, endpoint):
+        if endpoint not in self.endpoint_budget:
+            self.endpoint_budget[endpoint] = {
+                "requests": 0,
+                "throttled": 0,
+                "wait_seconds": 0.0,
+            }
+        return self.endpoint_budget[endpoint]
+
+    def reserve(self, endpoint):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        # Take a token and return how long the caller must wait before using it
+        with self.lock:
+            now = time.monotonic()
+            self.refill(now)
+            self.tokens -= 1
+
+            delay = 0.0
+            if self.tokens < 0:
+                delay = -self.tokens / self.refill_rate()
+            delay = max(delay, self.blocked_until - now)
+
+            endpoint_budget = self.get_endpoint_budget(endpoint)
+            endpoint_budget["requests"] += 1
+            endpoint_budget["wait_seconds"] += delay
+            return delay
+
+    def acquire(self, endpoint):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        delay = self.reserve(endpoint)
+        if delay > 0:
+            logging.debug(f"RATE LIMITER WAIT: {delay:.2f}s ({endpoint})")
+            time.sleep(delay)
+
+    def get_header_value(self, headers, *header_names):
+        for header_name in header_names:
+            value = headers.get(header_name)
+            if value is not None:
+                try:
+                    return float(value)
+                except (TypeError, ValueError):
+                    logging.warning(f"Unexpected {header_name} header: {value}")
+        return None
+
+    def update_from_response(self, headers, status_code, endpoint):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        limit = self.get_header_value(headers, "X-Rate-Limit", "ratelimit-limit")
+        remaining = self.get_header_value(
+            headers, "X-Rate-Limit-Remaining", "ratelimit-remaining"
+        )
+        reset = self.get_header_value(headers, "ratelimit-reset")
+
+        if self.incremental_exports:
+            limit = remaining = None
+
+        with self.lock:
+            now = time.monotonic()
+
+            if limit and limit != self.requests_per_minute:
+                logging.info(
+                    f"RATE LIMIT LEARNED ({self.zendesk_subdomain}): {int(limit)} requests per minute"
+                )
+                self.requests_per_minute = limit
+
+            # Stop spending once we are inside the reserved headroom
+            if remaining is not None:
+                reserved = self.requests_per_minute * (1 - self.headroom)
+                if remaining <= reserved:
+                    self.tokens = min(self.tokens, 0)
+                    if reset:
+                        self.blocked_until = max(self.blocked_until, now + reset)
+
+            if status_code == 429:
+                retry_after = self.get_header_value(headers, "Retry-After")
+                if retry_after is None:
+                    retry_after = self.default_retry_after
+                logging.warning(
+                    f"RATE LIMITED ({self.limiter_name}): retrying {endpoint} in {retry_after}s"
+                )
+                self.tokens = min(self.tokens, 0)
+                self.blocked_until = max(self.blocked_until, now + retry_after)
+                self.get_endpoint_budget(endpoint)["throttled"] += 1
+
+    def get_budget_report(self):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        with self.lock:
+            return {
+                endpoint: dict(endpoint_budget)
+                for endpoint, endpoint_budget in self.endpoint_budget.items()
+            }
+
+    def reset_budget_report(self):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        with self.lock:
+            self.endpoint_budget = {}
+
+    def log_budget_report(self):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        budget_report = self.get_budget_report()
+        total_requests = sum(
+            endpoint_budget["requests"] for endpoint_budget in budget_report.values()
+        )
+        logging.info(
+            f"API BUDGET USED ({self.limiter_name}): {total_requests} requests at {int(self.requests_per_minute)} requests per minute"
+        )
+        logging.info(f"API BUDGET PER ENDPOINT:\n{json.dumps(budget_report, indent=4)}")
@@ -0,0 +1,237 @@
+import inspect
+import logging
+from datetime import datetime, timezone
+
+from framework.instance_database_operations_api_endpoint_config import (
+    ZendeskInstanceDatabaseOperationsMongoDB,
+)
+from framework.logging_handler import PythagoraZenLogger
+
+
+class SchemaProfile:
+    # Field statistics for a set of documents; a weight of -1 takes documents back
+    # out, so a sync can carry the change it wrote against the stored entry
+    empty_values = ["", [], {}]
+
+    def __init__(self):
+        self.documents = 0
+        # {path: {"count", "types", "null_count", "empty_count", "example"}}
+        self.fields = {}
+
+    def get_type_name(self, value):
+        if value is None:
+            return "null"
+        if isinstance(value, bool):
+            return "bool"
+        if isinstance(value, (int, float)):
+            return "number"
+        if isinstance(value, str):
+            return "string"
+        if isinstance(value, list):
+            return "array"
+        if isinstance(value, dict):
+            return "object"
+        return type(value).__name__
+
+    def get_example_value(self, value):
+        # Lists of objects are kept to their first item, like the skeleton view
+        if isinstance(value, list) and value:
+            return value[:1]
+        return value
+
+    def observe_value(self, path, value, weight=1):
+        field = self.fields.get(path)
+        if field is None:
+            field = {
+                "count": 0,
+                "types": {},
+                "null_count": 0,
+                "empty_count": 0,
+                "example": None,
+            }
+            self.fields[path] = field
+
+        type_name = self.get_type_name(value)
+        field["count"] += weight
+        field["types"][type_name] = field["types"].get(type_name, 0) + weight
+        if value is None:
+            field["null_count"] += weight
+        elif value in self.empty_values:
+            field["empty_count"] += weight
+        elif field["example"] is None and weight > 0:
+            field["example"] = self.get_example_value(value)
+
+        if isinstance(value, dict):
+            self.observe_document(value, f"{path}.", weight)
+        elif isinstance(value, list) and value and isinstance(value[0], dict):
+            self.observe_document(value[0], f"{path}.", weight)
+
+    def observe_document(self, document, prefix="", weight=1):
+        for key, value in document.items():
+            if not prefix and key == "_id":
+                continue
+            self.observe_value(f"{prefix}{key}", value, weight)
+
+    def observe_page(self, page, weight=1):
+        for document in page:
+            self.documents += weight
+            self.observe_document(document, weight=weight)
+
+    def forget_page(self, page):
+        # Documents about to be replaced by an upsert
+        self.observe_page(page, weight=-1)
+
+
+class MongoDBSchemaCatalog:
+    catalog_collection_name = "pythagorazen_schema_catalog"
+
+    def __init__(self, zendesk_subdomain):
+        self.pythagorazen_logger = PythagoraZenLogger()
+        self.pythagorazen_logger.configure_logging()
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        self.zendesk_subdomain = zendesk_subdomain
+        # One catalog document per collection in the instance database
+        self.instance_operations = ZendeskInstanceDatabaseOperationsMongoDB(
+            zendesk_subdomain, self.catalog_collection_name
+        )
+
+    def get_catalog(self, collection_name):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        return self.instance_operations.query_collection_find_one(
+            {"collection": collection_name}, {"_id": 0}
+        )
+
+    def merge_fields(self, catalog_fields, profile_fields):
+        fields = {field["path"]: field for field in catalog_fields}
+        for path, profile_field in profile_fields.items():
+            field = fields.get(path)
+            if field is None:
+                fields[path] = dict(profile_field, path=path)
+                continue
+            field["count"] += profile_field["count"]
+            field["null_count"] += profile_field["null_count"]
+            field["empty_count"] += profile_field["empty_count"]
+            for type_name, type_count in profile_field["types"].items():
+                field["types"][type_name] = field["types"].get(type_name, 0) + type_count
+            if field["example"] is None:
+                field["example"] = profile_field["example"]
+
+        # Fields and types whose last documents were replaced drop out
+        for field in fields.values():
+            field["types"] = {
+                type_name: type_count
+                for type_name, type_count in field["types"].items()
+                if type_count > 0
+            }
+        return [fields[path] for path in sorted(fields) if fields[path]["count"] > 0]
+
+    def build_profile(self, collection_name):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        # One pass over what the collection holds now, only for a first entry
+        instance_operations = ZendeskInstanceDatabaseOperationsMongoDB(
+            self.zendesk_subdomain, collection_name
+        )
+        profile = SchemaProfile()
+        try:
+            for chunk in instance_operations.query_collection_chunks({}, {"_id": 0}):
+                profile.observe_page(chunk)
+        finally:
+            instance_operations.close_connection()
+        return profile
+
+    def save_profile(self, collection_name, profile, replace=False):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        # Replacing profiles hold the whole collection, merging profiles hold a change
+        catalog = None if replace else self.get_catalog(collection_name)
+        if catalog:
+            # Counted by the server, upserts that replaced documents cannot drift it
+            documents = self.instance_operations.db[
+                collection_name
+            ].estimated_document_count()
+            fields = self.merge_fields(catalog["fields"], profile.fields)
+        else:
+            documents = profile.documents
+            fields = self.merge_fields([], profile.fields)
+
+        if not documents:
+            self.clear_catalog(collection_name)
+            return
+
+        self.instance_operations.collection.replace_one(
+            {"collection": collection_name},
+            {
+                "collection": collection_name,
+                "documents": documents,
+                "fields": fields,
+                "updated_at": datetime.now(timezone.utc),
+            },
+            upsert=True,
+        )
+        logging.info(
+            f"SCHEMA CATALOG UPDATED: {collection_name} ({documents} documents, {len(fields)} fields, replace={replace})"
+        )
+
+    def refresh_profile(self, collection_name, profile=None):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        # The change recorded by the writes of a sync is merged into an existing
+        # entry; a collection without an entry yet is profiled once in full
+        if profile is not None and self.get_catalog(collection_name):
+            self.save_profile(collection_name, profile)
+        else:
+            self.save_profile(
+                collection_name, self.build_profile(collection_name), replace=True
+            )
+
+    def clear_catalog(self, collection_name):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        self.instance_operations.collection.delete_one({"collection": collection_name})
+
+    def get_key_counts(self, collection_name):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        # Top-level keys only, None when the collection has not been cataloged
+        catalog = self.get_catalog(collection_name)
+        if not catalog:
+            return None
+        return {
+            field["path"]: field["count"]
+            for field in catalog["fields"]
+            if "." not in field["path"]
+        }
+
+    def get_skeleton(self, collection_name):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        catalog = self.get_catalog(collection_name)
+        if not catalog:
+            return None
+        skeleton = {}
+        for field in catalog["fields"]:
+            if "." in field["path"]:
+                continue
+            example = field["example"]
+            # Same shape as the skeleton inference: lists of objects become their first object
+            if isinstance(example, list) and example and isinstance(example[0], dict):
+                example = example[0]
+            skeleton[field["path"]] = example
+        return skeleton
+
+    def get_field_summaries(self, collection_name):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        # {path: tooltip text} for the key selection and skeleton views
+        catalog = self.get_catalog(collection_name)
+        if not catalog:
+            return {}
+        documents = catalog["documents"] or 1
+        field_summaries = {}
+        for field in catalog["fields"]:
+            count = field["count"] or 1
+            types = ", ".join(sorted(field["types"]))
+            field_summaries[field["path"]] = (
+                f"{field['count']} of {catalog['documents']} documents ({field['count'] / documents:.0%})\n"
+                f"Types: {types}\n"
+                f"Null: {field['null_count'] / count:.0%}, Empty: {field['empty_count'] / count:.0%}"
+            )
+        return field_summaries
+
+    def close_connection(self):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        self.instance_operations.close_connection()
@@ -0,0 +1,120 @@
+import inspect
+import logging
+
+from framework.instance_database_operations_api_endpoint_config import (
+    ZendeskInstanceDatabaseOperationsMongoDB,
+)
+from framework.key_discovery import MongoDBKeyDiscovery
+from framework.logging_handler import PythagoraZenLogger
+from framework.settings_manager import SettingsManager
+
+
+class MongoDBSchemaInference:
+    # Values that do not make a useful example in the skeleton
+    empty_values = [None, "", [], {}]
+
+    def __init__(self, zendesk_subdomain):
+        self.pythagorazen_logger = PythagoraZenLogger()
+        self.pythagorazen_logger.configure_logging()
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        schema_inference_settings = SettingsManager().get_section("schema_inference")
+        self.zendesk_subdomain = zendesk_subdomain
+        # 0 walks the whole collection, anything else is a $sample size
+        self.sample_size = schema_inference_settings.get("sample_size", 0)
+        self.instance_operations = ZendeskInstanceDatabaseOperationsMongoDB(
+            zendesk_subdomain, ""
+        )
+        self.key_discovery = MongoDBKeyDiscovery(zendesk_subdomain)
+
+    def is_empty(self, value):
+        return value in self.empty_values
+
+    def extract_first_items(self, d):
+        # Keep only the first item of every nested list
+        new_dict = {}
+        for key, value in d.items():
+            if isinstance(value, list) and value:
+                new_dict[key] = [value[0]]
+            elif isinstance(value, dict):
+                new_dict[key] = self.extract_first_items(value)
+            else:
+                new_dict[key] = value
+        return new_dict
+
+    def get_example_value(self, value):
+        if isinstance(value, list) and value and isinstance(value[0], dict):
+            return self.extract_first_items(value[0])
+        return value
+
+    def iter_documents(self, collection, sample_size):
+        if sample_size:
+            return collection.aggregate(
+                [{"$sample": {"size": sample_size}}], allowDiskUse=True
+            )
+        return collection.find(
+            {}, {"_id": 0}, batch_size=self.instance_operations.query_batch_size
+        )
+
+    def find_populated_values(self, collection, keys):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        # One aggregation with a $facet per key instead of a find_one per key
+        if not keys:
+            return {}
+
+        # Facet names cannot contain dots or start with $, so index them
+        facets = {
+            f"key_{index}": [
+                {"$match": {key: {"$exists": True, "$nin": self.empty_values}}},
+                {"$limit": 1},
+                {"$project": {"_id": 0, "value": f"${key}"}},
+            ]
+            for index, key in enumerate(keys)
+        }
+        facet_results = next(collection.aggregate([{"$facet": facets}]), {})
+
+        populated_values = {}
+        for index, key in enumerate(keys):
+            facet_result = facet_results.get(f"key_{index}")
+            if facet_result and "value" in facet_result[0]:
+                populated_values[key] = facet_result[0]["value"]
+        return populated_values
+
+    def infer_skeleton(self, collection_name, sample_size=None):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        if sample_size is None:
+            sample_size = self.sample_size
+        collection = self.instance_operations.db[collection_name]
+
+        # The full key set up front lets the document pass stop early
+        all_keys = self.key_discovery.get_keys(collection_name, sample_size)
+        skeleton = {}
+        empty_keys = set()
+        scanned_documents = 0
+
+        for document in self.iter_documents(collection, sample_size):
+            scanned_documents += 1
+            for key, value in document.items():
+                if key == "_id" or (key in skeleton and key not in empty_keys):
+                    continue
+                if self.is_empty(value):
+                    if key not in skeleton:
+                        skeleton[key] = value
+                        empty_keys.add(key)
+                else:
+                    skeleton[key] = self.get_example_value(value)
+                    empty_keys.discard(key)
+
+            if len(skeleton) >= len(all_keys) and not empty_keys:
+                break
+
+        logging.info(
+            f"SCHEMA PASS: {collection_name} ({scanned_documents} documents, {len(skeleton)} keys, {len(empty_keys)} without examples)"
+        )
+
+        # Keys that were empty everywhere in the pass are looked up in one aggregation
+        for key, value in self.find_populated_values(
+            collection, sorted(empty_keys)
+        ).items():
+            skeleton[key] = self.get_example_value(value)
+
+        return {key: skeleton[key] for key in sorted(skeleton)}
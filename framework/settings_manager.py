@@ -0,0 +1,48 @@
+import inspect
+import json
+import logging
+import os
+
+from framework.logging_handler import PythagoraZenLogger
+
+# settings_manager.py
+
+
+class SettingsManager:
+    # Settings are read once per process and shared by every instance
+    _settings_data = None
+
+    def __init__(self):
+        self.pythagorazen_logger = PythagoraZenLogger()
+        self.pythagorazen_logger.configure_logging()
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        self.settings_file_path = self.determine_settings_path()
+        if SettingsManager._settings_data is None:
+            SettingsManager._settings_data = self.load_settings()
+        self.settings_data = SettingsManager._settings_data
+
+    def determine_settings_path(self):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        script_path = os.path.abspath(__file__)
+        return os.path.join(
+            os.path.dirname(os.path.dirname(script_path)),
+            "config_data/settings",
+            "pythagorazen_settings.json",
+        )
+
+    def load_settings(self):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        try:
+            with open(self.settings_file_path, "r") as settings_file:
+                return json.load(settings_file)
+        except json.JSONDecodeError as e:
+            logging.error(f"Error decoding JSON: {e}")
+            return {}
+        except Exception as e:
+            logging.error(f"Error reading JSON file: {e}")
+            return {}
+
+    def get_section(self, section_name):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        # Missing sections fall back to the defaults of the caller
+        return self.settings_data.get(section_name, {})
@@ -0,0 +1,194 @@
+import inspect
+import logging
+
+from PyQt5.QtCore import QAbstractItemModel, QModelIndex, Qt
+
+from framework.logging_handler import PythagoraZenLogger
+
+
+class SkeletonTreeNode:
+    # Children are created the first time the view asks for them
+    def __init__(self, parent, row, key, value, path):
+        self.parent = parent
+        self.row = row
+        self.key = key
+        self.value = value
+        self.path = path
+        self.children = None
+
+    def get_items(self):
+        if isinstance(self.value, dict):
+            return list(self.value.items())
+        if isinstance(self.value, list):
+            return list(enumerate(self.value))
+        return []
+
+    def child_count(self):
+        if isinstance(self.value, (dict, list)):
+            return len(self.value)
+        return 0
+
+    def get_child_path(self, key):
+        return f"{self.path}.{key}" if self.path else str(key)
+
+    def load_children(self):
+        if self.children is None:
+            self.children = [
+                SkeletonTreeNode(self, row, key, value, self.get_child_path(key))
+                for row, (key, value) in enumerate(self.get_items())
+            ]
+        return self.children
+
+
+class SkeletonTreeModel(QAbstractItemModel):
+    headers = ["Key", "Value"]
+
+    def __init__(self, skeleton=None, field_summaries=None, parent=None):
+        super().__init__(parent)
+        self.pythagorazen_logger = PythagoraZenLogger()
+        self.pythagorazen_logger.configure_logging()
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        self.field_summaries = field_summaries or {}
+        self.set_skeleton(skeleton)
+
+    def set_skeleton(self, skeleton):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        self.beginResetModel()
+        self.root = SkeletonTreeNode(None, 0, None, skeleton or {}, "")
+        # {path: (generation, checked)}; the newest stamp on a node or its ancestors wins,
+        # so checking a subtree is one write and reading a node walks only its ancestors
+        self.generation = 0
+        self.check_stamps = {"": (0, False)}
+        self.endResetModel()
+
+    def get_node(self, index):
+        if index.isValid():
+            return index.internalPointer()
+        return self.root
+
+    def index(self, row, column, parent=QModelIndex()):
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        children = self.get_node(parent).load_children()
+        return self.createIndex(row, column, children[row])
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        parent_node = index.internalPointer().parent
+        if parent_node is None or parent_node is self.root:
+            return QModelIndex()
+        return self.createIndex(parent_node.row, 0, parent_node)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        return self.get_node(parent).child_count()
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.headers)
+
+    def hasChildren(self, parent=QModelIndex()):
+        return self.get_node(parent).child_count() > 0
+
+    def is_checked(self, node):
+        latest_generation, checked = -1, False
+        while node is not None:
+            stamp = self.check_stamps.get(node.path)
+            if stamp and stamp[0] > latest_generation:
+                latest_generation, checked = stamp
+            node = node.parent
+        return checked
+
+    def get_preview(self, value):
+        if isinstance(value, dict):
+            return f"{{{len(value)} keys}}"
+        if isinstance(value, list):
+            return f"[{len(value)} items]"
+        preview = str(value)
+        if len(preview) > 200:
+            return f"{preview[:200]}..."
+        return preview
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        if role == Qt.DisplayRole:
+            if index.column() == 0:
+                return str(node.key)
+            return self.get_preview(node.value)
+        if role == Qt.CheckStateRole and index.column() == 0:
+            return Qt.Checked if self.is_checked(node) else Qt.Unchecked
+        if role == Qt.ToolTipRole:
+            return self.field_summaries.get(node.path, node.path)
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.CheckStateRole or not index.isValid():
+            return False
+        self.set_checked(index.internalPointer(), value == Qt.Checked)
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.column() == 0:
+            flags |= Qt.ItemIsUserCheckable
+        return flags
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.headers[section]
+        return None
+
+    def set_checked(self, node, checked):
+        self.generation += 1
+        if node is self.root:
+            # Every older stamp is superseded, drop them to keep the store small
+            self.check_stamps = {"": (self.generation, checked)}
+        else:
+            self.check_stamps[node.path] = (self.generation, checked)
+        self.emit_check_state_changed(node)
+
+    def emit_check_state_changed(self, node):
+        # Only nodes the view has created can be on screen
+        nodes = [node]
+        while nodes:
+            node = nodes.pop()
+            if node is not self.root:
+                index = self.createIndex(node.row, 0, node)
+                self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+            if node.children:
+                nodes.extend(node.children)
+
+    def set_all_checked(self, checked):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        self.set_checked(self.root, checked)
+
+    def get_selected_keys(self):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        # One walk over the skeleton data, checked leaves become dotted paths
+        selected_keys = []
+        stack = [(self.root.value, "", self.check_stamps[""])]
+        while stack:
+            value, path, inherited_stamp = stack.pop()
+            stamp = self.check_stamps.get(path)
+            if stamp and stamp[0] > inherited_stamp[0]:
+                inherited_stamp = stamp
+
+            if isinstance(value, dict):
+                items = list(value.items())
+            elif isinstance(value, list):
+                items = list(enumerate(value))
+            else:
+                items = None
+
+            if items:
+                for key, child_value in reversed(items):
+                    child_path = f"{path}.{key}" if path else str(key)
+                    stack.append((child_value, child_path, inherited_stamp))
+            elif path and inherited_stamp[1]:
+                selected_keys.append(path)
+        return selected_keys
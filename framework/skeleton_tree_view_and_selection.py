@@ -3,24 +3,28 @@ import json
 import logging
 import os
 
-from PyQt5.QtCore import QDateTime, Qt
+from PyQt5.QtCore import QDateTime
 from PyQt5.QtWidgets import (
     QAction,
     QInputDialog,
     QMenu,
     QPushButton,
-    QTreeWidget,
-    QTreeWidgetItem,
+    QTreeView,
     QVBoxLayout,
     QWidget,
 )
 
 from framework.logging_handler import PythagoraZenLogger
+from framework.skeleton_tree_model import SkeletonTreeModel
 
 
 class SkeletonTreeViewAndSelection(QWidget):
     def __init__(
-        self, json_data=None, selected_collection=None, zendesk_subdomain=None
+        self,
+        json_data=None,
+        selected_collection=None,
+        zendesk_subdomain=None,
+        field_summaries=None,
     ):
         super(SkeletonTreeViewAndSelection, self).__init__()
         self.pythagorazen_logger = PythagoraZenLogger()
@@ -29,6 +33,8 @@ class SkeletonTreeViewAndSelection(QWidget):
         self.selected_keys = []
         self.selected_collection = selected_collection
         self.zendesk_subdomain = zendesk_subdomain
+        # Tooltips from the schema catalog, keyed by dotted path
+        self.field_summaries = field_summaries or {}
         self.setWindowTitle(
             f"Collection: {self.selected_collection}, Instance: {self.zendesk_subdomain}"
         )
@@ -36,9 +42,11 @@ class SkeletonTreeViewAndSelection(QWidget):
 
         layout = QVBoxLayout()
 
-        self.tree_widget = QTreeWidget()
-        self.tree_widget.setHeaderLabels(["Key", "Value"])
-        self.tree_widget.setColumnCount(2)
+        # Lazy model: children are created on expand, check state is path-keyed
+        self.tree_model = SkeletonTreeModel(json_data, self.field_summaries)
+        self.tree_widget = QTreeView()
+        self.tree_widget.setModel(self.tree_model)
+        self.tree_widget.setUniformRowHeights(True)
 
         # Set stylesheet with improved checkbox appearance
         self.tree_widget.setStyleSheet(
@@ -54,10 +62,6 @@ class SkeletonTreeViewAndSelection(QWidget):
         """
         )
 
-        # Populate the tree with provided or loaded JSON data
-        if json_data:
-            self.populate_tree(json_data, self.tree_widget)
-
         layout.addWidget(self.tree_widget)
 
         select_all_button = QPushButton("Select All")
@@ -75,13 +79,20 @@ class SkeletonTreeViewAndSelection(QWidget):
 
         self.setLayout(layout)
 
-        self.tree_widget.itemChanged.connect(self.handle_item_change)
+    def update_content(self, json_data, selected_collection=None):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        if selected_collection:
+            self.selected_collection = selected_collection
+            self.setWindowTitle(
+                f"Collection: {self.selected_collection}, Instance: {self.zendesk_subdomain}"
+            )
+        self.populate_tree(json_data)
 
     def load_and_display_json(self, file_path):
         logging.debug(f"{inspect.currentframe().f_code.co_name}")
         data = self.load_json_file(file_path)
         if data:
-            self.populate_tree(data, self.tree_widget)
+            self.populate_tree(data)
 
     def load_json_file(self, file_path):
         logging.debug(f"{inspect.currentframe().f_code.co_name}")
@@ -93,145 +104,35 @@ class SkeletonTreeViewAndSelection(QWidget):
             logging.error(f"Error loading JSON file {file_path}: {e}")
             return None
 
-    def populate_tree(self, data, parent_item=None, parent_key=""):
+    def populate_tree(self, data):
         logging.debug(f"{inspect.currentframe().f_code.co_name}")
-        if isinstance(data, dict):
-            for key, value in data.items():
-                current_key = key if not parent_key else f"{parent_key}.{key}"
-                display_key = key if not parent_key else key.split(".")[-1]
-
-                if parent_item is None:
-                    item = QTreeWidgetItem()
-                    self.tree_widget.addTopLevelItem(item)
-                else:
-                    item = QTreeWidgetItem(parent_item)
-
-                item.setText(0, display_key)
-                item.setText(1, str(value))
-                item.setCheckState(0, 0)  # Set checkbox for the key
-
-                if isinstance(value, (dict, list)):
-                    # Recursively populate the tree for nested structures
-                    self.populate_tree(value, parent_key=current_key, parent_item=item)
-        elif isinstance(data, list):
-            for i, item in enumerate(data):
-                current_key = str(i) if not parent_key else f"{parent_key}.{i}"
-
-                if parent_item is None:
-                    child_item = QTreeWidgetItem()
-                    self.tree_widget.addTopLevelItem(child_item)
-                else:
-                    child_item = QTreeWidgetItem(parent_item)
-
-                child_item.setText(0, current_key)
-                child_item.setText(1, str(item))
-                child_item.setCheckState(0, 0)  # Set checkbox for the key
+        # Only the top level is materialized, nested keys appear when expanded
+        self.tree_model.set_skeleton(data)
 
-                if isinstance(item, (dict, list)):
-                    # Recursively populate the tree for nested structures
-                    self.populate_tree(
-                        item, parent_key=current_key, parent_item=child_item
-                    )
-
-    # THIS CODE WORKS FOR STORING THE PARENT.KEY1.KEY2 IN A LIST OF SELECTED KEYS
+    # Selected keys are stored as PARENT.KEY1.KEY2 paths of the checked leaves
     def get_selected_keys(self):
         logging.debug(f"{inspect.currentframe().f_code.co_name}")
-        selected_keys = []
-        self.collect_selected_keys(self.tree_widget.invisibleRootItem(), selected_keys)
-        return selected_keys
-
-    def collect_selected_keys(
-        self, item, selected_keys, parent_key="", recorded_keys=None
-    ):
-        logging.debug(f"{inspect.currentframe().f_code.co_name}")
-        if recorded_keys is None:
-            recorded_keys = set()
-
-        if not parent_key:
-            parent_key = None
-
-        # Check if the item is checked
-        if item.checkState(0) == Qt.Checked:
-            # If the item has children, include its checked children
-            if item.childCount() > 0:
-                for i in range(item.childCount()):
-                    child = item.child(i)
-                    key = child.text(0)
-                    current_key = key if not parent_key else f"{parent_key}.{key}"
-
-                    # Recursively collect for nested structures
-                    self.collect_selected_keys(
-                        child,
-                        selected_keys,
-                        parent_key=current_key,
-                        recorded_keys=recorded_keys,
-                    )
-
-            # If the item is a leaf, add it to selected_keys
-            elif item.childCount() == 0:
-                if parent_key not in recorded_keys:
-                    selected_keys.append(parent_key)
-                    recorded_keys.add(parent_key)
-
-        # Recursively check each child, including unchecked ones
-        for i in range(item.childCount()):
-            child = item.child(i)
-            key = child.text(0)
-            current_key = key if not parent_key else f"{parent_key}.{key}"
-
-            # Recursively collect for nested structures
-            self.collect_selected_keys(
-                child,
-                selected_keys,
-                parent_key=current_key,
-                recorded_keys=recorded_keys,
-            )
+        return self.tree_model.get_selected_keys()
 
     def select_all(self):
         logging.debug(f"{inspect.currentframe().f_code.co_name}")
-        self.update_checkstate(self.tree_widget.invisibleRootItem(), True)
+        self.tree_model.set_all_checked(True)
 
     def deselect_all(self):
         logging.debug(f"{inspect.currentframe().f_code.co_name}")
-        self.update_checkstate(self.tree_widget.invisibleRootItem(), False)
+        self.tree_model.set_all_checked(False)
 
     def contextMenuEvent(self, event):
         logging.debug(f"{inspect.currentframe().f_code.co_name}")
         menu = QMenu(self)
         select_all_action = QAction("Select All", self)
-        select_all_action.triggered.connect(
-            lambda _, item=self.tree_widget.invisibleRootItem(): self.update_checkstate(
-                item, True
-            )
-        )
+        select_all_action.triggered.connect(self.select_all)
         deselect_all_action = QAction("Deselect All", self)
-        deselect_all_action.triggered.connect(
-            lambda _, item=self.tree_widget.invisibleRootItem(): self.update_checkstate(
-                item, False
-            )
-        )
+        deselect_all_action.triggered.connect(self.deselect_all)
         menu.addAction(select_all_action)
         menu.addAction(deselect_all_action)
         menu.exec_(event.globalPos())
 
-    def update_checkstate(self, item, checked):
-        logging.debug(f"{inspect.currentframe().f_code.co_name}")
-        item.setCheckState(0, Qt.Checked if checked else Qt.Unchecked)
-
-        # Recursively update the check state for children
-        for i in range(item.childCount()):
-            child = item.child(i)
-            self.update_checkstate(child, checked)
-
-        # Collect selected keys
-        if checked:
-            self.collect_selected_keys(item, self.selected_keys)
-
-    def handle_item_change(self, item, column):
-        logging.debug(f"{inspect.currentframe().f_code.co_name}")
-        if column == 0:  # Check column
-            self.update_checkstate(item, item.checkState(column) == 2)
-
     def save_selection(self):
         logging.debug(f"{inspect.currentframe().f_code.co_name}")
         # Show a dialog to get the multiline description
@@ -0,0 +1,52 @@
+import inspect
+import logging
+from datetime import datetime, timezone
+
+from framework.instance_database_operations_api_endpoint_config import (
+    ZendeskInstanceDatabaseOperationsMongoDB,
+)
+from framework.logging_handler import PythagoraZenLogger
+
+
+class SyncCheckpointStore:
+    checkpoint_collection_name = "pythagorazen_sync_checkpoints"
+
+    def __init__(self, zendesk_subdomain):
+        self.pythagorazen_logger = PythagoraZenLogger()
+        self.pythagorazen_logger.configure_logging()
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        self.zendesk_subdomain = zendesk_subdomain
+        # Checkpoints live in the instance database, one document per collection
+        self.instance_operations = ZendeskInstanceDatabaseOperationsMongoDB(
+            zendesk_subdomain, self.checkpoint_collection_name
+        )
+
+    def get_checkpoint(self, collection_name):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        checkpoint_document = self.instance_operations.query_collection_find_one(
+            {"collection": collection_name}, {"_id": 0}
+        )
+        if checkpoint_document:
+            return checkpoint_document.get("checkpoint", {})
+        return {}
+
+    def save_checkpoint(self, collection_name, checkpoint):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        logging.info(f"CHECKPOINT ({collection_name}): {checkpoint}")
+        self.instance_operations.collection.replace_one(
+            {"collection": collection_name},
+            {
+                "collection": collection_name,
+                "checkpoint": checkpoint,
+                "updated_at": datetime.now(timezone.utc),
+            },
+            upsert=True,
+        )
+
+    def clear_checkpoint(self, collection_name):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        self.instance_operations.collection.delete_one({"collection": collection_name})
+
+    def close_connection(self):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        self.instance_operations.close_connection()
@@ -0,0 +1,278 @@
+import inspect
+import logging
+import re
+from itertools import islice
+
+from PyQt5.QtCore import QAbstractTableModel, QEvent, QModelIndex, Qt, QUrl
+from PyQt5.QtGui import QDesktopServices, QFont, QPalette
+from PyQt5.QtWidgets import (
+    QApplication,
+    QStyle,
+    QStyledItemDelegate,
+    QStyleOptionViewItem,
+)
+
+from framework.logging_handler import PythagoraZenLogger
+from framework.settings_manager import SettingsManager
+
+
+class RowDataTableModel(QAbstractTableModel):
+    # Read-only model over a list of dicts, cells are rendered only when the view asks
+    def __init__(self, rows=None, columns=None, parent=None):
+        super().__init__(parent)
+        self.pythagorazen_logger = PythagoraZenLogger()
+        self.pythagorazen_logger.configure_logging()
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        self.rows = rows or []
+        # Columns follow the keys of the first row, like the old QTableWidget view
+        self.columns = columns or (list(self.rows[0].keys()) if self.rows else [])
+        self.header_font = QFont()
+        self.header_font.setBold(True)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.columns)
+
+    def get_cell_text(self, row, column):
+        value = self.rows[row].get(self.columns[column], "")
+        return str(value)
+
+    def get_header_text(self, column):
+        return self.columns[column]
+
+    def get_link_scheme(self, column):
+        # Same column-name rules as before: email wins over url/link
+        attribute = self.columns[column].lower()
+        if "email" in attribute:
+            return "mailto:"
+        if "url" in attribute or "link" in attribute:
+            return ""
+        return None
+
+    def get_link(self, index):
+        scheme = self.get_link_scheme(index.column())
+        if scheme is None:
+            return None
+        text = self.get_cell_text(index.row(), index.column())
+        if not text or text == "None":
+            return None
+        return f"{scheme}{text}"
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return self.get_cell_text(index.row(), index.column())
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal:
+            if role == Qt.DisplayRole:
+                return self.get_header_text(section)
+            if role == Qt.FontRole:
+                return self.header_font
+            if role == Qt.TextAlignmentRole:
+                return Qt.AlignCenter
+            return None
+        if role == Qt.DisplayRole:
+            return section + 1
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsSelectable | Qt.ItemIsEnabled
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        if not 0 <= column < len(self.columns):
+            return
+        attribute = self.columns[column]
+        self.layoutAboutToBeChanged.emit()
+        self.rows.sort(
+            key=lambda row: str(row.get(attribute, "")),
+            reverse=order == Qt.DescendingOrder,
+        )
+        self.layoutChanged.emit()
+
+
+class MongoCursorTableModel(RowDataTableModel):
+    # Keeps a cursor open and pulls rows in blocks as the view scrolls
+    def __init__(
+        self, instance_operations, query=None, projection=None, columns=None, parent=None
+    ):
+        super().__init__([], columns, parent)
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        table_view_settings = SettingsManager().get_section("table_view")
+        self.fetch_block_size = table_view_settings.get("fetch_block_size", 500)
+        self.instance_operations = instance_operations
+        self.query = query or {}
+        self.projection = projection
+        self.filter_query = {}
+        self.sort_spec = None
+        # Raw documents for the API response view, rows hold the flattened columns
+        self.documents = []
+        self.cursor = None
+        self.cursor_exhausted = True
+        index_information = instance_operations.collection.index_information()
+        self.indexed_fields = {
+            index_details["key"][0][0]
+            for index_details in index_information.values()
+            if len(index_details["key"]) == 1
+        }
+        self.reset_cursor()
+
+    def is_indexed(self, field):
+        return field in self.indexed_fields
+
+    def build_query(self):
+        if not self.filter_query:
+            return self.query
+        if not self.query:
+            return self.filter_query
+        return {"$and": [self.query, self.filter_query]}
+
+    def reset_cursor(self):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        self.beginResetModel()
+        if self.cursor is not None:
+            self.cursor.close()
+        self.rows = []
+        self.documents = []
+        self.cursor = self.instance_operations.query_collection_cursor(
+            self.build_query(),
+            self.projection,
+            sort=self.sort_spec,
+            batch_size=self.fetch_block_size,
+            # Only unindexed sorts can outgrow the in-memory sort limit
+            allow_disk_use=bool(self.sort_spec) or None,
+        )
+        self.cursor_exhausted = False
+        # The first block is read inside the reset so columns are known up front
+        self.append_documents(self.read_block())
+        self.endResetModel()
+
+    def read_block(self):
+        documents = list(islice(self.cursor, self.fetch_block_size))
+        if len(documents) < self.fetch_block_size:
+            self.cursor_exhausted = True
+            self.cursor.close()
+        return documents
+
+    def append_documents(self, documents):
+        if documents and not self.columns:
+            self.columns = [key for key in documents[0].keys() if key != "_id"]
+        self.documents.extend(documents)
+        self.rows.extend(self.get_row(document) for document in documents)
+
+    def get_row(self, document):
+        # Missing fields are left out so they show as "", like the in-memory tables
+        row = {}
+        for column in self.columns:
+            value = self.instance_operations.get_nested_value(document, column)
+            if value is not None:
+                row[column] = value
+        return row
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return not self.cursor_exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self.cursor_exhausted:
+            return
+        documents = self.read_block()
+        if not documents:
+            return
+
+        first_row = len(self.rows)
+        self.beginInsertRows(QModelIndex(), first_row, first_row + len(documents) - 1)
+        self.append_documents(documents)
+        self.endInsertRows()
+
+    def fetch_all(self):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        while self.canFetchMore():
+            self.fetchMore()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        if not 0 <= column < len(self.columns):
+            return
+        field = self.columns[column]
+        if not self.is_indexed(field):
+            logging.warning(
+                f"SORT ON UNINDEXED FIELD {field}, add it to mongodb_indexes for fast sorting"
+            )
+        self.sort_spec = [(field, -1 if order == Qt.DescendingOrder else 1)]
+        self.reset_cursor()
+
+    def set_filter(self, field, text):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        if not text:
+            self.filter_query = {}
+        else:
+            # An anchored prefix match can walk the index on indexed fields
+            conditions = [{field: {"$regex": f"^{re.escape(text)}"}}]
+            try:
+                conditions.append({field: int(text)})
+            except ValueError:
+                pass
+            if text.lower() in ("true", "false"):
+                conditions.append({field: text.lower() == "true"})
+            self.filter_query = (
+                conditions[0] if len(conditions) == 1 else {"$or": conditions}
+            )
+            if not self.is_indexed(field):
+                logging.warning(f"FILTER ON UNINDEXED FIELD {field}")
+        logging.info(f"FILTER: {self.filter_query}")
+        self.reset_cursor()
+
+    def close_cursor(self):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        if self.cursor is not None:
+            self.cursor.close()
+        self.cursor_exhausted = True
+
+
+class LinkItemDelegate(QStyledItemDelegate):
+    # Draws url/link/email cells as links and opens them on click, no per-cell widgets
+    def paint(self, painter, option, index):
+        link = index.model().get_link(index)
+        if link is None:
+            super().paint(painter, option, index)
+            return
+
+        link_option = QStyleOptionViewItem(option)
+        self.initStyleOption(link_option, index)
+        link_option.font.setUnderline(True)
+        if not link_option.state & QStyle.State_Selected:
+            link_option.palette.setColor(
+                QPalette.Text, link_option.palette.color(QPalette.Link)
+            )
+        style = (
+            link_option.widget.style() if link_option.widget else QApplication.style()
+        )
+        style.drawControl(
+            QStyle.CE_ItemViewItem, link_option, painter, link_option.widget
+        )
+
+    def editorEvent(self, event, model, option, index):
+        if (
+            event.type() == QEvent.MouseButtonRelease
+            and event.button() == Qt.LeftButton
+        ):
+            link = model.get_link(index)
+            if link is not None:
+                QDesktopServices.openUrl(QUrl(link))
+                return True
+        return super().editorEvent(event, model, option, index)
@@ -1,16 +1,22 @@
 import inspect
 
 # window_views.py
-import json
 import logging
 
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QKeySequence
-from PyQt5.QtWidgets import QAbstractItemView, QLabel, QShortcut, QTableWidgetItem
+from PyQt5.QtWidgets import QAbstractItemView, QShortcut
 
 from framework.logging_handler import PythagoraZenLogger
 
 from framework.copy_handler import CopyHandler
+from framework.json_tree_model import JsonTreeModel
+from framework.settings_manager import SettingsManager
+from framework.table_models import (
+    LinkItemDelegate,
+    MongoCursorTableModel,
+    RowDataTableModel,
+)
 
 
 
@@ -24,6 +30,8 @@ class ViewManager:
         self.module_window = module_window
         self.table = module_window.table
         self.json_browser = module_window.json_browser
+        self.json_tree = module_window.json_tree
+        self.json_view = module_window.json_view
         self.central_widget = module_window.central_widget
         self.api_response_button = module_window.api_response_button
         self.table_button = module_window.table_button
@@ -38,88 +46,106 @@ class ViewManager:
 
         self.table_button.clicked.connect(self.show_table_view)
 
+        table_view_settings = SettingsManager().get_section("table_view")
+        self.column_sizing_sample_rows = table_view_settings.get(
+            "column_sizing_sample_rows", 200
+        )
+        self.max_column_width = table_view_settings.get("max_column_width", 400)
+
+        self.table_model = RowDataTableModel()
+        self.table.setModel(self.table_model)
+        self.link_delegate = LinkItemDelegate(self.table)
+        self.table.setItemDelegate(self.link_delegate)
+        # No initial sort, rows keep the query order until a header is clicked
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.table.setSortingEnabled(True)
+        self.table.setWordWrap(False)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.table.customContextMenuRequested.connect(self.show_context_menu)
+        self.table.horizontalHeader().setDefaultAlignment(Qt.AlignCenter)
+        self.table.horizontalHeader().setSectionsMovable(True)
+
         # Create a shortcut for copying selected data
         self.copy_shortcut = QShortcut(QKeySequence.Copy, self.table)
         self.copy_shortcut.activated.connect(self.copy_selected_data)
 
+        self.json_tree_model = JsonTreeModel()
+        self.set_json_tree_model(self.json_tree_model)
+
         # Set the initial visibility
-        self.json_browser.hide()
+        self.json_view.hide()
         self.table.show()  # Show the table by default
         self.current_view = self.table
 
     def copy_selected_data(self):
         logging.debug(f"{inspect.currentframe().f_code.co_name}")
         # Get the selected data and call the CopyHandler to copy it
-        selected_ranges = self.table.selectedRanges()
-        if selected_ranges:
+        if self.table.selectionModel().hasSelection():
             CopyHandler.copy_selection(self.table)
 
+    def set_table_model(self, table_model):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        if isinstance(self.table_model, MongoCursorTableModel):
+            self.table_model.close_cursor()
+        self.table_model = table_model
+        self.table.setModel(self.table_model)
+        self.module_window.set_filter_bar_visible(
+            isinstance(table_model, MongoCursorTableModel)
+        )
+
     def display_data_in_table(self, data_list):
         logging.debug(f"{inspect.currentframe().f_code.co_name}")
-        self.table.clear()
+        # The model renders cells on demand, so large results cost one list of dicts
+        self.set_table_model(RowDataTableModel(list(data_list or [])))
 
         if not data_list:
             return
 
-        # Extract attribute names from the first item in the data_list
-        attribute_names = list(data_list[0].keys())
-
-        self.table.setSortingEnabled(True)
-        self.table.setContextMenuPolicy(Qt.CustomContextMenu)
-        self.table.customContextMenuRequested.connect(self.show_context_menu)
-
-        self.table.setColumnCount(len(attribute_names))
-
-        for i, attribute in enumerate(attribute_names):
-            item = QTableWidgetItem(attribute)
-            font = item.font()
-            font.setBold(True)
-            item.setFont(font)
-            item.setTextAlignment(Qt.AlignCenter)
-            self.table.setHorizontalHeaderItem(i, item)
-
-        self.table.setRowCount(len(data_list))
-
-        for i, user_data in enumerate(data_list):
-            for j, attribute in enumerate(attribute_names):
-                value = str(user_data.get(attribute, ""))
-
-                # Check if the value is a URL and make it clickable
-                if "url" in attribute.lower() or "link" in attribute.lower():
-                    label = QLabel('<a href="{0}">{0}</a>'.format(value))
-                    label.setOpenExternalLinks(True)
-                    label.setAlignment(Qt.AlignCenter)
-                    self.table.setCellWidget(i, j, label)
-                else:
-                    item = QTableWidgetItem(str(value))
-                    item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)
-                    item.setTextAlignment(Qt.AlignCenter)
-                    self.table.setItem(i, j, item)
-
-                # Check if the value is an email address and make it clickable
-                if "email" in attribute.lower():
-                    label = QLabel('<a href="mailto:{0}">{0}</a>'.format(value))
-                    label.setOpenExternalLinks(True)
-                    label.setAlignment(Qt.AlignCenter)
-                    self.table.setCellWidget(i, j, label)
-                else:
-                    item = QTableWidgetItem(str(value))
-                    item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)
-                    item.setTextAlignment(Qt.AlignCenter)
-                    self.table.setItem(i, j, item)
-
-        self.table.horizontalHeader().setDefaultAlignment(Qt.AlignCenter)
-        self.table.horizontalHeader().setSectionsMovable(True)
-        self.table.resizeColumnsToContents()
-        self.table.resizeRowsToContents()
-        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.resize_columns_from_sample()
 
         # print(f"Displaying data in table:\n{data_list}")
-        # print(f"Attribute names: {attribute_names}")
 
         self.switch_view(self.table)
         self.export_manager.show_save_buttons()
 
+    def display_cursor_in_table(self, table_model):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        # Rows arrive block by block through canFetchMore/fetchMore as the view scrolls
+        self.set_table_model(table_model)
+        self.module_window.set_filter_columns(table_model.columns)
+        self.resize_columns_from_sample()
+        self.switch_view(self.table)
+        self.export_manager.show_save_buttons()
+
+    def apply_filter(self, column_name, text):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        if isinstance(self.table_model, MongoCursorTableModel):
+            self.table_model.set_filter(column_name, text)
+
+    def resize_columns_from_sample(self):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        # Size columns from the header and the first rows instead of every cell
+        font_metrics = self.table.fontMetrics()
+        header_metrics = self.table.horizontalHeader().fontMetrics()
+        sample_rows = min(self.table_model.rowCount(), self.column_sizing_sample_rows)
+        padding = 2 * font_metrics.averageCharWidth() + 12
+
+        for column in range(self.table_model.columnCount()):
+            width = header_metrics.horizontalAdvance(
+                self.table_model.get_header_text(column)
+            )
+            for row in range(sample_rows):
+                width = max(
+                    width,
+                    font_metrics.horizontalAdvance(
+                        self.table_model.get_cell_text(row, column)
+                    ),
+                )
+            self.table.setColumnWidth(
+                column, min(width + padding, self.max_column_width)
+            )
+
     def get_nested_value(self, data, attribute):
         logging.debug(f"{inspect.currentframe().f_code.co_name}")
         # Recursively get nested value
@@ -131,16 +157,32 @@ class ViewManager:
                 return None
         return data
 
-    def display_api_response_as_json(self, api_response):
+    def set_json_tree_model(self, json_tree_model):
         logging.debug(f"{inspect.currentframe().f_code.co_name}")
-        # print(f"API RESPONSE:\n\n{api_response}")
-        # print(f"API RESPONSE DATA TYPE: {type(api_response)}")
-        # print(f"DISPLAY API RESPONSE VIEW:\n{json.dumps(api_response, indent=4)}")
+        self.json_tree_model = json_tree_model
+        self.json_tree.setModel(self.json_tree_model)
+        # A new selection model comes with every model
+        self.json_tree.selectionModel().currentChanged.connect(self.show_json_detail)
         self.json_browser.clear()
-        self.json_browser.setPlainText(json.dumps(api_response, default=str, indent=4))
-        self.switch_view(self.json_browser)
+
+    def display_api_response_as_json(self, api_response):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        # Rows and nested values are created as the tree is scrolled and expanded
+        self.set_json_tree_model(JsonTreeModel(api_response))
+        self.switch_view(self.json_view)
         self.api_response_button.show()  # Show the button after displaying API response
 
+    def display_cursor_as_json(self, table_model):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        # Shares the table's documents and cursor, more are fetched as the tree scrolls
+        self.set_json_tree_model(JsonTreeModel(table_model=table_model))
+        self.switch_view(self.json_view)
+
+    def show_json_detail(self, current, previous):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        if current.isValid():
+            self.json_browser.setPlainText(self.json_tree_model.get_node_json(current))
+
     @staticmethod
     def create_copy_menu(table, pos):
         logging.debug(f"{inspect.currentframe().f_code.co_name}")
@@ -157,9 +199,11 @@ class ViewManager:
 
     def show_api_response_view(self):
         logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        if isinstance(self.table_model, MongoCursorTableModel):
+            self.display_cursor_as_json(self.table_model)
         # Hide the JSON view when switching to the table view
-        self.json_browser.hide()
-        self.switch_view(self.json_browser)
+        self.json_view.hide()
+        self.switch_view(self.json_view)
         self.export_manager.hide_save_buttons()
 
     def show_context_menu(self, pos):
@@ -174,13 +218,13 @@ class ViewManager:
 
     def clear_views(self):
         logging.debug(f"{inspect.currentframe().f_code.co_name}")
-        self.table.clear()
-        self.json_browser.clear()
+        self.set_table_model(RowDataTableModel())
+        self.set_json_tree_model(JsonTreeModel())
 
     def show_table_view(self):
         logging.debug(f"{inspect.currentframe().f_code.co_name}")
         # Hide the JSON view when switching to the table view
-        self.json_browser.hide()
+        self.json_view.hide()
         self.switch_view(self.table)
         self.export_manager.show_save_buttons()
 
@@ -192,7 +236,7 @@ class ViewManager:
 
         if self.current_view == self.table:
             self.central_widget.layout().addWidget(self.table)
-            self.central_widget.layout().addWidget(self.json_browser)
-        elif self.current_view == self.json_browser:
-            self.central_widget.layout().addWidget(self.json_browser)
+            self.central_widget.layout().addWidget(self.json_view)
+        elif self.current_view == self.json_view:
+            self.central_widget.layout().addWidget(self.json_view)
             self.central_widget.layout().addWidget(self.table)
@@ -1,9 +1,25 @@
 import logging
 import inspect
+from datetime import datetime, timezone
 from framework.logging_handler import PythagoraZenLogger
 from framework.instance_database_operations_api_endpoint_config import ZendeskInstanceDatabaseOperationsMongoDB
 
 class PipelineOperations:
+    users_enriched_collection_name = "users_enriched"
+    # Syncing any of these collections makes users_enriched stale
+    users_enriched_source_collections = {
+        "users",
+        "organizations",
+        "groups",
+        "custom_roles",
+    }
+    users_enriched_fields = {
+        "organization_name",
+        "default_group_name",
+        "custom_role_name",
+        "url",
+    }
+
     def __init__(
         self,
         zendesk_subdomain
@@ -17,70 +33,104 @@ class PipelineOperations:
         self.organization_collection = ZendeskInstanceDatabaseOperationsMongoDB(self.zendesk_subdomain, "organizations")
         self.group_collection = ZendeskInstanceDatabaseOperationsMongoDB(self.zendesk_subdomain, "groups")
         self.custom_role_collection = ZendeskInstanceDatabaseOperationsMongoDB(self.zendesk_subdomain, "custom_roles")
+        self.users_enriched_collection = ZendeskInstanceDatabaseOperationsMongoDB(
+            self.zendesk_subdomain, self.users_enriched_collection_name
+        )
 
         logging.debug(f"self.user_collection         : {self.user_collection}")
         logging.debug(f"self.organization_collection : {self.organization_collection}")
         logging.debug(f"self.group_collection        : {self.group_collection}")
         logging.debug(f"self.custom_role_collection  : {self.custom_role_collection}")        
 
-    def update_user_data(self):
+    def build_name_lookup_stages(
+        self, from_collection, local_field, name_field, default_name
+    ):
+        # Index-backed equality $lookup, reduced to the first matching name
+        lookup_field = f"_{name_field}_lookup"
+        return [
+            {
+                "$lookup": {
+                    "from": from_collection,
+                    "localField": local_field,
+                    "foreignField": "id",
+                    "as": lookup_field,
+                }
+            },
+            {
+                "$addFields": {
+                    name_field: {
+                        "$ifNull": [
+                            {"$arrayElemAt": [f"${lookup_field}.name", 0]},
+                            default_name,
+                        ]
+                    }
+                }
+            },
+            {"$project": {lookup_field: 0}},
+        ]
+
+    def build_users_enriched_pipeline(self, refreshed_at):
         logging.debug(f"{inspect.currentframe().f_code.co_name}")
-        logging.debug(f"pipeline subdomain: {self.zendesk_subdomain}")
-        logging.debug(f"user_collection: {self.user_collection}")
-        logging.debug(f"organization_collection: {self.organization_collection}")
-
-        # Get all users from the user collection
-        users = list(self.user_collection.query_collection())
-
-        modified_users = []
-
-        # Look up organization name for each user
-        for user in users:
-            organization_id = user.get("organization_id")
-            organization_name = "No Organization"  # Default value
-
-            if organization_id:
-                organization = self.organization_collection.query_collection_find_one(
-                    {"id": organization_id}
-                )
-                if organization:
-                    organization_name = organization.get("name")
-
-            default_group_id = user.get("default_group_id")
-            default_group_name = "None"
-
-            if default_group_id:
-                default_group = self.group_collection.query_collection_find_one({"id": default_group_id})
-                if default_group:
-                    default_group_name = default_group.get("name")
-
-            custom_role_id = user.get("custom_role_id")
-            custom_role_name = "None"
-
-            if custom_role_id:
-                custom_role = self.custom_role_collection.query_collection_find_one(
-                    {"id": custom_role_id}
-                )
-                if custom_role:
-                    custom_role_name = custom_role.get("name")
-
-            if organization_id or default_group_id or custom_role_id:
-                logging.info(f"USER: {user.get('name')}")
-                logging.info(f"\tORG : {organization_id}")
-                logging.info(f"\tGRP : {default_group_id}")
-                logging.info(f"\tCRN : {custom_role_id}\n")
-
-            # custom_role_id
-            # tags (this is a ist)
-
-            # Add organization_name and url to the original user record
-            user["custom_role_name"] = custom_role_name
-            user["default_group_name"] = default_group_name
-            user["organization_name"] = organization_name
-            user[
-                "url"
-            ] = f"https://{self.zendesk_subdomain}.zendesk.com/agent/users/{user['id']}"
-
-            modified_users.append(user)
+        pipeline = []
+        pipeline += self.build_name_lookup_stages(
+            "organizations", "organization_id", "organization_name", "No Organization"
+        )
+        pipeline += self.build_name_lookup_stages(
+            "groups", "default_group_id", "default_group_name", "None"
+        )
+        pipeline += self.build_name_lookup_stages(
+            "custom_roles", "custom_role_id", "custom_role_name", "None"
+        )
+        pipeline += [
+            {
+                "$addFields": {
+                    "url": {
+                        "$concat": [
+                            f"https://{self.zendesk_subdomain}.zendesk.com/agent/users/",
+                            {"$toString": "$id"},
+                        ]
+                    },
+                    "pythagorazen_enriched_at": refreshed_at,
+                }
+            },
+            {
+                "$merge": {
+                    "into": self.users_enriched_collection_name,
+                    "on": "_id",
+                    "whenMatched": "replace",
+                    "whenNotMatched": "insert",
+                }
+            },
+        ]
+        return pipeline
+
+    def refresh_users_enriched(self):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        # The join runs entirely on the server and is persisted into users_enriched
+        refreshed_at = datetime.now(timezone.utc)
+        self.user_collection.collection.aggregate(
+            self.build_users_enriched_pipeline(refreshed_at), allowDiskUse=True
+        )
+
+        # Users that no longer exist were not touched by this refresh
+        stale_users = self.users_enriched_collection.collection.delete_many(
+            {"pythagorazen_enriched_at": {"$ne": refreshed_at}}
+        )
+        logging.info(
+            f"USERS ENRICHED REFRESHED ({self.zendesk_subdomain}): {stale_users.deleted_count} stale users removed"
+        )
+
+    def ensure_users_enriched(self):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        # Build the materialized view if it has never been refreshed
+        if not self.users_enriched_collection.query_collection_find_one({}, {"_id": 1}):
+            self.refresh_users_enriched()
 
-        return modified_users
+    def build_users_enriched_projection(self, selected_keys=None):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        if not selected_keys:
+            return {"pythagorazen_enriched_at": 0}
+        # Selected keys plus the enrichment columns, projected on the server
+        return self.users_enriched_collection.build_projection(
+            set(selected_keys) | self.users_enriched_fields
+        )
@@ -1,21 +1,31 @@
 import json
 import logging
-import re
+from datetime import datetime, timezone
+from functools import partial
 
 from PyQt5.QtCore import QObject, Qt, pyqtSignal
 from PyQt5.QtWidgets import QDialog, QProgressBar, QProgressDialog
 
 from framework.api_paginator import ZendeskApiPaginator
 from framework.config_manager import ConfigManager
+from framework.dependency_fan_out import DependencyFanOutExecutor
 from framework.endpoint_selection_dialog_api_endpoint_config import (
     APIConfigEndpointSelectionDialog,
 )
+from framework.endpoint_sync_scheduler import EndpointSyncScheduler
+from framework.incremental_export_paginator import ZendeskIncrementalExportPaginator
+from framework.index_manager import MongoDBIndexManager
 from framework.instance_database_operations_api_endpoint_config import (
     ZendeskInstanceDatabaseOperationsMongoDB,
 )
 from framework.instance_selection_dialog import InstanceSelectionDialog
+from framework.key_discovery import MongoDBKeyDiscovery
 from framework.logging_handler import PythagoraZenLogger
 from framework.plugin_interface import PluginInterface
+from framework.rate_limiter import ZendeskRateLimiter
+from framework.schema_catalog import MongoDBSchemaCatalog, SchemaProfile
+from framework.sync_checkpoints import SyncCheckpointStore
+from pipelines.user_updates import PipelineOperations
 
 
 class Plugin(PluginInterface, QObject):
@@ -68,6 +78,149 @@ class Plugin(PluginInterface, QObject):
             return None
     """
 
+    def sync_endpoint(
+        self,
+        zendesk_subdomain,
+        zendesk_api_user_email_address,
+        zendesk_api_key,
+        endpoint_details,
+        schema_profiles,
+        scheduler,
+    ):
+        # Runs on a scheduler worker thread
+        if "incremental_export" in endpoint_details:
+            return self.sync_incremental_endpoint(
+                zendesk_subdomain,
+                zendesk_api_user_email_address,
+                zendesk_api_key,
+                endpoint_details,
+                schema_profiles,
+                scheduler,
+            )
+
+        paginator = ZendeskApiPaginator(
+            zendesk_subdomain,
+            zendesk_api_user_email_address,
+            zendesk_api_key,
+            endpoint_details["end_point"],
+        )
+        instance_operations = ZendeskInstanceDatabaseOperationsMongoDB(
+            zendesk_subdomain, endpoint_details["mongodb_collection"]
+        )
+        instance_operations.schema_profile = self.get_schema_profile(
+            schema_profiles, endpoint_details["mongodb_collection"]
+        )
+        try:
+            # Stream the endpoint page by page into the collection
+            return instance_operations.insert_collection_pages(
+                scheduler.iter_until_canceled(paginator.iter_pages())
+            )
+        finally:
+            # Close the connection after all operations are done
+            instance_operations.close_connection()
+
+    def sync_incremental_endpoint(
+        self,
+        zendesk_subdomain,
+        zendesk_api_user_email_address,
+        zendesk_api_key,
+        endpoint_details,
+        schema_profiles,
+        scheduler,
+    ):
+        # Only records changed since the stored checkpoint are fetched and upserted
+        collection_name = endpoint_details["mongodb_collection"]
+        checkpoint_store = SyncCheckpointStore(zendesk_subdomain)
+        instance_operations = ZendeskInstanceDatabaseOperationsMongoDB(
+            zendesk_subdomain, collection_name
+        )
+        instance_operations.schema_profile = self.get_schema_profile(
+            schema_profiles, collection_name
+        )
+        try:
+            checkpoint = checkpoint_store.get_checkpoint(collection_name)
+            logging.info(f"INCREMENTAL EXPORT ({collection_name}) FROM: {checkpoint}")
+            paginator = ZendeskIncrementalExportPaginator(
+                zendesk_subdomain,
+                zendesk_api_user_email_address,
+                zendesk_api_key,
+                endpoint_details["incremental_export"],
+                checkpoint,
+            )
+
+            upserted_documents = 0
+            for page in scheduler.iter_until_canceled(paginator.iter_pages()):
+                if page:
+                    instance_operations.upsert_collection_data(page)
+                    upserted_documents += len(page)
+                # Persist progress after every written page so a failed run resumes here
+                checkpoint_store.save_checkpoint(collection_name, paginator.checkpoint)
+
+            return upserted_documents
+        finally:
+            # Close the connection after all operations are done
+            instance_operations.close_connection()
+            checkpoint_store.close_connection()
+
+    def get_schema_profile(self, schema_profiles, collection_name):
+        # One profile per collection, shared by every endpoint writing to it and
+        # registered up front so pages written before a failure still reach the catalog
+        return schema_profiles.setdefault(collection_name, SchemaProfile())
+
+    def refresh_schema_catalog(
+        self, zendesk_subdomain, collection_names, schema_profiles
+    ):
+        # Once per collection, after every endpoint writing to it has finished
+        schema_catalog = MongoDBSchemaCatalog(zendesk_subdomain)
+        try:
+            for collection_name in sorted(collection_names):
+                try:
+                    schema_catalog.refresh_profile(
+                        collection_name, schema_profiles.get(collection_name)
+                    )
+                except Exception as e:
+                    # The catalog is a convenience, never fail the sync over it
+                    error_message = str(e)
+                    logging.error([f"error updating schema catalog: {error_message}"])
+        finally:
+            schema_catalog.close_connection()
+
+    def refresh_derived_collections(
+        self, zendesk_subdomain, synced_collections, schema_profiles, sync_started_at
+    ):
+        # Endpoints that failed part way still wrote (and profiled) their earlier pages
+        self.refresh_schema_catalog(
+            zendesk_subdomain,
+            synced_collections | set(schema_profiles),
+            schema_profiles,
+        )
+
+        # Cached key counts are stale once a collection has been synced
+        MongoDBKeyDiscovery.invalidate(
+            zendesk_subdomain,
+            synced_collections | {PipelineOperations.users_enriched_collection_name},
+        )
+
+        try:
+            # Indexes first, so the enriched-users lookups below can use them
+            index_manager = MongoDBIndexManager(zendesk_subdomain)
+            index_manager.ensure_indexes(synced_collections)
+            # Indexes created during this sync cannot have been used yet
+            index_manager.log_index_report(synced_collections, since=sync_started_at)
+        except Exception as e:
+            error_message = str(e)
+            logging.error([f"error managing indexes: {error_message}"])
+
+        if not synced_collections & PipelineOperations.users_enriched_source_collections:
+            return
+
+        try:
+            logging.info(f"REFRESHING USERS ENRICHED VIEW: {zendesk_subdomain}")
+            PipelineOperations(zendesk_subdomain).refresh_users_enriched()
+        except Exception as e:
+            error_message = str(e)
+            logging.error([f"error refreshing users enriched view: {error_message}"])
+
     def interact(self, plugin_window):
         instance_selection_dialog = InstanceSelectionDialog(
             self.main_app.database_operations
@@ -89,330 +242,380 @@ class Plugin(PluginInterface, QObject):
             logging.info(f"SUBDOMAIN: {zendesk_subdomain}")
             # self.instance_operations = ZendeskInstanceDatabaseOperationsMongoDB(zendesk_subdomain)
 
+            # Report API budget usage for this sync only
+            for incremental_exports in (False, True):
+                ZendeskRateLimiter.get_rate_limiter(
+                    zendesk_subdomain, incremental_exports
+                ).reset_budget_report()
+
+            # Both selections are made up front so the whole sync can run in the background
             endpoint_dialog = APIConfigEndpointSelectionDialog(zendesk_subdomain)
-            # Retrieve the selected endpoints
             selected_active_endpoint_names = (
                 endpoint_dialog.get_selected_active_endpoints_without_dependency_names_selection()
             )
             logging.info(f"Selected endpoints:\n{selected_active_endpoint_names}")
+            selected_dependency_endpoint_names = (
+                endpoint_dialog.get_selected_active_endpoints_with_dependency_names_selection()
+            )
+            logging.info(
+                f"Dependency Selected endpoints:\n{selected_dependency_endpoint_names}"
+            )
 
-            if len(selected_active_endpoint_names) == 1:
-                number_of_selected_endpoints = len(selected_active_endpoint_names)
-
-            if len(selected_active_endpoint_names) > 1:
-                number_of_selected_endpoints = len(selected_active_endpoint_names) + 1
-
-            empty_endpoints = []
-            endpoints_with_errors = []
-            populated_endpoints = 0
             # Set up the progress dialog
             progress_dialog = QProgressDialog(
                 "Populating Endpoints...",
                 "Cancel",
-                1,
-                len(selected_active_endpoint_names),
+                0,
+                100,
                 None,
             )
-            progress_dialog.setWindowTitle("Populating Endpoints Without Dependencies")
+            progress_dialog.setWindowTitle("Populating Endpoints")
             progress_dialog.setWindowModality(Qt.WindowModal)
 
             # Set up a progress bar inside the dialog
             progress_bar = QProgressBar(progress_dialog)
             progress_dialog.setBar(progress_bar)
+            self.sync_progress_dialog = progress_dialog
+
+            def update_progress(completed, total, message):
+                if total:
+                    progress_dialog.setValue(int((completed / total) * 100))
+                if message:
+                    progress_dialog.setLabelText(message)
+
+            def report_error(error_message):
+                logging.error([f"error: {error_message}"])
+
+            worker = self.submit_work(
+                self.run_sync,
+                zendesk_subdomain,
+                zendesk_api_user_email_address,
+                zendesk_api_key,
+                selected_active_endpoint_names,
+                selected_dependency_endpoint_names,
+                on_progress=update_progress,
+                on_result=self.finish_sync,
+                on_error=report_error,
+                on_finished=progress_dialog.close,
+            )
+            progress_dialog.canceled.connect(worker.cancel)
+            progress_dialog.show()
+
+    def run_sync(
+        self,
+        worker,
+        zendesk_subdomain,
+        zendesk_api_user_email_address,
+        zendesk_api_key,
+        selected_active_endpoint_names,
+        selected_dependency_endpoint_names,
+    ):
+        # Runs on a PluginWorker thread; the GUI only hears about it through signals
+        sync_summary = {
+            "zendesk_subdomain": zendesk_subdomain,
+            "started_at": datetime.now(timezone.utc),
+            "number_of_selected_endpoints": len(selected_active_endpoint_names)
+            + len(selected_dependency_endpoint_names),
+            "populated_endpoints": 0,
+            "empty_endpoints": [],
+            "endpoints_with_errors": [],
+            # Stopped by the user before their last page; not counted as populated
+            "canceled_endpoints": [],
+            # Collections written during this sync, used to refresh derived views
+            "synced_collections": set(),
+            # {collection: SchemaProfile} of the changes written during this sync
+            "schema_profiles": {},
+        }
+
+        self.sync_independent_endpoints(
+            worker,
+            zendesk_subdomain,
+            zendesk_api_user_email_address,
+            zendesk_api_key,
+            selected_active_endpoint_names,
+            sync_summary,
+        )
+        if not worker.is_canceled():
+            self.sync_dependency_endpoints(
+                worker,
+                zendesk_subdomain,
+                zendesk_api_user_email_address,
+                zendesk_api_key,
+                selected_dependency_endpoint_names,
+                sync_summary,
+            )
 
-            # Run the API requests in a loop
-            for i, selected_active_endpoint_name in enumerate(
-                selected_active_endpoint_names, start=1
+        worker.report_progress(0, 0, "Refreshing indexes and derived collections...")
+        self.refresh_derived_collections(
+            zendesk_subdomain,
+            sync_summary["synced_collections"],
+            sync_summary["schema_profiles"],
+            sync_summary["started_at"],
+        )
+        return sync_summary
+
+    def sync_independent_endpoints(
+        self,
+        worker,
+        zendesk_subdomain,
+        zendesk_api_user_email_address,
+        zendesk_api_key,
+        selected_active_endpoint_names,
+        sync_summary,
+    ):
+        # Independent endpoints are fetched and inserted in parallel
+        endpoint_jobs = {}
+        for selected_active_endpoint_name in selected_active_endpoint_names:
+            selected_active_endpoint_name_details = (
+                self.config_manager.get_endpoint_details_by_name(
+                    selected_active_endpoint_name
+                )
+            )
+            if (
+                "end_point_dependencies" not in selected_active_endpoint_name_details
+                and "mongodb_collection" in selected_active_endpoint_name_details
             ):
-                selected_active_endpoint_name_details = (
-                    self.config_manager.get_endpoint_details_by_name(
-                        selected_active_endpoint_name
-                    )
+                endpoint_jobs[selected_active_endpoint_name] = partial(
+                    self.sync_endpoint,
+                    zendesk_subdomain,
+                    zendesk_api_user_email_address,
+                    zendesk_api_key,
+                    selected_active_endpoint_name_details,
+                    sync_summary["schema_profiles"],
                 )
-                if (
-                    "end_point_dependencies"
-                    not in selected_active_endpoint_name_details
-                ):
-                    if "mongodb_collection" in selected_active_endpoint_name_details:
-                        end_point = selected_active_endpoint_name_details["end_point"]
-
-                        # Update progress bar and status
-                        # progress_dialog.setValue(i)
-                        progress_percentage = int(
-                            (i / number_of_selected_endpoints) * 100
-                        )
-                        progress_dialog.setValue(progress_percentage)
-                        # progress_dialog.setLabelText(f"Working on endpoint {i} of {number_of_selected_endpoints}")
-                        progress_dialog.setLabelText(
-                            f"Working on endpoint {i} of {number_of_selected_endpoints}\nEndpoint: {selected_active_endpoint_name:<50}"
-                        )
 
-                        try:
-                            paginator = ZendeskApiPaginator(
-                                zendesk_subdomain,
-                                zendesk_api_user_email_address,
-                                zendesk_api_key,
-                                end_point,
-                            )
-                            data = paginator.fetch_all_data()
-                            if data:
-                                self.instance_operations = (
-                                    ZendeskInstanceDatabaseOperationsMongoDB(
-                                        zendesk_subdomain,
-                                        selected_active_endpoint_name_details[
-                                            "mongodb_collection"
-                                        ],
-                                    )
-                                )
-                                try:
-                                    self.instance_operations.insert_collection_data(
-                                        data
-                                    )
-                                    populated_endpoints += 1
-                                except Exception as e:
-                                    error_message = str(e)
-                                    logging.error(
-                                        [
-                                            f"error inserting collection data: {error_message}"
-                                        ]
-                                    )
-                                finally:
-                                    # Close the connection after all operations are done
-                                    self.instance_operations.close_connection()
-                            else:
-                                empty_endpoints.append(selected_active_endpoint_name)
-                        except Exception as e:
-                            error_message = str(e)
-                            error_dict = {
-                                "name": selected_active_endpoint_name,
-                                "error": error_message,
-                            }
-                            endpoints_with_errors.append(error_dict)
-                            logging.error([f"error: {error_message}"])
-
-                        # Check if the user pressed "Cancel"
-                        if progress_dialog.wasCanceled():
-                            break
-
-            # Close the progress dialog when the loop is complete
-            progress_dialog.close()
-
-            ##################################################################################################
-            # THE BELOW CODE IS FOR POPULATING DEPENDENCIES
-            ##################################################################################################
-            """            
-            self.selected_instance = instance_selection_dialog.selected_instance
-            zendesk_subdomain, zendesk_api_user_email_address, zendesk_api_key = instance_selection_dialog.selected_instance
-            # Create ZendeskInstanceDatabaseOperations for the selected instance
-            self.filename()
-            print(f"INSTANCE: {self.selected_instance}") # THIE LINE WILL CONTAIN SENSITIVE INFORMATION
-            print(f"SUBDOMAIN: {zendesk_subdomain}")
-            #self.instance_operations = ZendeskInstanceDatabaseOperationsMongoDB(zendesk_subdomain)
+        def update_progress(completed_endpoints, total_endpoints, endpoint_name):
+            if endpoint_name:
+                worker.report_progress(
+                    completed_endpoints,
+                    total_endpoints,
+                    f"Completed endpoint {completed_endpoints} of {total_endpoints}\nEndpoint: {endpoint_name:<50}",
+                )
 
-            endpoint_dialog = APIConfigEndpointSelectionDialog(zendesk_subdomain)
-            """
+        scheduler = EndpointSyncScheduler()
+        endpoint_results = scheduler.run(
+            endpoint_jobs,
+            progress_callback=update_progress,
+            cancel_check=worker.is_canceled,
+        )
 
-            # self.filename()
-            # Retrieve the selected endpoints
-            selected_active_endpoint_names = (
-                endpoint_dialog.get_selected_active_endpoints_with_dependency_names_selection()
+        for (
+            selected_active_endpoint_name,
+            endpoint_result,
+        ) in endpoint_results.items():
+            collection_name = self.config_manager.get_endpoint_details_by_name(
+                selected_active_endpoint_name
+            )["mongodb_collection"]
+            if endpoint_result["error"]:
+                sync_summary["endpoints_with_errors"].append(
+                    {
+                        "name": selected_active_endpoint_name,
+                        "error": endpoint_result["error"],
+                    }
+                )
+            elif endpoint_result["canceled"]:
+                sync_summary["canceled_endpoints"].append(selected_active_endpoint_name)
+                # Pages written before the cancel still need the derived refresh
+                if endpoint_result["result"]:
+                    sync_summary["synced_collections"].add(collection_name)
+            elif endpoint_result["result"]:
+                sync_summary["populated_endpoints"] += 1
+                sync_summary["synced_collections"].add(collection_name)
+            else:
+                sync_summary["empty_endpoints"].append(selected_active_endpoint_name)
+
+    def sync_dependency_endpoints(
+        self,
+        worker,
+        zendesk_subdomain,
+        zendesk_api_user_email_address,
+        zendesk_api_key,
+        selected_active_endpoint_names,
+        sync_summary,
+    ):
+        number_of_selected_endpoints = len(selected_active_endpoint_names)
+
+        # Run the API requests in a loop
+        for current_endpoint_count, selected_active_endpoint_name in enumerate(
+            selected_active_endpoint_names, start=1
+        ):
+            selected_active_endpoint_name_details = (
+                self.config_manager.get_endpoint_details_by_name(
+                    selected_active_endpoint_name
+                )
             )
+            if (
+                "end_point_dependencies" not in selected_active_endpoint_name_details
+                or "mongodb_collection" not in selected_active_endpoint_name_details
+            ):
+                continue
+
+            end_point = selected_active_endpoint_name_details["end_point"]
+            logging.info(f"DEPENDENCY ENDPOINT: {end_point}")
+            endpoint_dependency_lookup_collection = (
+                selected_active_endpoint_name_details["end_point_dependencies"][
+                    "mongodb_dependency_collection"
+                ]
+            )
+            endpoint_dependency_loopup_key = selected_active_endpoint_name_details[
+                "end_point_dependencies"
+            ]["mongodb_dependency_collection_key"]
             logging.info(
-                f"Dependency Selected endpoints:\n{selected_active_endpoint_names}"
+                f"ENDPOINT DEPENDENCY LOOKUP COLLECTION: {endpoint_dependency_lookup_collection}"
             )
 
-            if len(selected_active_endpoint_names) == 1:
-                number_of_selected_endpoints = len(selected_active_endpoint_names)
+            progress_message = f"Working on endpoint {current_endpoint_count} of {number_of_selected_endpoints}\nEndpoint: {selected_active_endpoint_name:<50}"
+            worker.report_progress(0, 0, progress_message)
 
-            if len(selected_active_endpoint_names) > 1:
-                number_of_selected_endpoints = len(selected_active_endpoint_names) + 1
+            dependency_instance_operations = None
+            instance_operations = None
+            try:
+                dependency_instance_operations = (
+                    ZendeskInstanceDatabaseOperationsMongoDB(
+                        zendesk_subdomain,
+                        endpoint_dependency_lookup_collection,
+                    )
+                )
+                instance_operations = ZendeskInstanceDatabaseOperationsMongoDB(
+                    zendesk_subdomain,
+                    selected_active_endpoint_name_details["mongodb_collection"],
+                )
+                instance_operations.schema_profile = self.get_schema_profile(
+                    sync_summary["schema_profiles"],
+                    selected_active_endpoint_name_details["mongodb_collection"],
+                )
+                # Stream the parent ids from a cursor instead of loading them all
+                results = dependency_instance_operations.query_collection_cursor(
+                    {}, {f"{endpoint_dependency_loopup_key}": 1, "_id": 0}
+                )
+                parent_ids = (
+                    parent_id
+                    for parent_id in (
+                        next(iter(result.values()), None) for result in results
+                    )
+                    if parent_id is not None
+                )
+                total_parent_ids = (
+                    dependency_instance_operations.collection.estimated_document_count()
+                )
 
-            empty_endpoints = []
-            endpoints_with_errors = []
-            populated_endpoints = 0
-            # Set up the progress dialog
-            progress_dialog = QProgressDialog(
-                "Populating Dependency Endpoints...",
-                "Cancel",
-                1,
-                len(selected_active_endpoint_names),
-                None,
-            )
-            progress_dialog.setWindowTitle("Populating Endpoints With Dependencies")
-            progress_dialog.setWindowModality(Qt.WindowModal)
+                def update_dependency_progress(processed_parent_ids, total_parent_ids):
+                    worker.report_progress(
+                        processed_parent_ids, total_parent_ids, progress_message
+                    )
 
-            # Set up a progress bar inside the dialog
-            progress_bar = QProgressBar(progress_dialog)
-            progress_dialog.setBar(progress_bar)
+                # Parent ids are fetched concurrently and inserted in batches
+                fan_out_executor = DependencyFanOutExecutor(
+                    zendesk_subdomain,
+                    zendesk_api_user_email_address,
+                    zendesk_api_key,
+                )
+                fan_out_result = fan_out_executor.run(
+                    end_point,
+                    parent_ids,
+                    instance_operations,
+                    total_parent_ids=total_parent_ids,
+                    progress_callback=update_dependency_progress,
+                    cancel_check=worker.is_canceled,
+                )
 
-            # Run the API requests in a loop
-            for current_endpoint_count, selected_active_endpoint_name in enumerate(
-                selected_active_endpoint_names, start=1
-            ):
-                # for selected_active_endpoint_name in selected_active_endpoint_names:
-                selected_active_endpoint_name_details = (
-                    self.config_manager.get_endpoint_details_by_name(
+                for parent_error in fan_out_result["errors"]:
+                    sync_summary["endpoints_with_errors"].append(
+                        {
+                            "name": selected_active_endpoint_name,
+                            "error": parent_error["error"],
+                        }
+                    )
+                if fan_out_executor.cancel_event.is_set():
+                    sync_summary["canceled_endpoints"].append(
                         selected_active_endpoint_name
                     )
-                )
-                if "end_point_dependencies" in selected_active_endpoint_name_details:
-                    if "mongodb_collection" in selected_active_endpoint_name_details:
-                        end_point = selected_active_endpoint_name_details["end_point"]
-                        # self.filename()
-                        logging.info(f"DEPENDENCY ENDPOINT: {end_point}")
-                        endpoint_dependency_lookup_collection = (
-                            selected_active_endpoint_name_details[
-                                "end_point_dependencies"
-                            ]["mongodb_dependency_collection"]
-                        )
-                        endpoint_dependency_loopup_key = (
-                            selected_active_endpoint_name_details[
-                                "end_point_dependencies"
-                            ]["mongodb_dependency_collection_key"]
-                        )
-                        logging.info(
-                            f"ENDPOINT DEPENDENCY LOOKUP COLLECTION: {endpoint_dependency_lookup_collection}"
-                        )
-
-                        progress_dialog.setLabelText(
-                            f"Working on endpoint {current_endpoint_count} of {number_of_selected_endpoints}\nEndpoint: {selected_active_endpoint_name:<50}"
+                    if fan_out_result["inserted_documents"]:
+                        sync_summary["synced_collections"].add(
+                            selected_active_endpoint_name_details["mongodb_collection"]
                         )
+                elif fan_out_result["inserted_documents"]:
+                    sync_summary["populated_endpoints"] += 1
+                    sync_summary["synced_collections"].add(
+                        selected_active_endpoint_name_details["mongodb_collection"]
+                    )
+                else:
+                    sync_summary["empty_endpoints"].append(
+                        selected_active_endpoint_name
+                    )
 
-                        try:
-                            self.instance_operations = (
-                                ZendeskInstanceDatabaseOperationsMongoDB(
-                                    zendesk_subdomain,
-                                    endpoint_dependency_lookup_collection,
-                                )
-                            )
-                            # self.filename()
-                            # print(f"\nDEPENDENCY ID COLLECTION: {self.instance_operations}\n")
-                            # Execute the query to find all documents with the specified key
-                            results = self.instance_operations.query_collection(
-                                {}, {f"{endpoint_dependency_loopup_key}": 1, "_id": 0}
-                            )
-                            # print(f"RESULTS:\n{results}")
-                            pattern = r"\{.*?\}"
-                            if results:
-                                endpoint_dependency_mongodb_collection = (
-                                    selected_active_endpoint_name_details[
-                                        "mongodb_collection"
-                                    ]
-                                )
-                                logging.info("RESULTS OBTAINED!")
-                                logging.info(
-                                    f"DEPENDENCY MONGODB COLLECTION:  {endpoint_dependency_mongodb_collection}"
-                                )
-                                self.instance_operations = (
-                                    ZendeskInstanceDatabaseOperationsMongoDB(
-                                        zendesk_subdomain,
-                                        endpoint_dependency_mongodb_collection,
-                                    )
-                                )
-                                # print(f"\nDEPENDENCY COLLECTION: {self.instance_operations}\n")
-                                # for result in results:
-                                for i, result in enumerate(results, start=1):
-                                    progress_percentage = int((i / len(results)) * 100)
-                                    progress_dialog.setValue(progress_percentage)
-
-                                    logging.info(f"RESULT:\n{result}")
-                                    dependency_endpoint = re.sub(
-                                        pattern,
-                                        str(next(iter(result.values()), None)),
-                                        end_point,
-                                    )
-                                    logging.info(
-                                        f"UPDATED DEPENDENCY ENDPOINT: {dependency_endpoint}"
-                                    )
-                                    try:
-                                        paginator = ZendeskApiPaginator(
-                                            zendesk_subdomain,
-                                            zendesk_api_user_email_address,
-                                            zendesk_api_key,
-                                            dependency_endpoint,
-                                        )
-                                        data = paginator.fetch_all_data()
-                                        # logging.debug(f"\n{json.dumps(data, indent=4)}")
-
-                                        try:
-                                            self.instance_operations.insert_collection_data(
-                                                data
-                                            )
-                                            populated_endpoints += 1
-                                        except Exception as e:
-                                            error_message = str(e)
-                                            logging.error(
-                                                [
-                                                    f"error inserting collection data: {error_message}"
-                                                ]
-                                            )
-
-                                        # Check if the user pressed "Cancel"
-                                        if progress_dialog.wasCanceled():
-                                            break
-
-                                    except Exception as e:
-                                        error_message = str(e)
-                                        error_dict = {
-                                            "name": selected_active_endpoint_name,
-                                            "error": error_message,
-                                        }
-                                        endpoints_with_errors.append(error_dict)
-                                        logging.error([f"error: {error_message}"])
-
-                        except Exception as e:
-                            error_message = str(e)
-                            error_dict = {
-                                "name": selected_active_endpoint_name,
-                                "error": error_message,
-                            }
-                            endpoints_with_errors.append(error_dict)
-                            logging.error([f"error: {error_message}"])
-
-                        finally:
-                            # Close the connection after all operations are done
-                            self.instance_operations.close_connection()
-
-            # Close the progress dialog when the loop is complete
-            progress_dialog.close()
+            except Exception as e:
+                error_message = str(e)
+                error_dict = {
+                    "name": selected_active_endpoint_name,
+                    "error": error_message,
+                }
+                sync_summary["endpoints_with_errors"].append(error_dict)
+                logging.error([f"error: {error_message}"])
+
+            finally:
+                # Close the connection after all operations are done
+                if dependency_instance_operations:
+                    dependency_instance_operations.close_connection()
+                if instance_operations:
+                    instance_operations.close_connection()
+
+            # Check if the user pressed "Cancel"
+            if worker.is_canceled():
+                break
+
+    def finish_sync(self, sync_summary):
+        # Back on the GUI thread once the worker is done
+        empty_endpoints = sync_summary["empty_endpoints"]
+        endpoints_with_errors = sync_summary["endpoints_with_errors"]
+
+        logging.info(
+            f"\nNUMBER OF ACTIVE ENDPOINTS: {self.config_manager.get_number_of_active_endpoints()}"
+        )
+        logging.info(
+            f"NUMBER OF ACTIVE MONGODB COLLECTIONS: {self.config_manager.get_number_of_active_mongodb_collections()}"
+        )
+        logging.info(
+            f"NUMBER OF SELECTED ENDPOINTS: {sync_summary['number_of_selected_endpoints']}"
+        )
+        logging.info(
+            f"NUMBER OF ENDPOINTS WITH DEPENDENCIES: {self.config_manager.get_number_of_active_endpoint_with_dependency_names()}"
+        )
+        logging.info(
+            f"NUMBER OF ENDPOINTS WITH DEPENDENCIES AND MONGODB COLLECTIONS: {self.config_manager.get_number_of_active_endpoint_with_dependency_and_mongodb_collection_names()}"
+        )
+        logging.info(
+            f"NUMBER OF POPULATED MONGODB COLLECTIONS: {sync_summary['populated_endpoints']}"
+        )
 
-            logging.info(
-                f"\nNUMBER OF ACTIVE ENDPOINTS: {self.config_manager.get_number_of_active_endpoints()}"
+        if len(endpoints_with_errors) > 0:
+            logging.error(
+                f"NUMBER OF ENDPOINTS WITH ERRORS: {len(endpoints_with_errors)}"
             )
-            logging.info(
-                f"NUMBER OF ACTIVE MONGODB COLLECTIONS: {self.config_manager.get_number_of_active_mongodb_collections()}"
-            )
-            logging.info(
-                f"NUMBER OF SELECTED ENDPOINTS: {number_of_selected_endpoints}"
-            )
-            logging.info(
-                f"NUMBER OF ENDPOINTS WITH DEPENDENCIES: {self.config_manager.get_number_of_active_endpoint_with_dependency_names()}"
+            logging.error(
+                f"ENDPOINTS WITH ERRORS:\n{json.dumps(endpoints_with_errors, indent=4)}"
             )
+        else:
             logging.info(
-                f"NUMBER OF ENDPOINTS WITH DEPENDENCIES AND MONGODB COLLECTIONS: {self.config_manager.get_number_of_active_endpoint_with_dependency_and_mongodb_collection_names()}"
+                f"NUMBER OF ENDPOINTS WITH ERRORS: {len(endpoints_with_errors)}"
             )
             logging.info(
-                f"NUMBER OF POPULATED MONGODB COLLECTIONS: {populated_endpoints}"
+                f"ENDPOINTS WITH ERRORS:\n{json.dumps(endpoints_with_errors, indent=4)}"
             )
 
-            if len(endpoints_with_errors) > 0:
-                logging.error(
-                    f"NUMBER OF ENDPOINTS WITH ERRORS: {len(endpoints_with_errors)}"
-                )
-                logging.error(
-                    f"ENDPOINTS WITH ERRORS:\n{json.dumps(endpoints_with_errors, indent=4)}"
-                )
-            else:
-                logging.info(
-                    f"NUMBER OF ENDPOINTS WITH ERRORS: {len(endpoints_with_errors)}"
-                )
-                logging.info(
-                    f"ENDPOINTS WITH ERRORS:\n{json.dumps(endpoints_with_errors, indent=4)}"
-                )
+        for incremental_exports in (False, True):
+            ZendeskRateLimiter.get_rate_limiter(
+                sync_summary["zendesk_subdomain"], incremental_exports
+            ).log_budget_report()
 
-            if len(empty_endpoints) > 0:
-                logging.warning(f"EMPTY ENDPOINTS ({len(empty_endpoints)}):\n")
-                logging.warning("\n".join(empty_endpoints))
-            else:
-                logging.info(f"EMPTY ENDPOINTS ({len(empty_endpoints)}):\n")
-                logging.info("\n".join(empty_endpoints))
+        canceled_endpoints = sync_summary["canceled_endpoints"]
+        if canceled_endpoints:
+            logging.warning(f"CANCELED ENDPOINTS ({len(canceled_endpoints)}):\n")
+            logging.warning("\n".join(canceled_endpoints))
+
+        if len(empty_endpoints) > 0:
+            logging.warning(f"EMPTY ENDPOINTS ({len(empty_endpoints)}):\n")
+            logging.warning("\n".join(empty_endpoints))
+        else:
+            logging.info(f"EMPTY ENDPOINTS ({len(empty_endpoints)}):\n")
+            logging.info("\n".join(empty_endpoints))
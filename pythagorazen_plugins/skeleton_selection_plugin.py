@@ -1,6 +1,7 @@
 import inspect
 import json
 import logging
+from functools import partial
 
 from PyQt5.QtCore import QObject, pyqtSignal
 from PyQt5.QtWidgets import QDialog
@@ -15,6 +16,8 @@ from framework.mongodb_collection_selection_dialog import (
     MongoDBCollectionSelectionDialog,
 )
 from framework.plugin_interface import PluginInterface
+from framework.schema_catalog import MongoDBSchemaCatalog
+from framework.schema_inference import MongoDBSchemaInference
 from framework.skeleton_tree_view_and_selection import SkeletonTreeViewAndSelection
 
 
@@ -34,6 +37,8 @@ class Plugin(PluginInterface, QObject):
         self.show_window = False
         self.skeleton_window = None
         self.skeleton_instance = SkeletonTreeViewAndSelection
+        self.schema_catalog = None
+        self.schema_inference = None
 
     def use_databases(self, selected_instance: InstanceSelectionDialog):
         logging.debug(f"{inspect.currentframe().f_code.co_name}")
@@ -56,132 +61,17 @@ class Plugin(PluginInterface, QObject):
         # Return True if a plugin window is required, False otherwise
         return True
 
-    def get_populated_value(self, field_name):
-        logging.debug(f"{inspect.currentframe().f_code.co_name}")
-        logging.debug(f"FIELD NAME: {field_name}")
-        logging.debug(
-            f"COLLECTION: {self.selected_collection.db.name}.{self.selected_collection.collection.name}"
-        )
-
-        if not isinstance(field_name, str):
-            logging.error("field_name must be a string")
-            logging.error(f"PASSED FIELD: {field_name}")
-
-        if not hasattr(self.selected_collection, "find_one") or not callable(
-            getattr(self.selected_collection, "find_one")
-        ):
-            logging.error("collection must be a valid MongoDB collection")
-            logging.error(f"PASSED COLLECTION: {self.selected_collection}")
-
-        query = {field_name: {"$exists": True, "$ne": []}}
-        result = self.selected_collection.find_one(query, {field_name: 1, "_id": 0})
-
-        if result:
-            return result.get(field_name)
-
-        logging.warning(f"No documents found with the field '{field_name}'")
-        return None
-
-    def create_skeleton(self, data):
+    def create_skeleton(self, selected_collection_name):
         logging.debug(f"{inspect.currentframe().f_code.co_name}")
         logging.info("create_skeleton method called")
         logging.debug(f"collection: {self.selected_collection}")
-        skeleton = {}
-
-        # Iterate through documents
-        for document in self.selected_collection.find():
-            self.process_document(document, skeleton)
-
-        # Sort root keys
-        sorted_keys = sorted(skeleton.keys())
-
-        # Create a new dictionary with sorted keys
-        sorted_dict = {key: skeleton[key] for key in sorted_keys}
-
-        # return skeleton
-        return sorted_dict
-
-    def extract_first_items(self, d):
-        logging.debug(f"{inspect.currentframe().f_code.co_name}")
-        new_dict = {}
-        for key, value in d.items():
-            if isinstance(value, list) and value:
-                new_dict[key] = [value[0]]
-            elif isinstance(value, dict):
-                new_dict[key] = self.extract_first_items(value)
-            else:
-                new_dict[key] = value
-        return new_dict
-
-    def process_document(self, document, skeleton, depth=0):
-        logging.debug(f"{inspect.currentframe().f_code.co_name}")
-        for key, value in document.items():
-
-            if (
-                not isinstance(value, dict)
-                and not isinstance(value, list)
-                and depth == 0
-                and key not in skeleton
-            ):
-                logging.debug(f"1 KEY: {key}\tDEPTH: {depth}")
-                if not value:
-                    logging.debug(
-                        f"1 KEY: {key}\tVALUE: {value}\t\tFINDING POPULATED VALUE..."
-                    )
-                    populated_value = self.get_populated_value(key)
-                    # print(f"\nD: {depth} K: {key} V: {json.dumps(populated_value, default=str, indent=4)}\n")
-                    skeleton[key] = populated_value
-                else:
-                    skeleton[key] = value
-
-                self.process_document(document, skeleton, depth + 1)
-                # skeleton[key] = value
-                # print(f"\nD: {depth} K: {key} V: {value}\n")
-                # process_document(document, skeleton, collection, depth + 1)
-
-            if isinstance(value, dict) and key not in skeleton and depth == 0:
-                logging.debug(f"2 KEY: {key}\tDEPTH: {depth}")
-                if not value:
-                    logging.debug(
-                        f"2 KEY: {key}\tVALUE: {value}\t\tFINDING POPULATED VALUE..."
-                    )
-                    populated_value = self.get_populated_value(key)
-                    # print(f"\nD: {depth} K: {key} V: {json.dumps(populated_value, default=str, indent=4)}\n")
-                    skeleton[key] = populated_value
-                else:
-                    logging.debug(f"\nD: {depth} K: {key} V: {value}\n")
-                    skeleton[key] = value
-
-                self.process_document(document, skeleton, depth + 1)
-                # skeleton[key] = value
-                # print(f"\nD: {depth} K: {key} V: {value}\n")
-                # process_document(document, skeleton, collection, depth + 1)
-
-            # if isinstance(value, list) and depth == 0 and key not in skeleton:
-            if isinstance(value, list) and key not in skeleton:
-                if not value:
-                    logging.debug(f"3 KEY: {key}\tDEPTH: {depth}")
-                    populated_value = self.get_populated_value(key)
-                    # print(f"\nD: {depth} K: {key} V: {json.dumps(populated_value, default=str, indent=4)}\n")
-                    skeleton[key] = populated_value
-                    self.process_document(document, skeleton, depth + 1)
-                else:
-                    logging.debug(f"4 KEY: {key}\tDEPTH: {depth}")
-                    if isinstance(value, list) and list:
-                        # print(f"5 KEY {key}")
-                        # print(f"{key} VALUE[0]:\n{json.dumps(value[0], default=str, indent=4)}")
-                        if isinstance(value[0], dict):
-                            logging.debug(f"6 KEY {key}")
-                            skeleton[key] = self.extract_first_items(value[0])
-                        else:
-                            logging.debug(f"7 KEY {key}")
-                            skeleton[key] = value
-                    if isinstance(value, list) and not list:
-                        logging.debug(f"8 KEY {key}")
-                        populated_value = self.get_populated_value(key)
-                        skeleton[key] = populated_value
-
-                    self.process_document(document, skeleton, depth + 1)
+        # The schema catalog written at sync time, inferred from the data otherwise
+        skeleton = self.schema_catalog.get_skeleton(selected_collection_name)
+        if skeleton is not None:
+            logging.info(f"SKELETON FROM SCHEMA CATALOG: {selected_collection_name}")
+            return skeleton
+        # One document pass plus one batched lookup for keys without examples
+        return self.schema_inference.infer_skeleton(selected_collection_name)
 
     def interact(self, plugin_window):
         logging.debug(f"{inspect.currentframe().f_code.co_name}")
@@ -223,44 +113,22 @@ class Plugin(PluginInterface, QObject):
                     logging.info(f"DATABASE:\n{self.instance_operations.db}")
                     logging.info(f"Selected Collection: {self.selected_collection}")
 
-                    # Call the appropriate method to fetch the data from MongoDB
-                    # Modify this according to how your data is fetched in your actual code
-                    data = self.selected_collection.find()
-
                     # Create and show the SkeletonTreeViewAndSelection window
-                    result_skeleton = self.create_skeleton(data)
-                    logging.debug(
-                        f"RESULT SKELETON:\n{json.dumps(result_skeleton, default=str, indent=4)}"
-                    )
-                    logging.debug(
-                        f"self.selected_collection: {self.selected_collection}"
-                    )
-                    self.skeleton_window = SkeletonTreeViewAndSelection(
-                        result_skeleton, selected_collection_name, zendesk_subdomain
-                    )
-                    logging.debug("After skeleton_window")
-
-                    # Initialize result_skeleton before the try block
-                    # result_skeleton = None # Setting this to None throws an error
-
-                    # Show the SkeletonTreeViewAndSelection window
-                    try:
-                        # content, api_response, zendesk_subdomain, selected_collection, show_table_button, show_api_button, skeleton_data, skeleton_window_title
-                        self.update_content_signal.emit(
-                            {},
-                            [],
+                    self.schema_catalog = MongoDBSchemaCatalog(zendesk_subdomain)
+                    self.schema_inference = MongoDBSchemaInference(zendesk_subdomain)
+                    # The skeleton reads MongoDB, so it is built off the GUI thread
+                    self.submit_work(
+                        self.build_skeleton,
+                        selected_collection_name,
+                        on_result=partial(
+                            self.show_skeleton,
                             zendesk_subdomain,
                             selected_collection_name,
-                            True,
-                            True,
-                            result_skeleton,
-                        )
-                    except Exception as e:
-                        # Handle the exception (you can customize this part based on your needs)
-                        logging.error(f"An error occurred: {e}")
-
-                    self.skeleton_window.show()
-                    logging.debug("After skeleton_window.show()")
+                        ),
+                        on_error=lambda error_message: logging.error(
+                            f"An unexpected error occurred: {error_message}"
+                        ),
+                    )
 
             except Exception as generic_exception:
                 # Handle any other exceptions
@@ -271,3 +139,45 @@ class Plugin(PluginInterface, QObject):
                 logging.info(
                     "Finally block: Cleaning up resources or finalizing actions"
                 )
+
+    def build_skeleton(self, worker, selected_collection_name):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        result_skeleton = self.create_skeleton(selected_collection_name)
+        field_summaries = self.schema_catalog.get_field_summaries(
+            selected_collection_name
+        )
+        return result_skeleton, field_summaries
+
+    def show_skeleton(self, zendesk_subdomain, selected_collection_name, skeleton_result):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        result_skeleton, field_summaries = skeleton_result
+        logging.debug(
+            f"RESULT SKELETON:\n{json.dumps(result_skeleton, default=str, indent=4)}"
+        )
+        logging.debug(f"self.selected_collection: {self.selected_collection}")
+        self.skeleton_window = SkeletonTreeViewAndSelection(
+            result_skeleton,
+            selected_collection_name,
+            zendesk_subdomain,
+            field_summaries,
+        )
+        logging.debug("After skeleton_window")
+
+        # Show the SkeletonTreeViewAndSelection window
+        try:
+            # content, api_response, zendesk_subdomain, selected_collection, show_table_button, show_api_button, skeleton_data, skeleton_window_title
+            self.update_content_signal.emit(
+                {},
+                [],
+                zendesk_subdomain,
+                selected_collection_name,
+                True,
+                True,
+                result_skeleton,
+            )
+        except Exception as e:
+            # Handle the exception (you can customize this part based on your needs)
+            logging.error(f"An error occurred: {e}")
+
+        self.skeleton_window.show()
+        logging.debug("After skeleton_window.show()")
@@ -2,6 +2,7 @@ import inspect
 
 # Update the Plugin class in your plugin file
 import logging
+from functools import partial
 
 from PyQt5.QtCore import QObject, pyqtSignal
 from PyQt5.QtWidgets import QDialog
@@ -10,12 +11,14 @@ from framework.instance_database_operations_api_endpoint_config import (
     ZendeskInstanceDatabaseOperationsMongoDB,
 )
 from framework.instance_selection_dialog import InstanceSelectionDialog
+from framework.key_discovery import MongoDBKeyDiscovery
 from framework.key_selection_dialog import KeySelectionDialog
 from framework.logging_handler import PythagoraZenLogger
 from framework.mongodb_collection_selection_dialog import (
     MongoDBCollectionSelectionDialog,
 )
 from framework.plugin_interface import PluginInterface
+from framework.schema_catalog import MongoDBSchemaCatalog
 from pipelines.user_updates import PipelineOperations
 
 
@@ -91,95 +94,122 @@ class Plugin(PluginInterface, QObject):
                         zendesk_subdomain, selected_collection
                     )
                     logging.info(f"DATABASE:\n{self.instance_operations.db}")
-                    # data = self.instance_operations.query_collection()
-                    data = self.instance_operations.query_collection({}, projection={})
 
-                    all_keys = {
-                        key for item in data for key in item.keys() if key != "_id"
-                    }
-
-                    # self.filename()
-                    logging.info(f"ALL KEYS IS TYPE: {type(all_keys)}")
-                    logging.info(f"ALL KEYS:\n{all_keys}")
-
-                    key_selection_dialog = KeySelectionDialog(
-                        all_keys, zendesk_subdomain, selected_collection
-                    )
-                    result = key_selection_dialog.exec_()
-
-                    if result == QDialog.Accepted:
-                        """
-                        # Now plugin_instance is defined
-                        plugin_instance = Plugin(self.main_app)
-                        # Pass plugin_name when creating the PluginWindow instance
-                        plugin_window = PluginWindow(self, plugin_instance.plugin_name)
-                        plugin_window.show()
-                        """
-                        selected_keys = key_selection_dialog.selected_keys
-
-                        # Filter the data based on selected keys
-                        filtered_ticket_fields = []
-
-                        for ticket_field in data:
-                            # Create a new dictionary for each ticket field including only selected keys
-                            filtered_ticket_fields.append(
-                                {
-                                    key: ticket_field[key]
-                                    for key in selected_keys
-                                    if key in ticket_field
-                                }
-                            )
-
-                    # Check if the selected collection is "users"
-                    if (
-                        selected_collection == "users"
-                        and "organization_id" in selected_keys
-                    ):
-                        # self.filename()
-                        logging.info("USER PIPELINE CONDITION MET")
-                        logging.info(f"ZENDESK SUBDOMAIN: {zendesk_subdomain}")
-                        pipeline_operations = PipelineOperations(zendesk_subdomain)
-                        # Use the modified user data from the pipeline
-                        modified_users = pipeline_operations.update_user_data()
-                        # Update the table view using the modified data
-                        # self.filename()
-                        # print(f"MODIFIED USERS:\n{json.dumps(modified_users, default=str, indent=4)}")
-
-                        self.update_content_signal.emit(
-                            modified_users,
-                            list(data),
+                    # Key discovery reads MongoDB, so it runs off the GUI thread
+                    self.submit_work(
+                        self.discover_keys,
+                        zendesk_subdomain,
+                        selected_collection,
+                        on_result=partial(
+                            self.select_keys,
+                            plugin_window,
                             zendesk_subdomain,
                             selected_collection,
-                            True,
-                            True,
-                            {},
-                        )
-                        if self.show_window:
-                            plugin_window.show()
-                    else:
-                        # For other collections, update the table view with the original data
-                        # self.filename()
-                        # print(f"filtered_ticket_fields:\n{json.dumps(list(filtered_ticket_fields), default=str, indent=4)}")
-                        self.update_content_signal.emit(
-                            list(filtered_ticket_fields),
-                            data,
-                            zendesk_subdomain,
-                            selected_collection,
-                            True,
-                            True,
-                            {},
-                        )
-                        # self.update_content_signal.emit(list(data), data, "Ticket Field ID", True, True)
-
-                        # print(f"DATA TYPE: {type(data)}")
-                        # print(f"DATA:\n{json.dumps(data[0], default=str, indent=4)}")
-                        # print(f"DATA:\n{data}")
-                        # Extract all unique keys from the dictionaries
+                        ),
+                        on_error=partial(self.report_error, plugin_window),
+                    )
             except Exception as e:
-                error_message = str(e)
-                self.update_content_signal.emit(
-                    [f"error: {error_message}"], [], "", False, False
-                )
+                self.report_error(plugin_window, str(e))
         else:
             # Handle the case when source_instance is None
             logging.warning("No source instance found.")
+
+    def report_error(self, plugin_window, error_message):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        # Errors go to the window label, the table only ever receives documents
+        plugin_window.show_error(error_message)
+
+    def discover_keys(self, worker, zendesk_subdomain, selected_collection):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        # Top-level keys and counts from the schema catalog or a server-side aggregation
+        key_counts = MongoDBKeyDiscovery(zendesk_subdomain).get_key_counts(
+            selected_collection
+        )
+        key_descriptions = MongoDBSchemaCatalog(zendesk_subdomain).get_field_summaries(
+            selected_collection
+        )
+        return key_counts, key_descriptions
+
+    def select_keys(
+        self, plugin_window, zendesk_subdomain, selected_collection, discovered_keys
+    ):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        key_counts, key_descriptions = discovered_keys
+        all_keys = set(key_counts)
+
+        # self.filename()
+        logging.info(f"ALL KEYS IS TYPE: {type(all_keys)}")
+        logging.info(f"ALL KEYS:\n{all_keys}")
+
+        key_selection_dialog = KeySelectionDialog(
+            all_keys,
+            zendesk_subdomain,
+            selected_collection,
+            key_counts,
+            key_descriptions,
+        )
+        result = key_selection_dialog.exec_()
+
+        if result != QDialog.Accepted:
+            return
+
+        try:
+            selected_keys = key_selection_dialog.selected_keys
+
+            # Check if the selected collection is "users"
+            if selected_collection == "users" and "organization_id" in selected_keys:
+                # self.filename()
+                logging.info("USER PIPELINE CONDITION MET")
+                logging.info(f"ZENDESK SUBDOMAIN: {zendesk_subdomain}")
+                self.submit_work(
+                    self.load_users_enriched,
+                    zendesk_subdomain,
+                    selected_keys,
+                    on_result=partial(
+                        self.show_users_enriched,
+                        plugin_window,
+                        zendesk_subdomain,
+                        selected_keys,
+                    ),
+                    on_error=partial(self.report_error, plugin_window),
+                )
+            else:
+                # Only the selected keys are fetched from MongoDB
+                projection = self.instance_operations.build_projection(selected_keys)
+                logging.info(f"PROJECTION: {projection}")
+
+                # The table pages through a cursor as the user scrolls
+                plugin_window.display_collection(
+                    zendesk_subdomain,
+                    selected_collection,
+                    projection,
+                    sorted(selected_keys),
+                )
+        except Exception as e:
+            # Slots must not raise, PyQt would abort the application
+            self.report_error(plugin_window, str(e))
+
+    def load_users_enriched(self, worker, zendesk_subdomain, selected_keys):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        pipeline_operations = PipelineOperations(zendesk_subdomain)
+        # The users_enriched view is materialized after each sync, only built here
+        # when it is missing; the table then pages through it like any collection
+        pipeline_operations.ensure_users_enriched()
+        return pipeline_operations.build_users_enriched_projection(selected_keys)
+
+    def show_users_enriched(
+        self, plugin_window, zendesk_subdomain, selected_keys, projection
+    ):
+        logging.debug(f"{inspect.currentframe().f_code.co_name}")
+        try:
+            plugin_window.display_collection(
+                zendesk_subdomain,
+                PipelineOperations.users_enriched_collection_name,
+                projection,
+                sorted(set(selected_keys) | PipelineOperations.users_enriched_fields),
+            )
+            if self.show_window:
+                plugin_window.show()
+        except Exception as e:
+            # Slots must not raise, PyQt would abort the application
+            self.report_error(plugin_window, str(e))
@@ -0,0 +1,43 @@
+import mongomock
+import pytest
+
+from framework.logging_handler import PythagoraZenLogger
+
+# Tests log to the console only, no logfile is created under LOGS
+PythagoraZenLogger._is_configured = True
+
+
+@pytest.fixture
+def mongo_client():
+    # Every database-operations handle shares this in-memory client
+    from framework.mongodb_client_manager import MongoDBClientManager
+    from framework.settings_manager import SettingsManager
+
+    uri = SettingsManager().get_section("mongodb").get(
+        "uri", "mongodb://localhost:27017/"
+    )
+    client = mongomock.MongoClient()
+    MongoDBClientManager._clients[uri] = client
+    yield client
+    MongoDBClientManager._clients.pop(uri, None)
+
+    from framework.instance_database_operations_api_endpoint_config import (
+        ZendeskInstanceDatabaseOperationsMongoDB,
+    )
+
+    ZendeskInstanceDatabaseOperationsMongoDB._deduplicated_collections.clear()
+
+
+class ListRowSource:
+    # Exporters only need headers and iter_rows()
+    def __init__(self, headers, rows):
+        self.headers = headers
+        self.rows = rows
+
+    def iter_rows(self):
+        yield from self.rows
+
+
+@pytest.fixture
+def list_row_source():
+    return ListRowSource
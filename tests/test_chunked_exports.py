@@ -0,0 +1,97 @@
+import pytest
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import Paragraph, TableStyle
+
+from framework import export_html
+from framework.export_html import HTMLExporter
+from framework.export_pdf import (
+    TableChunkFlowables,
+    get_column_widths,
+    iter_pdf_tables,
+    render_pdf,
+)
+from framework.export_row_sources import iter_row_chunks
+
+
+class StubSettingsManager:
+    def __init__(self, export_settings):
+        self.export_settings = export_settings
+
+    def __call__(self):
+        return self
+
+    def get_section(self, section):
+        return self.export_settings
+
+
+def test_iter_row_chunks_reads_rows_lazily():
+    rows = iter(range(5))
+    chunks = iter_row_chunks(rows, 2)
+
+    assert next(chunks) == [0, 1]
+    assert next(rows) == 2
+    assert list(chunks) == [[3, 4]]
+    assert list(iter_row_chunks([], 2)) == []
+
+
+def test_html_exporter_escapes_cells_across_chunks(
+    tmp_path, monkeypatch, list_row_source
+):
+    monkeypatch.setattr(
+        export_html, "SettingsManager", StubSettingsManager({"html_chunk_rows": 2})
+    )
+    file_path = tmp_path / "export.html"
+    rows = [["<b>"], ["a & b"], ["plain"]]
+
+    assert HTMLExporter.export(list_row_source(["<id>"], rows), file_path) == 3
+    content = file_path.read_text(encoding="utf-8")
+    assert "&lt;id&gt;</th>" in content
+    assert content.count("<tr>") == 4
+    assert "&lt;b&gt;</td>" in content
+    assert "a &amp; b</td>" in content
+    assert content.endswith("</table></body></html>")
+
+
+def test_iter_pdf_tables_yields_one_table_per_chunk():
+    rows = iter([["1"], ["2"], ["3"]])
+    tables = list(iter_pdf_tables(["id"], rows, 2, TableStyle(), 400))
+
+    assert [len(table._cellvalues) for table in tables] == [3, 2]
+    # An empty export still renders its header
+    assert len(list(iter_pdf_tables(["id"], iter([]), 2, TableStyle(), 400))) == 1
+
+
+def test_iter_pdf_tables_share_column_widths():
+    rows = iter([["1", "a"], ["2", "b"], ["3", "a much longer subject " * 3]])
+    tables = list(iter_pdf_tables(["id", "subject"], rows, 2, TableStyle(), 400))
+
+    assert tables[0]._argW == tables[1]._argW
+    # Narrow first chunks are stretched to the frame width
+    assert sum(tables[0]._argW) == pytest.approx(400)
+
+
+def test_get_column_widths_keeps_measured_widths_wider_than_the_frame():
+    column_widths = get_column_widths(["id", "subject"], [["1", "x" * 200]], 100)
+
+    assert column_widths[1] > column_widths[0]
+    assert sum(column_widths) > 100
+
+
+def test_table_chunk_flowables_refill_when_drained():
+    styles = getSampleStyleSheet()
+    paragraphs = [Paragraph(text, styles["Normal"]) for text in ["a", "b"]]
+    flowables = TableChunkFlowables(paragraphs)
+
+    assert len(flowables) == 1
+    assert flowables.pop(0) is paragraphs[0]
+    assert len(flowables) == 1
+    assert flowables.pop(0) is paragraphs[1]
+    assert len(flowables) == 0
+
+
+def test_render_pdf_counts_rows(tmp_path):
+    file_path = tmp_path / "export.pdf"
+    rows = ([str(number), f"subject {number}"] for number in range(120))
+
+    assert render_pdf(str(file_path), ["id", "subject"], rows, 25) == 120
+    assert file_path.read_bytes().startswith(b"%PDF")
@@ -0,0 +1,51 @@
+import threading
+
+from framework.endpoint_sync_scheduler import EndpointSyncScheduler
+
+
+def test_run_collects_results_and_errors():
+    def write_pages(scheduler):
+        return sum(len(page) for page in scheduler.iter_until_canceled([[1, 2], [3]]))
+
+    def fail(scheduler):
+        raise ValueError("bad endpoint")
+
+    results = EndpointSyncScheduler(max_workers=2).run(
+        {"tickets": write_pages, "broken": fail}
+    )
+
+    assert results["tickets"] == {"result": 3, "error": None, "canceled": False}
+    assert results["broken"] == {
+        "result": None,
+        "error": "bad endpoint",
+        "canceled": False,
+    }
+
+
+def test_run_reports_interrupted_and_dropped_jobs_as_canceled():
+    first_page_written = threading.Event()
+
+    def endless_pages():
+        while True:
+            yield [1]
+
+    def write_pages(scheduler):
+        written_documents = 0
+        for page in scheduler.iter_until_canceled(endless_pages()):
+            written_documents += len(page)
+            first_page_written.set()
+        return written_documents
+
+    def never_started(scheduler):
+        return 1
+
+    # One worker, so the second job is still queued when the sync is canceled
+    results = EndpointSyncScheduler(max_workers=1).run(
+        {"users": write_pages, "groups": never_started},
+        cancel_check=first_page_written.is_set,
+    )
+
+    assert results["users"]["canceled"] is True
+    assert results["users"]["error"] is None
+    assert results["users"]["result"] >= 1
+    assert results["groups"] == {"result": None, "error": None, "canceled": True}
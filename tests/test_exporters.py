@@ -0,0 +1,71 @@
+import csv
+
+from framework.export_csv import CSVExporter
+from framework.export_row_sources import MongoCursorRowSource, TableModelRowSource
+from framework.export_xlsx import XLSXExporter
+from framework.instance_database_operations_api_endpoint_config import (
+    ZendeskInstanceDatabaseOperationsMongoDB,
+)
+
+
+class FakeTableModel:
+    def __init__(self, columns, rows):
+        self.columns = columns
+        self.rows = rows
+
+
+def test_csv_exporter_writes_headers_and_rows(tmp_path, list_row_source):
+    file_path = tmp_path / "export.csv"
+    row_source = list_row_source(["id", "subject"], [["1", "a, b"], ["2", "c"]])
+
+    assert CSVExporter.export(row_source, file_path) == 2
+    with open(file_path, newline="") as csv_file:
+        assert list(csv.reader(csv_file)) == [
+            ["id", "subject"],
+            ["1", "a, b"],
+            ["2", "c"],
+        ]
+
+
+def test_xlsx_exporter_counts_rows(tmp_path, list_row_source):
+    file_path = tmp_path / "export.xlsx"
+    row_source = list_row_source(["id", "subject"], [["1", "x" * 500], ["2", ""]])
+
+    assert XLSXExporter.export(row_source, str(file_path)) == 2
+    assert file_path.stat().st_size > 0
+
+
+def test_table_model_row_source_uses_column_order_and_a_snapshot():
+    table_model = FakeTableModel(
+        ["id", "subject", "status"],
+        [{"id": 1, "subject": "a", "status": "open"}, {"id": 2, "subject": "b"}],
+    )
+    row_source = TableModelRowSource(table_model, [2, 0])
+
+    # Sorting the table after the export started does not reorder the rows
+    table_model.rows.reverse()
+
+    assert row_source.headers == ["status", "id"]
+    assert list(row_source.iter_rows()) == [["open", "1"], ["", "2"]]
+
+
+def test_mongo_cursor_row_source_reads_nested_columns(mongo_client):
+    instance_operations = ZendeskInstanceDatabaseOperationsMongoDB("example", "tickets")
+    instance_operations.upsert_collection_data(
+        [
+            {"id": 2, "via": {"channel": "web"}},
+            {"id": 1, "via": {"channel": "email"}, "tags": ["vip", "billing"]},
+        ]
+    )
+    row_source = MongoCursorRowSource(
+        instance_operations,
+        {},
+        {"id": 1, "via.channel": 1, "tags": 1, "_id": 0},
+        ["id", "via.channel", "tags"],
+        [("id", 1)],
+    )
+
+    assert list(row_source.iter_rows()) == [
+        ["1", "email", "['vip', 'billing']"],
+        ["2", "web", ""],
+    ]
@@ -0,0 +1,84 @@
+from framework.incremental_export_paginator import ZendeskIncrementalExportPaginator
+
+
+class FakeResponse:
+    def __init__(self, response_json):
+        self.response_json = response_json
+
+    def json(self):
+        return self.response_json
+
+
+def make_paginator(pagination, checkpoint=None):
+    return ZendeskIncrementalExportPaginator(
+        "example",
+        "agent@example.com",
+        "token",
+        {
+            "end_point": "/api/v2/incremental/tickets",
+            "pagination": pagination,
+            "records_key": "tickets",
+            "start_time": 100,
+        },
+        checkpoint,
+    )
+
+
+def test_start_url_uses_the_stored_checkpoint():
+    base_url = "https://example.zendesk.com/api/v2/incremental/tickets"
+    assert make_paginator("time").get_start_url() == f"{base_url}?start_time=100"
+    assert (
+        make_paginator("time", {"start_time": 500}).get_start_url()
+        == f"{base_url}?start_time=500"
+    )
+    assert (
+        make_paginator("cursor", {"cursor": "abc"}).get_start_url()
+        == f"{base_url}?cursor=abc"
+    )
+    # A cursor export without a cursor yet starts from start_time
+    assert make_paginator("cursor").get_start_url() == f"{base_url}?start_time=100"
+
+
+def test_checkpoint_follows_end_time_or_after_cursor():
+    time_paginator = make_paginator("time", {"start_time": 500})
+    assert time_paginator.get_checkpoint({"end_time": 900}) == {"start_time": 900}
+    assert time_paginator.get_checkpoint({}) == {"start_time": 500}
+
+    cursor_paginator = make_paginator("cursor", {"cursor": "abc"})
+    assert cursor_paginator.get_checkpoint({"after_cursor": "def"}) == {
+        "cursor": "def"
+    }
+    assert cursor_paginator.get_checkpoint({"after_cursor": None}) == {
+        "cursor": "abc"
+    }
+
+
+def test_next_page_url_stops_at_end_of_stream():
+    paginator = make_paginator("cursor")
+    assert paginator.get_next_page_url({"after_url": "next"}) == "next"
+    assert (
+        paginator.get_next_page_url({"after_url": "next", "end_of_stream": True})
+        is None
+    )
+    assert make_paginator("time").get_next_page_url({"next_page": "next"}) == "next"
+
+
+def test_iter_pages_advances_the_checkpoint_page_by_page():
+    paginator = make_paginator("time")
+    responses = iter(
+        [
+            {"tickets": [{"id": 1}], "end_time": 200, "next_page": "page-2"},
+            {"tickets": [{"id": 2}], "end_time": 300, "end_of_stream": True},
+        ]
+    )
+    paginator.get_page = lambda url, headers: FakeResponse(next(responses))
+
+    checkpoints = []
+    for page in paginator.iter_pages():
+        # The checkpoint already describes the page being handed out
+        checkpoints.append((page, paginator.checkpoint))
+
+    assert checkpoints == [
+        ([{"id": 1}], {"start_time": 200}),
+        ([{"id": 2}], {"start_time": 300}),
+    ]
@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta, timezone
+
+import mongomock
+import pytest
+
+from framework.index_manager import MongoDBIndexManager
+from framework.instance_database_operations_api_endpoint_config import (
+    ZendeskInstanceDatabaseOperationsMongoDB,
+)
+from framework.key_discovery import MongoDBKeyDiscovery
+
+
+@pytest.fixture
+def index_manager(mongo_client):
+    MongoDBKeyDiscovery.invalidate("example")
+    yield MongoDBIndexManager("example")
+    MongoDBKeyDiscovery.invalidate("example")
+
+
+def get_users(mongo_client):
+    return mongo_client["example"]["users"]
+
+
+def test_expected_indexes_include_discovered_foreign_keys(mongo_client, index_manager):
+    ZendeskInstanceDatabaseOperationsMongoDB("example", "users").upsert_collection_data(
+        [{"id": 1, "organization_id": 5}, {"id": 2, "name": "no foreign keys"}]
+    )
+
+    assert index_manager.get_expected_indexes() == {
+        "users": {"id": True, "updated_at": False, "organization_id": False}
+    }
+
+
+def test_expected_indexes_skip_missing_collections(mongo_client, index_manager):
+    get_users(mongo_client).insert_one({"id": 1})
+
+    assert index_manager.get_expected_indexes(["tickets"]) == {}
+
+
+def test_ensure_indexes_creates_a_partial_unique_id_index(mongo_client, index_manager):
+    get_users(mongo_client).insert_many([{"id": 1}, {"name": "no id"}])
+    index_manager.ensure_indexes()
+
+    index_information = get_users(mongo_client).index_information()
+    assert index_information["id_1"]["unique"] is True
+    assert index_information["id_1"]["partialFilterExpression"] == {
+        "id": {"$exists": True}
+    }
+    assert "updated_at_1" in index_information
+
+
+def test_ensure_indexes_upgrades_a_plain_id_index(mongo_client, index_manager):
+    get_users(mongo_client).insert_one({"id": 1})
+    get_users(mongo_client).create_index("id")
+    index_manager.ensure_indexes()
+
+    assert get_users(mongo_client).index_information()["id_1"]["unique"] is True
+
+    # The writer keeps upserting into the upgraded collection
+    ZendeskInstanceDatabaseOperationsMongoDB("example", "users").upsert_collection_data(
+        [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}]
+    )
+    assert get_users(mongo_client).count_documents({}) == 2
+
+
+def test_ensure_indexes_keeps_null_ids_non_unique(mongo_client, index_manager):
+    get_users(mongo_client).insert_many([{"id": None}, {"id": None}, {"id": 1}])
+    index_manager.ensure_indexes()
+
+    assert not get_users(mongo_client).index_information()["id_1"].get("unique")
+
+
+def test_is_counted_since(index_manager):
+    since = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    def index_stats(counted_since):
+        return {"accesses": {"ops": 0, "since": counted_since}}
+
+    assert not index_manager.is_counted_since(index_stats(since), None)
+    assert index_manager.is_counted_since(
+        index_stats(since + timedelta(hours=1)), since
+    )
+    assert not index_manager.is_counted_since(
+        index_stats(since - timedelta(hours=1)), since
+    )
+    # Naive datetimes from pymongo are UTC
+    assert index_manager.is_counted_since(index_stats(datetime(2024, 1, 2)), since)
+
+
+def test_ensure_indexes_keeps_the_index_when_ids_repeat(
+    mongo_client, index_manager, monkeypatch
+):
+    get_users(mongo_client).insert_many([{"id": 1}, {"id": 1}, {"id": 2}])
+    get_users(mongo_client).create_index("id")
+    dropped_indexes = []
+    monkeypatch.setattr(
+        mongomock.collection.Collection, "drop_index", dropped_indexes.append
+    )
+
+    index_manager.ensure_indexes()
+    index_manager.ensure_indexes()
+
+    assert dropped_indexes == []
+    assert not get_users(mongo_client).index_information()["id_1"].get("unique")
@@ -0,0 +1,153 @@
+import mongomock
+import pytest
+
+from framework.instance_database_operations_api_endpoint_config import (
+    ZendeskInstanceDatabaseOperationsMongoDB,
+)
+
+
+@pytest.fixture
+def instance_operations(mongo_client):
+    return ZendeskInstanceDatabaseOperationsMongoDB("example", "tickets")
+
+
+def get_documents(instance_operations):
+    return list(instance_operations.collection.find({}, {"_id": 0}).sort("id", 1))
+
+
+def test_split_documents_by_id_keeps_the_last_copy():
+    documents_by_id, documents_without_id = (
+        ZendeskInstanceDatabaseOperationsMongoDB.split_documents_by_id(
+            [
+                {"id": 1, "subject": "old"},
+                {"name": "vip"},
+                {"id": None, "name": "billing"},
+                {"id": 1, "subject": "new"},
+            ]
+        )
+    )
+    assert documents_by_id == {1: {"id": 1, "subject": "new"}}
+    assert documents_without_id == [{"name": "vip"}, {"id": None, "name": "billing"}]
+
+
+def test_upsert_keeps_one_document_per_id(instance_operations):
+    instance_operations.upsert_collection_data(
+        [{"id": 1, "subject": "a"}, {"id": 2, "subject": "b"}]
+    )
+    instance_operations.upsert_collection_data(
+        [
+            {"id": 2, "subject": "b2"},
+            {"id": 3, "subject": "c"},
+            {"id": 2, "subject": "b3"},
+        ]
+    )
+    assert get_documents(instance_operations) == [
+        {"id": 1, "subject": "a"},
+        {"id": 2, "subject": "b3"},
+        {"id": 3, "subject": "c"},
+    ]
+
+
+def test_upsert_writes_in_batches(instance_operations, monkeypatch):
+    batch_sizes = []
+    bulk_write = mongomock.collection.Collection.bulk_write
+
+    def record_bulk_write(collection, requests, *args, **kwargs):
+        batch_sizes.append(len(requests))
+        return bulk_write(collection, requests, *args, **kwargs)
+
+    monkeypatch.setattr(
+        mongomock.collection.Collection, "bulk_write", record_bulk_write
+    )
+    instance_operations.write_batch_size = 2
+    instance_operations.upsert_collection_data([{"id": i} for i in range(5)])
+
+    assert batch_sizes == [2, 2, 1]
+    assert len(get_documents(instance_operations)) == 5
+
+
+def test_documents_without_id_are_replaced_once_per_sync(mongo_client):
+    first_sync = ZendeskInstanceDatabaseOperationsMongoDB("example", "tags")
+    first_sync.upsert_collection_data([{"name": "vip", "count": 1}])
+    first_sync.upsert_collection_data([{"name": "billing", "count": 2}])
+
+    # Pages of the same sync add to each other
+    assert first_sync.collection.count_documents({}) == 2
+
+    second_sync = ZendeskInstanceDatabaseOperationsMongoDB("example", "tags")
+    second_sync.upsert_collection_data([{"name": "vip", "count": 3}, {"id": 7}])
+
+    assert list(second_sync.collection.find({}, {"_id": 0}).sort("name", 1)) == [
+        {"id": 7},
+        {"name": "vip", "count": 3},
+    ]
+
+
+def test_insert_collection_pages_counts_written_documents(instance_operations):
+    pages = [[{"id": 1}], [], [{"id": 2}]]
+    assert instance_operations.insert_collection_pages(pages) == 2
+
+
+def test_build_projection_skips_paths_under_a_selected_parent():
+    projection = ZendeskInstanceDatabaseOperationsMongoDB.build_projection(
+        ["via.source.from", "subject", "via", "custom_fields.value"]
+    )
+    assert projection == {
+        "subject": 1,
+        "via": 1,
+        "custom_fields.value": 1,
+        "_id": 0,
+    }
+
+
+def test_build_projection_applies_to_find(instance_operations):
+    instance_operations.upsert_collection_data(
+        [{"id": 1, "subject": "a", "via": {"channel": "email", "source": {}}}]
+    )
+    projection = ZendeskInstanceDatabaseOperationsMongoDB.build_projection(
+        ["subject", "via.channel"]
+    )
+    assert list(instance_operations.collection.find({}, projection)) == [
+        {"subject": "a", "via": {"channel": "email"}}
+    ]
+
+
+def test_get_nested_value_fans_out_over_lists():
+    document = {
+        "via": {"channel": "email"},
+        "custom_fields": [{"id": 1, "value": "a"}, {"id": 2}, "not a dict"],
+    }
+    get_nested_value = ZendeskInstanceDatabaseOperationsMongoDB.get_nested_value
+
+    assert get_nested_value(document, "via.channel") == "email"
+    assert get_nested_value(document, "custom_fields.value") == ["a", None]
+    assert get_nested_value(document, "via.channel.name") is None
+    assert get_nested_value(document, "missing.path") is None
+
+
+def test_first_upsert_removes_copies_left_by_insert_syncs(instance_operations):
+    # Two earlier insert syncs, each holding a copy of every object
+    instance_operations.collection.insert_many(
+        [{"id": 1, "sync": 1}, {"id": 2, "sync": 1}]
+    )
+    instance_operations.collection.insert_many(
+        [{"id": 1, "sync": 2}, {"id": 2, "sync": 2}]
+    )
+    instance_operations.upsert_collection_data([{"id": 1, "sync": 3}])
+
+    assert get_documents(instance_operations) == [
+        {"id": 1, "sync": 3},
+        {"id": 2, "sync": 2},
+    ]
+
+
+def test_duplicate_ids_are_checked_once_per_collection(mongo_client):
+    first_sync = ZendeskInstanceDatabaseOperationsMongoDB("example", "tickets")
+    first_sync.upsert_collection_data([{"id": 1}])
+
+    # Rows added behind the writer's back are left alone by later syncs
+    first_sync.collection.insert_one({"id": 1})
+    second_sync = ZendeskInstanceDatabaseOperationsMongoDB("example", "tickets")
+    second_sync.upsert_collection_data([{"id": 2}])
+
+    assert second_sync.collection.count_documents({"id": 1}) == 2
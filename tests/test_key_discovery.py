@@ -0,0 +1,49 @@
+import pytest
+
+from framework.key_discovery import MongoDBKeyDiscovery
+
+
+@pytest.fixture
+def key_discovery(mongo_client):
+    mongo_client["example"]["users"].insert_many(
+        [{"id": 1, "name": "a"}, {"id": 2, "email": "b@example.com"}]
+    )
+    MongoDBKeyDiscovery.invalidate("example")
+    yield MongoDBKeyDiscovery("example")
+    MongoDBKeyDiscovery.invalidate("example")
+
+
+def test_get_key_counts_scans_the_collection(key_discovery):
+    assert key_discovery.get_key_counts("users", sample_size=0) == {
+        "id": 2,
+        "name": 1,
+        "email": 1,
+    }
+
+
+def test_sampled_and_exact_counts_are_cached_apart(mongo_client, key_discovery):
+    sampled_keys = key_discovery.get_keys("users", sample_size=1)
+    exact_keys = key_discovery.get_keys("users", sample_size=0)
+
+    assert len(sampled_keys) == 2
+    assert exact_keys == {"id", "name", "email"}
+    assert set(MongoDBKeyDiscovery._key_counts_cache) == {
+        ("example", "users", 1),
+        ("example", "users", 0),
+    }
+
+    # Cached counts are served until the collection is invalidated
+    mongo_client["example"]["users"].insert_one({"id": 3, "phone": "1"})
+    assert "phone" not in key_discovery.get_keys("users", sample_size=0)
+    assert "phone" in key_discovery.get_keys("users", sample_size=0, refresh=True)
+
+
+def test_invalidate_clears_every_sample_size(key_discovery):
+    key_discovery.get_keys("users", sample_size=1)
+    key_discovery.get_keys("users", sample_size=0)
+    MongoDBKeyDiscovery._key_counts_cache[("other", "users", 0)] = {"id": 1}
+
+    MongoDBKeyDiscovery.invalidate("example", ["users"])
+
+    assert set(MongoDBKeyDiscovery._key_counts_cache) == {("other", "users", 0)}
+    MongoDBKeyDiscovery.invalidate("other")
@@ -0,0 +1,69 @@
+import pytest
+
+from framework.rate_limiter import ZendeskRateLimiter
+
+
+@pytest.fixture
+def rate_limiter():
+    return ZendeskRateLimiter("example")
+
+
+def test_get_header_value_returns_first_present_header(rate_limiter):
+    headers = {"ratelimit-limit": "400", "X-Rate-Limit": "700"}
+    assert rate_limiter.get_header_value(headers, "X-Rate-Limit") == 700.0
+    assert (
+        rate_limiter.get_header_value(headers, "Missing", "ratelimit-limit") == 400.0
+    )
+
+
+def test_get_header_value_skips_unparseable_values(rate_limiter):
+    headers = {"X-Rate-Limit": "soon", "ratelimit-limit": "400"}
+    assert (
+        rate_limiter.get_header_value(headers, "X-Rate-Limit", "ratelimit-limit")
+        == 400.0
+    )
+    assert rate_limiter.get_header_value({}, "X-Rate-Limit") is None
+
+
+def test_update_from_response_learns_account_limit(rate_limiter):
+    rate_limiter.update_from_response({"X-Rate-Limit": "700"}, 200, "/api/v2/users")
+    assert rate_limiter.requests_per_minute == 700.0
+
+
+def test_update_from_response_blocks_inside_headroom(rate_limiter):
+    rate_limiter.update_from_response(
+        {"X-Rate-Limit": "100", "X-Rate-Limit-Remaining": "5", "ratelimit-reset": "30"},
+        200,
+        "/api/v2/users",
+    )
+    assert rate_limiter.tokens <= 0
+    assert rate_limiter.reserve("/api/v2/users") >= 29
+
+
+def test_update_from_response_honours_retry_after(rate_limiter):
+    rate_limiter.update_from_response({"Retry-After": "12"}, 429, "/api/v2/tickets")
+    assert rate_limiter.reserve("/api/v2/tickets") >= 11
+    budget_report = rate_limiter.get_budget_report()
+    assert budget_report["/api/v2/tickets"]["throttled"] == 1
+    assert budget_report["/api/v2/tickets"]["requests"] == 1
+
+
+def test_incremental_exports_have_their_own_limiter(monkeypatch):
+    monkeypatch.setattr(ZendeskRateLimiter, "_rate_limiters", {})
+    account_limiter = ZendeskRateLimiter.get_rate_limiter("example")
+    incremental_limiter = ZendeskRateLimiter.get_rate_limiter(
+        "example", incremental_exports=True
+    )
+
+    assert incremental_limiter is not account_limiter
+    assert incremental_limiter.requests_per_minute == 10
+
+    # An export's 429 blocks the export bucket only, and account headers are ignored
+    incremental_limiter.update_from_response(
+        {"Retry-After": "30", "X-Rate-Limit": "700", "X-Rate-Limit-Remaining": "0"},
+        429,
+        "/api/v2/incremental/tickets/cursor.json",
+    )
+    assert incremental_limiter.requests_per_minute == 10
+    assert incremental_limiter.reserve("/api/v2/incremental/tickets/cursor.json") >= 29
+    assert account_limiter.reserve("/api/v2/users") == 0
@@ -0,0 +1,146 @@
+import pytest
+
+from framework.instance_database_operations_api_endpoint_config import (
+    ZendeskInstanceDatabaseOperationsMongoDB,
+)
+from framework.schema_catalog import MongoDBSchemaCatalog, SchemaProfile
+
+
+@pytest.fixture
+def schema_catalog(mongo_client):
+    return MongoDBSchemaCatalog("example")
+
+
+def without_examples(fields):
+    # Examples are whichever value was seen first and differ between the two paths
+    return [
+        {key: value for key, value in field.items() if key != "example"}
+        for field in fields
+    ]
+
+
+def test_observe_document_profiles_nested_fields():
+    profile = SchemaProfile()
+    profile.observe_page(
+        [
+            {"_id": 1, "id": 1, "tags": [], "via": {"channel": "email"}},
+            {"id": 2, "tags": ["vip"], "via": None},
+        ]
+    )
+
+    assert profile.documents == 2
+    assert "_id" not in profile.fields
+    assert profile.fields["tags"] == {
+        "count": 2,
+        "types": {"array": 2},
+        "null_count": 0,
+        "empty_count": 1,
+        "example": ["vip"],
+    }
+    assert profile.fields["via"]["types"] == {"object": 1, "null": 1}
+    assert profile.fields["via.channel"]["count"] == 1
+
+
+def test_forget_page_takes_documents_back_out():
+    profile = SchemaProfile()
+    profile.observe_page([{"id": 1, "name": "a"}])
+    profile.forget_page([{"id": 1, "name": "a"}])
+
+    assert profile.documents == 0
+    assert profile.fields["name"]["count"] == 0
+    assert profile.fields["name"]["types"] == {"string": 0}
+
+
+def test_merge_fields_drops_fields_without_documents(schema_catalog):
+    profile = SchemaProfile()
+    profile.observe_page([{"id": 1, "name": "a"}])
+    catalog_fields = schema_catalog.merge_fields([], profile.fields)
+
+    delta = SchemaProfile()
+    delta.forget_page([{"id": 1, "name": "a"}])
+    delta.observe_page([{"id": 1, "name": None}])
+    fields = schema_catalog.merge_fields(catalog_fields, delta.fields)
+
+    assert [field["path"] for field in fields] == ["id", "name"]
+    assert fields[1]["types"] == {"null": 1}
+    assert fields[1]["null_count"] == 1
+
+    delta = SchemaProfile()
+    delta.forget_page([{"id": 1, "name": None}])
+    delta.observe_page([{"id": 1}])
+    fields = schema_catalog.merge_fields(fields, delta.fields)
+
+    assert [field["path"] for field in fields] == ["id"]
+
+
+def assert_catalog_matches_collection(schema_catalog, collection_name, documents):
+    catalog = schema_catalog.get_catalog(collection_name)
+    rebuilt_fields = schema_catalog.merge_fields(
+        [], schema_catalog.build_profile(collection_name).fields
+    )
+    assert catalog["documents"] == documents
+    assert without_examples(catalog["fields"]) == without_examples(rebuilt_fields)
+
+
+def test_refresh_profile_merges_the_change_recorded_by_writes(
+    mongo_client, schema_catalog
+):
+    instance_operations = ZendeskInstanceDatabaseOperationsMongoDB("example", "tickets")
+    instance_operations.upsert_collection_data(
+        [
+            {"id": 1, "status": "open", "tags": ["vip"]},
+            {"id": 2, "status": "open"},
+        ]
+    )
+    schema_catalog.refresh_profile("tickets")
+
+    # The next sync's writes record their change on the attached profile
+    profile = SchemaProfile()
+    instance_operations = ZendeskInstanceDatabaseOperationsMongoDB("example", "tickets")
+    instance_operations.schema_profile = profile
+    instance_operations.upsert_collection_data(
+        [{"id": 2, "status": "solved", "tags": []}, {"id": 3, "status": "new"}]
+    )
+    instance_operations.upsert_collection_data([{"id": 3, "status": "open"}])
+    schema_catalog.refresh_profile("tickets", profile)
+
+    assert_catalog_matches_collection(schema_catalog, "tickets", 3)
+    assert schema_catalog.get_key_counts("tickets") == {
+        "id": 3,
+        "status": 3,
+        "tags": 2,
+    }
+
+
+def test_profiled_writes_track_replaced_and_removed_documents(
+    mongo_client, schema_catalog
+):
+    # Copies left by insert syncs and documents without an id
+    mongo_client["example"]["tags"].insert_many(
+        [
+            {"id": 1, "name": "vip"},
+            {"id": 1, "name": "vip", "count": 2},
+            {"name": "billing"},
+        ]
+    )
+    schema_catalog.refresh_profile("tags")
+
+    profile = SchemaProfile()
+    instance_operations = ZendeskInstanceDatabaseOperationsMongoDB("example", "tags")
+    instance_operations.schema_profile = profile
+    instance_operations.upsert_collection_data([{"name": "refunds"}, {"id": 2}])
+    schema_catalog.refresh_profile("tags", profile)
+
+    assert_catalog_matches_collection(schema_catalog, "tags", 3)
+
+
+def test_refresh_profile_without_documents_clears_the_entry(
+    mongo_client, schema_catalog
+):
+    mongo_client["example"]["tickets"].insert_one({"id": 1})
+    schema_catalog.refresh_profile("tickets")
+    assert schema_catalog.get_catalog("tickets")["documents"] == 1
+
+    mongo_client["example"]["tickets"].delete_many({})
+    schema_catalog.refresh_profile("tickets")
+    assert schema_catalog.get_catalog("tickets") is None
@@ -0,0 +1,71 @@
+import pytest
+
+pytest.importorskip("PyQt5")
+
+from PyQt5.QtCore import Qt  # noqa: E402
+
+from framework.skeleton_tree_model import SkeletonTreeModel  # noqa: E402
+
+SKELETON = {
+    "id": 1,
+    "via": {"channel": "email", "source": {"from": {}, "to": {"name": "a"}}},
+    "tags": ["vip"],
+    "custom_fields": [{"id": 2, "value": "b"}],
+}
+
+
+def get_child(model, node, key):
+    return next(child for child in node.load_children() if child.key == key)
+
+
+def test_nothing_is_selected_by_default():
+    assert SkeletonTreeModel(SKELETON).get_selected_keys() == []
+
+
+def test_checking_the_root_selects_every_leaf():
+    model = SkeletonTreeModel(SKELETON)
+    model.set_all_checked(True)
+
+    assert model.get_selected_keys() == [
+        "id",
+        "via.channel",
+        "via.source.from",
+        "via.source.to.name",
+        "tags.0",
+        "custom_fields.0.id",
+        "custom_fields.0.value",
+    ]
+
+
+def test_newest_check_wins_over_ancestors():
+    model = SkeletonTreeModel(SKELETON)
+    via = get_child(model, model.root, "via")
+    source = get_child(model, via, "source")
+
+    model.set_checked(via, True)
+    model.set_checked(source, False)
+    assert model.get_selected_keys() == ["via.channel"]
+
+    # Checking the parent again overrides the older unchecked child
+    model.set_checked(via, True)
+    assert model.get_selected_keys() == [
+        "via.channel",
+        "via.source.from",
+        "via.source.to.name",
+    ]
+    assert model.is_checked(get_child(model, source, "to"))
+
+    model.set_all_checked(False)
+    assert model.get_selected_keys() == []
+
+
+def test_check_state_and_tooltips_come_from_the_model():
+    model = SkeletonTreeModel(SKELETON, {"via.channel": "1 of 1 documents"})
+    via_index = model.index(1, 0)
+    channel_index = model.index(0, 0, via_index)
+
+    model.setData(via_index, Qt.Checked, Qt.CheckStateRole)
+
+    assert model.data(channel_index, Qt.CheckStateRole) == Qt.Checked
+    assert model.data(channel_index, Qt.ToolTipRole) == "1 of 1 documents"
+    assert model.data(model.index(0, 0), Qt.CheckStateRole) == Qt.Unchecked
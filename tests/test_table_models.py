@@ -0,0 +1,23 @@
+import pytest
+
+pytest.importorskip("PyQt5")
+
+from framework.instance_database_operations_api_endpoint_config import (  # noqa: E402
+    ZendeskInstanceDatabaseOperationsMongoDB,
+)
+from framework.table_models import MongoCursorTableModel  # noqa: E402
+
+
+def test_missing_fields_show_as_empty_text(mongo_client):
+    instance_operations = ZendeskInstanceDatabaseOperationsMongoDB("example", "users")
+    instance_operations.upsert_collection_data(
+        [{"id": 1, "via": {"channel": "email"}}, {"id": 2}]
+    )
+    table_model = MongoCursorTableModel(
+        instance_operations,
+        projection={"id": 1, "via.channel": 1, "_id": 0},
+        columns=["id", "via.channel"],
+    )
+
+    assert table_model.rowCount() == 2
+    assert [table_model.get_cell_text(row, 1) for row in range(2)] == ["email", ""]